@@ -0,0 +1,45 @@
+"""
+Advanced aspects API router (exact windows).
+"""
+from datetime import date as Date, datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.aspect_advanced_engine import IST
+from app.core.aspect_calendar_engine import aspect_calendar
+from app.core.aspect_event_engine import calculate_daily_aspects_exact
+from app.core.ephemeris_executor import run_ephemeris
+
+router = APIRouter(prefix="/aspects", tags=["Aspects (Advanced)"])
+
+
+@router.get("/daily")
+async def aspects_daily(date: Optional[str] = None, orb: float = Query(1.0, gt=0, le=10)):
+    """All aspects of a day with exact start, end and perfection times (IST)."""
+    if date is None:
+        day = datetime.now(IST)
+    else:
+        try:
+            day = datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+    aspects = await run_ephemeris(calculate_daily_aspects_exact, day, orb)
+    return {"date": day.strftime("%Y-%m-%d"), "orb": orb, "aspects": aspects}
+
+
+@router.get("/calendar")
+def aspects_calendar(date_from: Date = Query(..., alias="from"), date_to: Date = Query(..., alias="to"),
+                     planet: Optional[str] = None, signal: Optional[str] = None,
+                     orb: float = Query(1.0, gt=0, le=10)):
+    """
+    Aspect events (pair, target, start, perfection, end, nature, signal)
+    overlapping the date range, served from the event index. Aspects that
+    span midnight are single events.
+    """
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    try:
+        return aspect_calendar(date_from, date_to, orb, planet, signal)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -1,13 +1,19 @@
 from fastapi import APIRouter
-from datetime import datetime
-from app.core.swiss_engine import get_planetary_positions
+from app.core.snapshot_engine import sky_snapshot
+from app.core.ephemeris_executor import ephemeris
 
 router = APIRouter()
 
 @router.get("/astro/d1d9")
-def get_d1_d9():
+async def get_d1_d9():
     """
     Returns real-time D1 (Rashi) and D9 (Navansh) planetary positions for Mumbai.
     """
-    positions = get_planetary_positions()
+    positions = (await sky_snapshot.acurrent()).raw()
     return positions
+
+
+@router.get("/astro/snapshot")
+def get_snapshot_stats():
+    """Shared position snapshot and ephemeris executor statistics."""
+    return {**sky_snapshot.stats(), "ephemeris": ephemeris.stats()}
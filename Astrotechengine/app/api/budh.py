@@ -2,8 +2,9 @@
 Budh (Mercury) Special API router.
 """
 from fastapi import APIRouter
-from app.core.swiss_engine import get_planetary_positions
+from app.core.snapshot_engine import sky_snapshot
 from app.core.budh_engine import evaluate_budh
+from app.core.station_engine import station_status
 
 router = APIRouter(prefix="/budh", tags=["Budh Special"])
 
@@ -11,12 +12,12 @@ router = APIRouter(prefix="/budh", tags=["Budh Special"])
 @router.get("/evaluate")
 def calc_budh():
     """Evaluate Mercury special logic for BankNifty from real-time positions."""
-    raw = get_planetary_positions()
+    snapshot = sky_snapshot.current()
     planets = {}
-    for name, data in raw.items():
+    for name, data in snapshot.raw().items():
         planets[name] = {
             "degree": data["D1"]["longitude"],
             "retrograde": data["D1"]["retrograde"],
         }
-    result = evaluate_budh(planets)
+    result = evaluate_budh(planets, station_status("mercury", snapshot.at))
     return result
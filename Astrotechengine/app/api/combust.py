@@ -1,12 +1,18 @@
 """
 Combust API router.
 """
-from fastapi import APIRouter
+from datetime import date as Date, datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
 from app.core.combust_engine import is_combust, combust_score
+from app.core.combust_event_engine import COMBUST_PLANETS, combustion_status, combustion_windows
 from app.models.schemas import CombustRequest, CombustResponse
 
 router = APIRouter(prefix="/combust", tags=["Combust"])
 
+MAX_CALENDAR_DAYS = 3660
+
 
 @router.post("/check", response_model=CombustResponse)
 def check_combust(data: CombustRequest):
@@ -15,3 +21,27 @@ def check_combust(data: CombustRequest):
         combust=is_combust(data.planet, data.planet_degree, data.sun_degree),
         score=combust_score(data.planet, data.planet_degree, data.sun_degree),
     )
+
+
+@router.get("/calendar")
+def combust_calendar(date_from: Date = Query(..., alias="from"), date_to: Date = Query(..., alias="to"),
+                     planet: Optional[List[str]] = Query(None)):
+    """Combustion (asth) windows with exact entry and exit times (IST) overlapping the date range."""
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"range is limited to {MAX_CALENDAR_DAYS} days")
+    try:
+        windows = combustion_windows(date_from, date_to, planet)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"from": date_from.isoformat(), "to": date_to.isoformat(), "windows": windows}
+
+
+@router.get("/status")
+def combust_status(planet: Optional[List[str]] = Query(None), time: Optional[datetime] = None):
+    """Combust now (or at time, naive = IST), with hours into / left of / until combustion."""
+    try:
+        return {p: combustion_status(p, time) for p in planet or COMBUST_PLANETS}
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
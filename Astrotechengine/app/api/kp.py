@@ -0,0 +1,73 @@
+"""
+KP (Krishnamurti Paddhati) intraday API router.
+"""
+from datetime import date as Date, datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.ephemeris_executor import run_ephemeris
+from app.core.kp_engine import (
+    IST, MUMBAI_LAT, MUMBAI_LON, SESSION_END, SESSION_START,
+    calculate_kp_intraday, kp_lords, kp_lords_batch,
+)
+from app.core.kp_event_engine import calculate_kp_timeline
+from app.core.kp_scan_engine import scan_kp
+from app.models.schemas import SubLordBatchRequest, SubLordResponse
+
+router = APIRouter(prefix="/kp", tags=["KP Intraday"])
+
+
+def _parse_date(date: Optional[str]) -> datetime:
+    if date is None:
+        return datetime.now(IST)
+    try:
+        return datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=IST)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+
+
+@router.get("/intraday")
+async def kp_intraday(date: Optional[str] = None, step_minutes: int = Query(5, ge=1),
+                      start: str = SESSION_START, end: str = SESSION_END,
+                      lat: float = MUMBAI_LAT, lon: float = MUMBAI_LON):
+    """KP reading sampled every `step_minutes` across the session (IST)."""
+    return await run_ephemeris(calculate_kp_intraday, _parse_date(date), step_minutes,
+                               lat, lon, start, end)
+
+
+@router.get("/timeline")
+async def kp_timeline(date: Optional[str] = None,
+                      start: str = SESSION_START, end: str = SESSION_END,
+                      lat: float = MUMBAI_LAT, lon: float = MUMBAI_LON):
+    """Exact KP intervals and lord-change events for the session (IST)."""
+    return await run_ephemeris(calculate_kp_timeline, _parse_date(date), lat, lon, start, end)
+
+
+@router.get("/scan")
+def kp_scan(date_from: Date = Query(..., alias="from"), date_to: Date = Query(..., alias="to"),
+            location: List[str] = Query(["NSE"]), step_minutes: int = Query(5, ge=1),
+            skip_weekends: bool = True):
+    """
+    KP intraday slots for a date range and one or more locations, each an
+    exchange code or "lat,lon" (repeat ?location=). Stored days are served
+    without recomputation.
+    """
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    try:
+        return scan_kp(date_from, date_to, location, step_minutes, skip_weekends)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/sublord", response_model=SubLordResponse)
+def kp_sublord(lon: float = Query(..., description="Sidereal longitude in degrees")):
+    """Sign, star, sub and sub-sub lord of a longitude."""
+    return kp_lords(lon)
+
+
+@router.post("/sublord/batch", response_model=list[SubLordResponse])
+def kp_sublord_batch(data: SubLordBatchRequest):
+    """Lords for many longitudes in one request."""
+    return kp_lords_batch(data.longitudes)
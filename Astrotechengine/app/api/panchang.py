@@ -0,0 +1,26 @@
+"""
+Panchang timeline API router.
+"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from app.core.panchang_engine import panchang_at, panchang_timeline
+
+router = APIRouter(prefix="/panchang", tags=["Panchang"])
+
+
+@router.get("/timeline")
+def get_panchang_timeline(start: datetime, end: datetime):
+    """Tithi, nakshatra and pada segments with exact boundaries (naive times are IST)."""
+    try:
+        return panchang_timeline(start, end)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/at")
+def get_panchang_at(time: Optional[datetime] = None):
+    """Panchang values at an instant (default now) and when the next one changes."""
+    return panchang_at(time)
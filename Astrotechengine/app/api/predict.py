@@ -2,31 +2,52 @@
 Daily Prediction API router — Master endpoint.
 Aggregates all scoring modules.
 """
-from fastapi import APIRouter
-from app.core.swiss_engine import get_planetary_positions
-from app.core.scoring_engine import final_score
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.incremental_scoring_engine import live_scorer
+from app.core.prediction_engine import predict_at, predict_live, predict_range, prediction_memo, range_memo
 
 router = APIRouter(prefix="/predict", tags=["Prediction"])
 
 
 @router.get("/daily")
-def daily_prediction():
+def daily_prediction(at: Optional[datetime] = None, exchange: Optional[str] = None):
     """
-    Real-time daily market prediction using all astro rule modules.
+    Market prediction using all astro rule modules at an instant (default
+    now; naive times are in the exchange's timezone, IST by default).
     Returns score, trend, confidence, and breakdown.
     """
-    raw = get_planetary_positions()
-    # Build flat planet dict for scoring
-    planets = {}
-    for name, data in raw.items():
-        planets[name] = {
-            "degree": data["D1"]["longitude"],
-            "rashi": data["D1"]["rashi"],
-            "retrograde": data["D1"]["retrograde"],
-            "speed": data["D1"]["speed"],
-            "nakshatra": data["D1"]["nakshatra"],
-            "d9_rashi": data["D9"]["navansh_rashi"],
-        }
-    result = final_score(planets)
-    result["planets"] = raw
-    return result
+    try:
+        return predict_at(at, exchange)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/range")
+def range_prediction(start: datetime, end: datetime,
+                     step_minutes: int = Query(1440, ge=1),
+                     exchange: Optional[str] = None):
+    """Score, trend and per-rule scores every step_minutes from start to end."""
+    try:
+        return predict_range(start, end, step_minutes, exchange)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/live")
+def live_prediction(client: Optional[str] = Query(None, max_length=64)):
+    """
+    Current score for live dashboards. Pass a stable client token to get the
+    rules that changed since that client's previous call; without one every
+    rule is listed.
+    """
+    return predict_live(client)
+
+
+@router.get("/cache")
+def prediction_cache_stats():
+    """Prediction memo size, hit rate and config hash, the range memo, and live rescoring reuse."""
+    return {**prediction_memo.stats(), "range": range_memo.stats(), "live": live_scorer.stats()}
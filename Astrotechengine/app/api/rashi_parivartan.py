@@ -1,10 +1,30 @@
-from fastapi import APIRouter
-from app.core.rashi_parivartan_engine import calculate_rashi_parivartan
+from datetime import date as Date
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from app.core.rashi_parivartan_engine import calculate_rashi_parivartan, ingress_calendar
 
 router = APIRouter(prefix="/rashi-parivartan", tags=["Rashi Parivartan"])
 
+MAX_CALENDAR_DAYS = 3660
+
 
 @router.get("/calculate")
 def get_rashi_parivartan():
     """Get Rashi Parivartan (sign change) data for all planets."""
     return calculate_rashi_parivartan()
+
+
+@router.get("/calendar")
+def get_rashi_parivartan_calendar(date_from: Date = Query(..., alias="from"), date_to: Date = Query(..., alias="to"),
+                                  planet: Optional[List[str]] = Query(None)):
+    """Exact sign entries (IST) in the date range, including retrograde re-entries, from the ingress table."""
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"range is limited to {MAX_CALENDAR_DAYS} days")
+    try:
+        events = ingress_calendar(date_from, date_to, planet)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"from": date_from.isoformat(), "to": date_to.isoformat(), "events": events}
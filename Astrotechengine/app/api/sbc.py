@@ -1,21 +1,23 @@
 """
 SBC (Sarvatobhadra Chakra) API router.
 """
-from fastapi import APIRouter
-from app.core.swiss_engine import get_planetary_positions
-from app.core.sbc_engine import calculate_sbc
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+from app.core.snapshot_engine import sky_snapshot
+from app.core.sbc_engine import calculate_sbc, vedh_timeline
 from app.core.nakshatra_engine import calculate_nakshatra
 
 router = APIRouter(prefix="/sbc", tags=["SBC / Sarvatobhadra Chakra"])
 
 
 @router.get("/calculate")
-def calc_sbc():
+async def calc_sbc():
     """
     Full SBC Vedh analysis from real-time planetary positions.
     Returns all vedh, vedh hitting Moon, and SBC score.
     """
-    raw = get_planetary_positions()
+    raw = (await sky_snapshot.acurrent()).raw()
     planets = {}
     for name, data in raw.items():
         planets[name] = {
@@ -34,3 +36,15 @@ def calc_sbc():
         }
     result = calculate_sbc(planets)
     return result
+
+
+@router.get("/timeline")
+def get_vedh_timeline(start: datetime, end: datetime, step_minutes: int = Query(15, ge=1)):
+    """
+    When each vedh on the Moon begins and ends (naive times are IST), as
+    segments with their SBC score plus start / end events.
+    """
+    try:
+        return vedh_timeline(start, end, step_minutes)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -0,0 +1,35 @@
+"""
+Shar Parivartan (declination change) API router.
+"""
+from datetime import date as Date
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.shar_parivartan_engine import calculate_shar_parivartan, declination_calendar
+
+router = APIRouter(prefix="/shar-parivartan", tags=["Shar Parivartan"])
+
+MAX_CALENDAR_DAYS = 3660
+
+
+@router.get("/current")
+def shar_parivartan_current():
+    """Current declination side of each planet and its next equator crossing."""
+    return calculate_shar_parivartan()
+
+
+@router.get("/crossings")
+def shar_parivartan_crossings(date_from: Date = Query(..., alias="from"), date_to: Date = Query(..., alias="to"),
+                              planet: Optional[List[str]] = Query(None),
+                              include_extremes: bool = False):
+    """Exact equator crossings (UT) in the date range, from the precomputed table."""
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"range is limited to {MAX_CALENDAR_DAYS} days")
+    try:
+        events = declination_calendar(date_from, date_to, planet, include_extremes)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"from": date_from.isoformat(), "to": date_to.isoformat(), "events": events}
@@ -0,0 +1,37 @@
+"""
+Retrograde / direct station API router.
+"""
+from datetime import date as Date, datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.station_engine import STATION_PLANETS, station_calendar, station_status
+
+router = APIRouter(prefix="/stations", tags=["Stations"])
+
+MAX_CALENDAR_DAYS = 3660
+
+
+@router.get("/status")
+def get_station_status(planet: Optional[List[str]] = Query(None), time: Optional[datetime] = None):
+    """Previous and next station and days to the next one (naive times are IST)."""
+    try:
+        return {p: station_status(p, time) for p in planet or STATION_PLANETS}
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/calendar")
+def get_station_calendar(date_from: Date = Query(..., alias="from"), date_to: Date = Query(..., alias="to"),
+                         planet: Optional[List[str]] = Query(None)):
+    """Exact stationary-retrograde and stationary-direct times (IST) in the date range."""
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"range is limited to {MAX_CALENDAR_DAYS} days")
+    try:
+        events = station_calendar(date_from, date_to, planet)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"from": date_from.isoformat(), "to": date_to.isoformat(), "events": events}
@@ -8,12 +8,14 @@ special aspects (Mars/Jupiter/Saturn), and Buy/Sell signals.
 Based on Mukesh Sir's aspect rules.
 """
 
+import numpy as np
 import swisseph as swe
 from datetime import datetime, timedelta, timezone
 from .config import MUMBAI_LAT, MUMBAI_LON, TIMEZONE
 
 # ─── Swiss Ephemeris Config ──────────────────────────────────
 swe.set_ephe_path("./ephemeris")
+swe.set_sid_mode(swe.SIDM_LAHIRI)
 
 IST = timezone(timedelta(hours=5, minutes=30))
 
@@ -215,9 +217,11 @@ def _apply_aspect_logic(p1, p2, r1, r2, pos1, pos2, angle):
 # ═══════════════════════════════════════════════════════════════
 
 def _get_positions(dt: datetime, lat: float = MUMBAI_LAT, lon: float = MUMBAI_LON) -> dict:
-    """Get all planetary positions (sidereal) for a given datetime."""
-    swe.set_topo(lon, lat, 0)
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    """
+    Get all planetary positions (sidereal) for a given datetime.
+    Positions are geocentric (no FLG_TOPOCTR), so lat/lon do not change them;
+    sidereal mode is owned by the module setup / ephemeris executor.
+    """
 
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=IST)
@@ -299,23 +303,23 @@ def calculate_daily_aspects(date: datetime = None,
     day_start = datetime(date.year, date.month, date.day, 0, 0, tzinfo=IST)
     day_end = datetime(date.year, date.month, date.day, 23, 59, tzinfo=IST)
 
-    aspect_state = {}
-    results = []
-
+    timestamps = []
+    snapshots = []
     t = day_start
     while t <= day_end:
-        positions = _get_positions(t, lat, lon)
-        if positions:
-            _check_aspects(positions, t, aspect_state, results, orb)
+        timestamps.append(t)
+        snapshots.append(_get_positions(t, lat, lon))
         t += timedelta(minutes=interval_minutes)
 
+    results = _match_aspects(timestamps, snapshots, orb)
+
     # Finalize any still-active aspects at end of day
-    for key, entry in list(aspect_state.items()):
-        entry["End Time"] = day_end
-        dur = (day_end - entry["Start Time"]).total_seconds() / 60
-        entry["Duration (mins)"] = round(dur, 1)
-        entry["ongoing"] = True
-        results.append(entry)
+    for entry in results:
+        if entry["End Time"] is None:
+            entry["End Time"] = day_end
+            dur = (day_end - entry["Start Time"]).total_seconds() / 60
+            entry["Duration (mins)"] = round(dur, 1)
+            entry["ongoing"] = True
 
     # Sort by start time
     results.sort(key=lambda x: x["Start Time"])
@@ -330,83 +334,138 @@ def calculate_daily_aspects(date: datetime = None,
     return results
 
 
+def _separation(lon1: float, lon2: float) -> float:
+    """Angular separation folded into [0, 180]."""
+    angle = abs(lon1 - lon2)
+    return angle if angle <= 180 else 360 - angle
+
+
+def _special_aspect(p1: str, p2: str, r1: int, r2: int) -> str:
+    house_diff_val = _house_diff(r1, r2) + 1
+    if p1 in SPECIAL_ASPECTS and house_diff_val in SPECIAL_ASPECTS[p1]:
+        return f"{p1} {house_diff_val}th house aspect"
+    if p2 in SPECIAL_ASPECTS and (12 - house_diff_val + 1) in SPECIAL_ASPECTS[p2]:
+        return f"{p2} {(12 - house_diff_val + 1)}th house aspect"
+    return ""
+
+
+def _aspect_key(p1: str, p2: str, target) -> str:
+    # Consistent key: slower planet first
+    slow, fast = (p1, p2) if ORBITAL_PRIORITY.get(p1, 99) <= ORBITAL_PRIORITY.get(p2, 99) else (p2, p1)
+    return f"{slow}-{fast}-{target}"
+
+
+def _aspect_entry(p1: str, p2: str, pos1: dict, pos2: dict, target, timestamp) -> dict:
+    """Aspect record as of the moment it comes into orb."""
+    lon1, lon2 = pos1["lon"], pos2["lon"]
+    angle = _separation(lon1, lon2)
+    r1, r2 = pos1["sign"], pos2["sign"]
+    special_aspect_type = _special_aspect(p1, p2, r1, r2)
+
+    nature = _apply_aspect_logic(p1, p2, r1, r2, pos1, pos2, target)
+    victory = ""
+    if target == 0:
+        victory = _jay_prajay_rule(p1, p2, pos1, pos2)
+
+    # Signal
+    signal = "Buy" if nature == "+" else ("Sell" if nature == "-" else "Hold")
+    if special_aspect_type:
+        if "Jupiter" in special_aspect_type and nature == "+":
+            signal = "Strong Buy"
+        elif "Saturn" in special_aspect_type and nature == "-":
+            signal = "Strong Sell"
+
+    return {
+        "Start Time": timestamp,
+        "End Time": None,
+        "Duration (mins)": None,
+        "Planet 1": p1,
+        "Planet 2": p2,
+        "Longitude 1": round(lon1, 2),
+        "Longitude 2": round(lon2, 2),
+        "Angle": round(angle, 2),
+        "Target Angle": target,
+        "Aspect Name": ASPECT_NAMES.get(target, f"{target}°"),
+        "Orb": round(abs(angle - target), 2),
+        "Sign 1": r1,
+        "Sign 2": r2,
+        "Nakshatra 1": pos1["nakshatra"],
+        "Nakshatra 2": pos2["nakshatra"],
+        "Special Aspect": special_aspect_type,
+        "Nature": nature,
+        "Victory": victory,
+        "Signal": signal,
+        "ongoing": False,
+    }
+
+
+def _match_aspects(timestamps: list, snapshots: list, orb: float = 1.0) -> list[dict]:
+    """
+    All aspect windows in a sampled day, in the order _check_aspects
+    reports them. Separations for every timestamp and pair are one
+    (T × pairs) array and orb matches one (T × pairs × targets) mask; its
+    run-length edges give the windows, so records are only built for
+    windows that exist. Windows still open at the last sample have
+    "End Time" None.
+    """
+    names = sorted(snapshots[0])
+    lons = np.array([[snap[name]["lon"] for name in names] for snap in snapshots])
+    first, second = np.triu_indices(len(names), k=1)     # same pair order as the nested loop
+    angle = np.abs(lons[:, first] - lons[:, second])
+    angle = np.where(angle <= 180, angle, 360 - angle)
+    mask = np.abs(angle[:, :, None] - np.array(TARGET_DEGREES, dtype=float)) <= orb
+
+    padded = np.zeros((mask.shape[0] + 2,) + mask.shape[1:], dtype=np.int8)
+    padded[1:-1] = mask
+    edges = np.diff(padded, axis=0)
+    starts = np.argwhere(edges == 1)          # rows (t, pair, target), sorted by t
+    ends = np.argwhere(edges == -1)
+    # Runs of one (pair, target) alternate start/end, so order both by (pair, target, t)
+    starts = starts[np.lexsort((starts[:, 0], starts[:, 2], starts[:, 1]))]
+    ends = ends[np.lexsort((ends[:, 0], ends[:, 2], ends[:, 1]))]
+
+    last = len(timestamps)
+    closed, still_open = [], []
+    for (t0, pair, k), (t1, _, _) in zip(starts.tolist(), ends.tolist()):
+        p1, p2 = names[first[pair]], names[second[pair]]
+        entry = _aspect_entry(p1, p2, snapshots[t0][p1], snapshots[t0][p2],
+                              TARGET_DEGREES[k], timestamps[t0])
+        if t1 < last:
+            entry["End Time"] = timestamps[t1]
+            dur = (timestamps[t1] - timestamps[t0]).total_seconds() / 60
+            entry["Duration (mins)"] = round(dur, 1)
+            closed.append(((t1, pair, k), entry))
+        else:
+            still_open.append(((t0, pair, k), entry))
+    # _check_aspects emits closed windows as they close, then open ones in opening order
+    closed.sort(key=lambda item: item[0])
+    still_open.sort(key=lambda item: item[0])
+    return [entry for _, entry in closed + still_open]
+
+
 def _check_aspects(positions, timestamp, aspect_state, results, orb=1.0):
-    """Check all planet pairs for aspects at a given time."""
+    """
+    Check all planet pairs for aspects at a given time.
+    Per-sample reference for _match_aspects.
+    """
     planet_names = sorted(positions.keys())
 
     for i in range(len(planet_names)):
         for j in range(i + 1, len(planet_names)):
             p1 = planet_names[i]
             p2 = planet_names[j]
-
-            lon1 = positions[p1]["lon"]
-            lon2 = positions[p2]["lon"]
-            angle = abs(lon1 - lon2)
-            angle = angle if angle <= 180 else 360 - angle
-
-            r1 = positions[p1]["sign"]
-            r2 = positions[p2]["sign"]
-            house_diff_val = _house_diff(r1, r2) + 1
-
-            # Check special aspects
-            special_aspect_applies = False
-            special_aspect_type = ""
-            if p1 in SPECIAL_ASPECTS and house_diff_val in SPECIAL_ASPECTS[p1]:
-                special_aspect_applies = True
-                special_aspect_type = f"{p1} {house_diff_val}th house aspect"
-            elif p2 in SPECIAL_ASPECTS and (12 - house_diff_val + 1) in SPECIAL_ASPECTS[p2]:
-                special_aspect_applies = True
-                special_aspect_type = f"{p2} {(12 - house_diff_val + 1)}th house aspect"
-
-            # Consistent key: slower planet first
-            slow, fast = (p1, p2) if ORBITAL_PRIORITY.get(p1, 99) <= ORBITAL_PRIORITY.get(p2, 99) else (p2, p1)
+            angle = _separation(positions[p1]["lon"], positions[p2]["lon"])
 
             for target in TARGET_DEGREES:
-                key = f"{slow}-{fast}-{target}"
+                key = _aspect_key(p1, p2, target)
                 if abs(angle - target) <= orb:
                     if key not in aspect_state:
-                        nature = _apply_aspect_logic(p1, p2, r1, r2,
-                                                     positions[p1], positions[p2], target)
-                        victory = ""
-                        if target == 0:
-                            victory = _jay_prajay_rule(p1, p2, positions[p1], positions[p2])
-
-                        # Signal
-                        signal = "Buy" if nature == "+" else ("Sell" if nature == "-" else "Hold")
-                        if special_aspect_applies:
-                            if "Jupiter" in special_aspect_type and nature == "+":
-                                signal = "Strong Buy"
-                            elif "Saturn" in special_aspect_type and nature == "-":
-                                signal = "Strong Sell"
-
-                        aspect_state[key] = {
-                            "Start Time": timestamp,
-                            "End Time": None,
-                            "Duration (mins)": None,
-                            "Planet 1": p1,
-                            "Planet 2": p2,
-                            "Longitude 1": round(lon1, 2),
-                            "Longitude 2": round(lon2, 2),
-                            "Angle": round(angle, 2),
-                            "Target Angle": target,
-                            "Aspect Name": ASPECT_NAMES.get(target, f"{target}°"),
-                            "Orb": round(abs(angle - target), 2),
-                            "Sign 1": r1,
-                            "Sign 2": r2,
-                            "Nakshatra 1": positions[p1]["nakshatra"],
-                            "Nakshatra 2": positions[p2]["nakshatra"],
-                            "Special Aspect": special_aspect_type if special_aspect_applies else "",
-                            "Nature": nature,
-                            "Victory": victory,
-                            "Signal": signal,
-                            "ongoing": False,
-                        }
+                        aspect_state[key] = _aspect_entry(p1, p2, positions[p1], positions[p2],
+                                                          target, timestamp)
                 else:
                     if key in aspect_state:
                         entry = aspect_state.pop(key)
                         entry["End Time"] = timestamp
                         dur = (timestamp - entry["Start Time"]).total_seconds() / 60
                         entry["Duration (mins)"] = round(dur, 1)
-                        if "Victory" not in entry:
-                            entry["Victory"] = ""
                         results.append(entry)
@@ -0,0 +1,254 @@
+"""
+Aspect Calendar — multi-day aspect events from a persistent index.
+
+find_aspect_windows runs once for each block of days not yet covered, and
+its windows are stored in the result store, one row per event with exact
+entry, perfection and exit. A window still in orb at a block edge is
+stitched to the matching window of the neighbouring block once that block
+is covered, so an aspect spanning midnight (or weeks, for slow pairs) is a
+single event rather than one piece per day.
+
+Range queries by date, planet and signal are answered from the index.
+Blocks are computed outside any lock; a block is written only if none of
+its days was covered meanwhile (by a concurrent request or another
+process), checked in the same transaction as the insert.
+"""
+
+import json
+from datetime import date as Date, datetime, timedelta
+from typing import List, Optional
+
+from .aspect_advanced_engine import IST
+from .aspect_event_engine import find_aspect_windows
+from .ephemeris_executor import ephemeris
+from .result_store import result_store
+from .root_finder import datetime_from_jd, jd_from_datetime
+
+# Bump when aspect records change, so stored events are recomputed
+# (2: version 1 indexes could hold duplicate events from concurrent requests)
+ASPECT_ENGINE_VERSION = 2
+ASPECT_CALENDAR_MAX_DAYS = 366
+ASPECT_BLOCK_DAYS = 31
+
+ASPECT_CALENDAR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS aspect_days (
+    day     TEXT    NOT NULL,
+    orb     REAL    NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (day, orb, version)
+);
+CREATE TABLE IF NOT EXISTS aspect_events (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    orb           REAL    NOT NULL,
+    version       INTEGER NOT NULL,
+    planet_1      TEXT    NOT NULL,
+    planet_2      TEXT    NOT NULL,
+    target        REAL    NOT NULL,
+    start_jd      REAL    NOT NULL,
+    end_jd        REAL    NOT NULL,
+    perfection_jd REAL,
+    open_start    INTEGER NOT NULL,
+    open_end      INTEGER NOT NULL,
+    signal        TEXT    NOT NULL,
+    record        TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS aspect_events_start ON aspect_events (orb, version, start_jd);
+"""
+
+# Entry-time attributes kept from each aspect record; times live in columns
+_RECORD_FIELDS = (
+    "Planet 1", "Planet 2", "Longitude 1", "Longitude 2", "Angle", "Target Angle",
+    "Aspect Name", "Orb", "Sign 1", "Sign 2", "Nakshatra 1", "Nakshatra 2",
+    "Special Aspect", "Nature", "Victory", "Signal",
+)
+
+
+def _midnight(day: Date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=IST)
+
+
+_COVERED_SQL = "SELECT day FROM aspect_days WHERE orb = ? AND version = ? AND day BETWEEN ? AND ?"
+
+
+def _missing_blocks(store, start: Date, end: Date, orb: float) -> List[tuple]:
+    covered = {row["day"] for row in store.query(
+        _COVERED_SQL, (orb, ASPECT_ENGINE_VERSION, start.isoformat(), end.isoformat()))}
+    blocks = []
+    day = start
+    while day <= end:
+        if day.isoformat() in covered:
+            day += timedelta(days=1)
+            continue
+        first = day
+        while (day + timedelta(days=1) <= end and (day + timedelta(days=1)).isoformat() not in covered
+               and (day - first).days + 1 < ASPECT_BLOCK_DAYS):
+            day += timedelta(days=1)
+        blocks.append((first, day))
+        day += timedelta(days=1)
+    return blocks
+
+
+def _stitch(conn, orb: float, boundary_jd: float):
+    """Join events that end open at boundary_jd to their continuation starting there."""
+    left = conn.execute(
+        "SELECT id, planet_1, planet_2, target, perfection_jd FROM aspect_events"
+        " WHERE orb = ? AND version = ? AND open_end = 1 AND end_jd = ?",
+        (orb, ASPECT_ENGINE_VERSION, boundary_jd)).fetchall()
+    for row in left:
+        right = conn.execute(
+            "SELECT id, end_jd, perfection_jd, open_end FROM aspect_events"
+            " WHERE orb = ? AND version = ? AND open_start = 1 AND start_jd = ?"
+            " AND planet_1 = ? AND planet_2 = ? AND target = ?",
+            (orb, ASPECT_ENGINE_VERSION, boundary_jd,
+             row["planet_1"], row["planet_2"], row["target"])).fetchone()
+        if right is None:
+            continue
+        perfection = row["perfection_jd"] if row["perfection_jd"] is not None else right["perfection_jd"]
+        conn.execute(
+            "UPDATE aspect_events SET end_jd = ?, open_end = ?, perfection_jd = ? WHERE id = ?",
+            (right["end_jd"], right["open_end"], perfection, row["id"]))
+        conn.execute("DELETE FROM aspect_events WHERE id = ?", (right["id"],))
+
+
+def ensure_calendar(start: Date, end: Date, orb: float = 1.0,
+                    store=result_store, executor=ephemeris) -> int:
+    """Compute and index every day of [start, end] not yet covered. Returns days computed."""
+    store.ensure(ASPECT_CALENDAR_SCHEMA)
+    computed = 0
+    while True:
+        blocks = _missing_blocks(store, start, end, orb)
+        if not blocks:
+            return computed
+        futures = [
+            executor.submit(find_aspect_windows, _midnight(first), _midnight(last + timedelta(days=1)), orb)
+            for first, last in blocks
+        ]
+        for (first, last), future in zip(blocks, futures):
+            if _insert_block(store, first, last, orb, future.result()["aspects"]):
+                computed += (last - first).days + 1
+        # A block skipped because another writer covered part of it is retried for the rest
+
+
+def _insert_block(store, first: Date, last: Date, orb: float, aspects: List[dict]) -> bool:
+    """Index one computed block unless any of its days got covered meanwhile."""
+    lo_jd = jd_from_datetime(_midnight(first))
+    hi_jd = jd_from_datetime(_midnight(last + timedelta(days=1)))
+    days = [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+    with store.transaction() as conn:
+        if conn.execute(_COVERED_SQL, (orb, ASPECT_ENGINE_VERSION, days[0], days[-1])).fetchone():
+            return False
+        conn.executemany(
+            "INSERT INTO aspect_events (orb, version, planet_1, planet_2, target, start_jd,"
+            " end_jd, perfection_jd, open_start, open_end, signal, record)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(orb, ASPECT_ENGINE_VERSION, a["Planet 1"], a["Planet 2"], a["Target Angle"],
+              lo_jd if a["starts_before"] else jd_from_datetime(a["Start Time"]),
+              hi_jd if a["ongoing"] else jd_from_datetime(a["End Time"]),
+              jd_from_datetime(a["Perfection Time"]) if a["Perfection Time"] else None,
+              int(a["starts_before"]), int(a["ongoing"]), a["Signal"],
+              json.dumps({k: a[k] for k in _RECORD_FIELDS}))
+             for a in aspects])
+        conn.executemany(
+            "INSERT INTO aspect_days (day, orb, version) VALUES (?, ?, ?)",
+            [(day, orb, ASPECT_ENGINE_VERSION) for day in days])
+        _stitch(conn, orb, lo_jd)
+        _stitch(conn, orb, hi_jd)
+    return True
+
+
+def _event(row) -> dict:
+    record = json.loads(row["record"])
+    start = datetime_from_jd(row["start_jd"], IST)
+    end = datetime_from_jd(row["end_jd"], IST)
+    perfection = (datetime_from_jd(row["perfection_jd"], IST)
+                  if row["perfection_jd"] is not None else None)
+    return {
+        **record,
+        "Start Time": start,
+        "End Time": end,
+        "Perfection Time": perfection,
+        "Duration (mins)": round((row["end_jd"] - row["start_jd"]) * 1440, 1),
+        # True entry/exit lie outside every day computed so far
+        "start_open": bool(row["open_start"]),
+        "end_open": bool(row["open_end"]),
+    }
+
+
+def query_calendar(start: Date, end: Date, orb: float = 1.0, planet: Optional[str] = None,
+                   signal: Optional[str] = None, store=result_store) -> List[dict]:
+    """Indexed events overlapping [start 00:00, end + 1 day 00:00) IST."""
+    store.ensure(ASPECT_CALENDAR_SCHEMA)
+    sql = ("SELECT * FROM aspect_events WHERE orb = ? AND version = ?"
+           " AND start_jd < ? AND end_jd > ?")
+    params = [orb, ASPECT_ENGINE_VERSION,
+              jd_from_datetime(_midnight(end + timedelta(days=1))), jd_from_datetime(_midnight(start))]
+    if planet:
+        sql += " AND (planet_1 = ? OR planet_2 = ?)"
+        params += [planet, planet]
+    if signal:
+        sql += " AND signal = ?"
+        params.append(signal)
+    sql += " ORDER BY start_jd, planet_1, planet_2, target"
+    return [_event(row) for row in store.query(sql, params)]
+
+
+def aspect_calendar(start: Date, end: Date, orb: float = 1.0, planet: Optional[str] = None,
+                    signal: Optional[str] = None, store=result_store, executor=ephemeris) -> dict:
+    """
+    Aspect events over [start, end], computing only days not yet indexed.
+    Blocks on the ephemeris executor; call it from a worker thread.
+    """
+    if (end - start).days + 1 > ASPECT_CALENDAR_MAX_DAYS:
+        raise ValueError(f"Calendar range is limited to {ASPECT_CALENDAR_MAX_DAYS} days")
+    computed = ensure_calendar(start, end, orb, store, executor)
+    events = query_calendar(start, end, orb, planet, signal, store)
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "orb": orb,
+        "computed_days": computed,
+        "events": [
+            {
+                "planet_1": e["Planet 1"],
+                "planet_2": e["Planet 2"],
+                "target": e["Target Angle"],
+                "aspect": e["Aspect Name"],
+                "start": e["Start Time"].strftime("%Y-%m-%d %H:%M:%S"),
+                "perfection": (e["Perfection Time"].strftime("%Y-%m-%d %H:%M:%S")
+                               if e["Perfection Time"] else None),
+                "end": e["End Time"].strftime("%Y-%m-%d %H:%M:%S"),
+                "duration_mins": e["Duration (mins)"],
+                "nature": e["Nature"],
+                "signal": e["Signal"],
+                "victory": e["Victory"],
+                "special_aspect": e["Special Aspect"],
+                "start_open": e["start_open"],
+                "end_open": e["end_open"],
+            }
+            for e in events
+        ],
+    }
+
+
+def aspects_for_day(date: datetime, orb: float = 1.0, store=result_store,
+                    executor=ephemeris) -> List[dict]:
+    """
+    The day's aspects in calculate_daily_aspects record shape, from the
+    index. Times outside the day are shown with their date; "ongoing"
+    marks aspects still in orb at midnight.
+    """
+    day = Date(date.year, date.month, date.day)
+    ensure_calendar(day, day, orb, store, executor)
+    day_end = _midnight(day + timedelta(days=1))
+
+    def label(t: datetime) -> str:
+        return t.strftime("%H:%M") if t.date() == day else t.strftime("%d %b %H:%M")
+
+    results = query_calendar(day, day, orb, store=store)
+    for r in results:
+        r["ongoing"] = r["End Time"] >= day_end
+        r["start_str"] = label(r["Start Time"])
+        r["end_str"] = label(r["End Time"])
+        r["start_full"] = r["Start Time"].strftime("%Y-%m-%d %H:%M")
+        r["end_full"] = r["End Time"].strftime("%Y-%m-%d %H:%M")
+    return results
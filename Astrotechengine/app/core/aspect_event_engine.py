@@ -0,0 +1,197 @@
+"""
+Aspect Event Engine — exact aspect windows by root-finding.
+
+calculate_daily_aspects samples the day every 10 minutes, so its start and
+end times are only as good as the step, and every sample costs two
+ephemeris calls per body plus a pairs × targets comparison loop.
+
+Here each body is sampled once per SAMPLE_MINUTES and interpolated. For
+every pair, the instants where the separation crosses target ± orb (entry
+and exit) and the target itself (perfection) are root-found on the
+interpolant. Records keep the fields and rules of calculate_daily_aspects:
+nature, victory and signal are evaluated at the moment of entry, or at the
+start of the range for an aspect already in orb.
+"""
+
+from datetime import datetime
+from typing import Dict, List
+
+import swisseph as swe
+
+from .aspect_advanced_engine import (
+    IST, PLANETS, TARGET_DEGREES, _aspect_entry, _get_nakshatra, _separation,
+)
+from .root_finder import AngleTrack, crossings, datetime_from_jd, find_root, jd_from_datetime
+
+SAMPLE_MINUTES = 60
+SAMPLED_BODIES = [name for name in PLANETS if name != "Ketu"]
+_EPS = 1e-9
+
+
+class SkyTrack:
+    """Interpolated sidereal longitude and latitude of every body over a range."""
+
+    def __init__(self, start_jd: float, end_jd: float, sample_minutes: int = SAMPLE_MINUTES):
+        step = sample_minutes / 1440.0
+        # One sample beyond each end so the interpolant never extrapolates
+        count = int((end_jd - start_jd) / step) + 3
+        self.times = [start_jd - step + i * step for i in range(count + 1)]
+        self.ephemeris_calls = 0
+        self.lon: Dict[str, AngleTrack] = {}
+        self.lat: Dict[str, AngleTrack] = {}
+        self.speed: Dict[str, List[float]] = {}
+
+        flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+        for name in SAMPLED_BODIES:
+            # Same flags as _get_positions, so "speed" (and retrograde) match it
+            rows = [swe.calc_ut(t, PLANETS[name], flags)[0] for t in self.times]
+            self.ephemeris_calls += len(self.times)
+            self.lon[name] = AngleTrack(self.times, [r[0] for r in rows])
+            self.lat[name] = AngleTrack(self.times, [r[1] for r in rows])
+            self.speed[name] = [r[3] for r in rows]
+        rahu = self.lon["Rahu"]
+        self.lon["Ketu"] = AngleTrack(self.times, [v + 180 for v in rahu.values])
+        self.lat["Ketu"] = AngleTrack(self.times, [-v for v in self.lat["Rahu"].values])
+        self.speed["Ketu"] = [0.0] * len(self.times)
+
+    @property
+    def bodies(self) -> List[str]:
+        return sorted(self.lon)
+
+    def position(self, name: str, jd: float) -> dict:
+        """The _get_positions record of one body at jd."""
+        lon = self.lon[name](jd) % 360.0
+        nearest = min(range(len(self.times)), key=lambda i: abs(self.times[i] - jd))
+        return {
+            "lon": lon,
+            "lat": self.lat[name](jd),
+            "sign": int(lon // 30) + 1,
+            "retrograde": self.speed[name][nearest] < 0,
+            "nakshatra": _get_nakshatra(lon),
+        }
+
+
+def _in_orb(diff: float, target: float, orb: float) -> bool:
+    return abs(_separation(diff % 360.0, 0.0) - target) <= orb
+
+
+def target_levels(target: float, orb: float):
+    """
+    Values of (lon1 - lon2) mod 360 where the aspect enters or leaves orb,
+    and where it is exact. Targets above 180° are unreachable with folded
+    separations, as in _check_aspects, and get no levels.
+    """
+    candidates = {(target - orb) % 360, (target + orb) % 360,
+                  (-target - orb) % 360, (-target + orb) % 360}
+    bounds = sorted(b for b in candidates
+                    if _in_orb(b - 1e-7, target, orb) != _in_orb(b + 1e-7, target, orb))
+    exact = sorted({target % 360, -target % 360}) if bounds else []
+    return bounds, exact
+
+
+def _pair_windows(sky: SkyTrack, p1: str, p2: str, start_jd: float, end_jd: float,
+                  orb: float, levels: Dict[float, tuple]) -> List[dict]:
+    """In-orb windows of one pair for every target, clipped to [start_jd, end_jd]."""
+    diff = AngleTrack(sky.times, [a - b for a, b in zip(sky.lon[p1].values, sky.lon[p2].values)])
+    turning = [t for t in diff.turning_points() if start_jd < t < end_jd]
+    # Between knots the separation is monotonic, so each level is crossed at most once
+    knots = sorted({start_jd, end_jd, *turning,
+                    *(t for t in sky.times if start_jd < t < end_jd)})
+    all_levels = sorted({lv for bounds, exact in levels.values() for lv in bounds + exact})
+
+    hits: Dict[float, List[float]] = {}
+    values = [diff(t) for t in knots]
+    for a, b, fa, fb in zip(knots, knots[1:], values, values[1:]):
+        for v in crossings(fa, fb, all_levels):
+            jd = find_root(lambda t: diff(t) - v, a, b, fa - v, fb - v)
+            hits.setdefault(round(v % 360.0, 9), []).append(jd)
+
+    windows = []
+    for target, (bounds, exact) in levels.items():
+        if not bounds:
+            continue
+        toggles = sorted(t for lv in bounds for t in hits.get(round(lv, 9), []))
+        edges = [start_jd] + toggles + [end_jd]
+        spans = []
+        for lo, hi in zip(edges, edges[1:]):
+            if hi - lo > _EPS and _in_orb(diff((lo + hi) / 2), target, orb):
+                if spans and abs(spans[-1][1] - lo) <= _EPS:
+                    spans[-1][1] = hi
+                else:
+                    spans.append([lo, hi])
+        exact_hits = sorted(t for lv in exact for t in hits.get(round(lv, 9), []))
+        for lo, hi in spans:
+            perfect = [t for t in exact_hits if lo <= t <= hi]
+            if not perfect:
+                # Grazing aspect: closest approach inside the window, if any
+                perfect = sorted((t for t in turning if lo < t < hi),
+                                 key=lambda t: abs(_separation(diff(t) % 360, 0) - target))[:1]
+            windows.append({
+                "target": target,
+                "start": lo,
+                "end": hi,
+                "perfection": perfect[0] if perfect else None,
+                "starts_before": lo <= start_jd,
+                "ongoing": hi >= end_jd,
+            })
+    return windows
+
+
+def find_aspect_windows(start: datetime, end: datetime, orb: float = 1.0,
+                        sample_minutes: int = SAMPLE_MINUTES) -> dict:
+    """
+    Every aspect in orb at some point of [start, end].
+
+    Returns dict with:
+      aspects: aspect records as in calculate_daily_aspects, plus
+               "Perfection Time" (None when exactness falls outside the
+               range) and "starts_before" / "ongoing" for clipped windows
+      ephemeris_calls
+    """
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=IST)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=IST)
+    start_jd, end_jd = jd_from_datetime(start), jd_from_datetime(end)
+    sky = SkyTrack(start_jd, end_jd, sample_minutes)
+    levels = {target: target_levels(target, orb) for target in TARGET_DEGREES}
+
+    aspects = []
+    bodies = sky.bodies
+    for i, p1 in enumerate(bodies):
+        for p2 in bodies[i + 1:]:
+            for w in _pair_windows(sky, p1, p2, start_jd, end_jd, orb, levels):
+                entry = _aspect_entry(p1, p2, sky.position(p1, w["start"]),
+                                      sky.position(p2, w["start"]), w["target"],
+                                      datetime_from_jd(w["start"], IST))
+                entry["End Time"] = datetime_from_jd(w["end"], IST)
+                entry["Duration (mins)"] = round((w["end"] - w["start"]) * 1440, 1)
+                entry["Perfection Time"] = (datetime_from_jd(w["perfection"], IST)
+                                            if w["perfection"] is not None else None)
+                entry["starts_before"] = w["starts_before"]
+                entry["ongoing"] = w["ongoing"]
+                aspects.append(entry)
+
+    aspects.sort(key=lambda x: (x["Start Time"], x["Planet 1"], x["Planet 2"], x["Target Angle"]))
+    return {"aspects": aspects, "ephemeris_calls": sky.ephemeris_calls}
+
+
+def calculate_daily_aspects_exact(date: datetime = None, orb: float = 1.0) -> list[dict]:
+    """
+    Drop-in for calculate_daily_aspects (same day bounds, record fields and
+    string formats) with exact start, end and perfection times.
+    """
+    if date is None:
+        date = datetime.now(IST)
+    day_start = datetime(date.year, date.month, date.day, 0, 0, tzinfo=IST)
+    day_end = datetime(date.year, date.month, date.day, 23, 59, tzinfo=IST)
+
+    results = find_aspect_windows(day_start, day_end, orb)["aspects"]
+    for r in results:
+        r["start_str"] = r["Start Time"].strftime("%H:%M")
+        r["end_str"] = r["End Time"].strftime("%H:%M")
+        r["start_full"] = r["Start Time"].strftime("%Y-%m-%d %H:%M")
+        r["end_full"] = r["End Time"].strftime("%Y-%m-%d %H:%M")
+        perfection = r["Perfection Time"]
+        r["perfection_str"] = perfection.strftime("%H:%M:%S") if perfection else ""
+    return results
@@ -0,0 +1,324 @@
+"""
+Backtest Engine — replay final_score over historical index bars.
+
+Reads a local OHLC file (CSV, or Parquet when pandas is installed) of daily
+sessions or intraday bars, scores every bar with vector_scoring_engine
+(final_score as array expressions over planet columns) and compares the
+result with the bar's return:
+
+  hit_rate          share of non-zero scores whose sign matches the return
+  buckets           per trend label: bars, mean return, up / down share and
+                    precision (Teji labels: up share, Mandi labels: down share)
+  rule_correlation  Pearson correlation of each rule's score with returns
+
+Daily bars are scored at session_time on the bar's date; intraday bars at
+their own timestamp. Positions follow get_planetary_positions exactly
+(including its wall-clock-as-UT Julian day), so a backtest replays what
+/predict/daily would have said at that moment. Bars are scored in chunks
+on the ephemeris executor; pass workers=N to fan out over N processes.
+
+build_score_matrix keeps the unweighted rule scores as a bars × rules
+matrix for weight_optimizer.
+"""
+
+import csv
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from datetime import date as Date, datetime, time as Time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import config
+from .ephemeris_executor import EphemerisExecutor, ephemeris
+from .result_store import DATA_DIR
+from .scoring_engine import RULE_WEIGHTS
+from .vector_scoring_engine import planet_columns, score_columns
+
+DEFAULT_SESSION_TIME = "09:15"
+CHUNK_BARS = 250
+RETURN_MODES = ("open_close", "close_close")
+TREND_BUCKETS = ("Very Strong Teji", "Teji", "Sideways", "Mandi", "Very Strong Mandi")
+_DATE_FORMATS = ("%Y-%m-%d", "%d-%b-%Y", "%d-%m-%Y", "%d/%m/%Y", "%Y%m%d")
+
+
+# ═══════════════════════════════════════════════════════════════
+# DATA
+# ═══════════════════════════════════════════════════════════════
+
+def _parse_date(value) -> Tuple[datetime, bool]:
+    """(value as datetime, whether it carries a time of day)."""
+    if isinstance(value, datetime):
+        return value, True
+    if isinstance(value, Date):
+        return datetime(value.year, value.month, value.day), False
+    text = str(value).strip()
+    try:
+        return datetime.combine(Date.fromisoformat(text), Time()), False
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(text), True
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt), False
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date '{text}'")
+
+
+def _rows(path: str) -> List[Dict[str, object]]:
+    """Rows as column -> cell; CSV cells are text, Parquet cells keep their type (timestamps as datetime)."""
+    if path.lower().endswith((".parquet", ".pq")):
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ValueError("Reading Parquet needs pandas (and pyarrow); use a CSV file instead")
+        frame = pd.read_parquet(path)
+        return [{str(k): v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for k, v in row.items()}
+                for row in frame.to_dict("records")]
+    with open(path, newline="") as fh:
+        return list(csv.DictReader(fh))
+
+
+def load_ohlc(path: str, session_time: str = DEFAULT_SESSION_TIME) -> List[dict]:
+    """
+    Bars sorted by time as {time, open, high, low, close}. Columns are
+    matched case-insensitively: a date / datetime / timestamp column, an
+    optional separate time column, and open, high, low, close. Bars
+    without a time of day get session_time (IST wall clock); so does a
+    date column stored as midnight timestamps, as Parquet date columns are.
+    """
+    hh, mm = (int(x) for x in session_time.split(":"))
+    bars = []
+    for row in _rows(path):
+        cols = {k.strip().lower(): v for k, v in row.items() if k}
+        column = next((k for k in ("datetime", "timestamp", "date") if cols.get(k) not in (None, "")), None)
+        if column is None:
+            raise ValueError("OHLC file needs a date, datetime or timestamp column")
+        at, timed = _parse_date(cols[column])
+        if column == "date" and at.time() == Time():
+            timed = False
+        clock = cols.get("time")
+        if clock not in (None, ""):
+            if not isinstance(clock, Time):
+                clock = datetime.strptime(str(clock).strip()[:5], "%H:%M").time()
+            at = at.replace(hour=clock.hour, minute=clock.minute)
+        elif not timed:
+            at = at.replace(hour=hh, minute=mm)
+        try:
+            bars.append({"time": at.replace(tzinfo=None),
+                         **{k: float(cols[k]) for k in ("open", "high", "low", "close")}})
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Bad OHLC row: {row}")
+    bars.sort(key=lambda b: b["time"])
+    return bars
+
+
+# ═══════════════════════════════════════════════════════════════
+# SCORING (runs on the ephemeris executor)
+# ═══════════════════════════════════════════════════════════════
+
+def _score_bars(times: Sequence[datetime]) -> List[tuple]:
+    """(total score, trend, {rule: score}, {rule: raw_score}) for each bar time."""
+    result = score_columns(planet_columns(times))
+    rules = result["rules"]
+    return [(score, trend, dict(zip(rules, weighted)), dict(zip(rules, raw)))
+            for score, trend, weighted, raw in zip(result["score"].tolist(), result["trend"],
+                                                   result["weighted"].tolist(), result["raw"].tolist())]
+
+
+def score_bars(times: Sequence[datetime], executor=ephemeris, chunk: int = CHUNK_BARS) -> List[tuple]:
+    jobs = [executor.submit(_score_bars, list(times[i:i + chunk])) for i in range(0, len(times), chunk)]
+    return [row for job in jobs for row in job.result()]
+
+
+# ═══════════════════════════════════════════════════════════════
+# METRICS
+# ═══════════════════════════════════════════════════════════════
+
+def _returns(bars: List[dict], mode: str) -> np.ndarray:
+    return bar_returns(np.array([b["open"] for b in bars]), np.array([b["close"] for b in bars]), mode)
+
+
+def bar_returns(opens: np.ndarray, closes: np.ndarray, mode: str) -> np.ndarray:
+    """Per-bar returns; close_close leaves NaN on the first bar."""
+    if mode == "open_close":
+        return closes / opens - 1.0
+    previous = np.concatenate(([np.nan], closes[:-1]))
+    return closes / previous - 1.0
+
+
+def _corr(x: np.ndarray, y: np.ndarray) -> Optional[float]:
+    if len(x) < 2 or np.std(x) == 0 or np.std(y) == 0:
+        return None
+    return round(float(np.corrcoef(x, y)[0, 1]), 4)
+
+
+def _bucket(trend: str) -> str:
+    # "Very Strong Teji 🟢🟢" -> "Very Strong Teji"
+    return " ".join(word for word in trend.split() if word.isascii())
+
+
+def _report(bars: List[dict], scored: List[tuple], mode: str) -> dict:
+    returns = _returns(bars, mode)
+    valid = ~np.isnan(returns)
+    scores = np.array([row[0] for row in scored])[valid]
+    trends = [_bucket(row[1]) for row, ok in zip(scored, valid) if ok]
+    returns = returns[valid]
+
+    signal = (scores != 0) & (returns != 0)
+    hits = np.sign(scores[signal]) == np.sign(returns[signal])
+
+    buckets = {}
+    for label in TREND_BUCKETS:
+        mask = np.array([t == label for t in trends])
+        if not mask.any():
+            continue
+        r = returns[mask]
+        up, down = float(np.mean(r > 0)), float(np.mean(r < 0))
+        precision = up if "Teji" in label else down if "Mandi" in label else None
+        buckets[label] = {
+            "bars": int(mask.sum()),
+            "mean_return_pct": round(float(np.mean(r)) * 100, 4),
+            "up_rate": round(up, 4),
+            "down_rate": round(down, 4),
+            "precision": round(precision, 4) if precision is not None else None,
+        }
+
+    rule_names = list(dict.fromkeys(name for row in scored for name in row[2]))
+    rule_matrix = np.array([[row[2].get(name, 0.0) for name in rule_names]
+                            for row, ok in zip(scored, valid) if ok]).reshape(len(returns), -1)
+    return {
+        "bars": int(valid.sum()),
+        "from": bars[0]["time"].isoformat(sep=" "),
+        "to": bars[-1]["time"].isoformat(sep=" "),
+        "returns": mode,
+        "signals": int(signal.sum()),
+        "hit_rate": round(float(hits.mean()), 4) if hits.size else None,
+        "score_return_corr": _corr(scores, returns),
+        "buckets": buckets,
+        "rule_correlation": {name: _corr(rule_matrix[:, i], returns) for i, name in enumerate(rule_names)},
+    }
+
+
+def run_backtest(source, session_time: str = DEFAULT_SESSION_TIME, returns: str = "open_close",
+                 start: Date = None, end: Date = None, workers: Optional[int] = None,
+                 executor=ephemeris) -> dict:
+    """
+    Backtest final_score over an OHLC file path (or a list of load_ohlc bars).
+    workers=N scores on a dedicated pool of N processes; otherwise the shared
+    ephemeris executor is used.
+    """
+    if returns not in RETURN_MODES:
+        raise ValueError(f"returns must be one of {', '.join(RETURN_MODES)}")
+    bars = load_ohlc(source, session_time) if isinstance(source, str) else list(source)
+    bars = [b for b in bars if (start is None or b["time"].date() >= start)
+            and (end is None or b["time"].date() <= end)]
+    if len(bars) < 2:
+        raise ValueError("Need at least two bars to backtest")
+
+    began = time.perf_counter()
+    pool = EphemerisExecutor(workers) if workers is not None else executor
+    try:
+        scored = score_bars([b["time"] for b in bars], pool)
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+    report = _report(bars, scored, returns)
+    report["elapsed_seconds"] = round(time.perf_counter() - began, 3)
+    return report
+
+
+# ═══════════════════════════════════════════════════════════════
+# RAW SCORE MATRIX (input to weight_optimizer)
+# ═══════════════════════════════════════════════════════════════
+
+SCORE_MATRIX_VERSION = 1
+
+
+@dataclass
+class ScoreMatrix:
+    """Unweighted rule scores (bars × rules) with the bars' prices."""
+    times: np.ndarray
+    rules: List[str]
+    raw: np.ndarray
+    opens: np.ndarray
+    closes: np.ndarray
+
+    def returns(self, mode: str = "open_close") -> np.ndarray:
+        return bar_returns(self.opens, self.closes, mode)
+
+    def save(self, path: str):
+        np.savez_compressed(path, times=self.times, rules=np.array(self.rules), raw=self.raw,
+                            opens=self.opens, closes=self.closes)
+
+    @classmethod
+    def load(cls, path: str) -> "ScoreMatrix":
+        with np.load(path) as data:
+            return cls(data["times"], [str(r) for r in data["rules"]], data["raw"],
+                       data["opens"], data["closes"])
+
+
+def _rule_inputs_key() -> str:
+    """Hash of the config tables the rules read; weights and trend thresholds are left out."""
+    values = sorted((name, repr(value)) for name, value in vars(config).items()
+                    if name.isupper() and not name.startswith(("WEIGHT_", "TREND_")))
+    return hashlib.sha1(repr(values).encode()).hexdigest()
+
+
+def build_score_matrix(source, session_time: str = DEFAULT_SESSION_TIME, workers: Optional[int] = None,
+                       executor=ephemeris, cache_dir: Optional[str] = DATA_DIR) -> ScoreMatrix:
+    """
+    Raw per-rule scores for every bar of an OHLC file (or list of bars).
+    For files the matrix is cached in cache_dir as an .npz keyed by the
+    file contents, session_time and the rule inputs in config.py, so
+    re-running an optimisation does no astrology at all.
+    """
+    cache_path = None
+    if isinstance(source, str) and cache_dir:
+        with open(source, "rb") as fh:
+            digest = hashlib.sha1(fh.read())
+        digest.update(f"{session_time}|{SCORE_MATRIX_VERSION}|{_rule_inputs_key()}".encode())
+        cache_path = os.path.join(cache_dir, f"score_matrix_{digest.hexdigest()[:16]}.npz")
+        if os.path.exists(cache_path):
+            return ScoreMatrix.load(cache_path)
+
+    bars = load_ohlc(source, session_time) if isinstance(source, str) else list(source)
+    pool = EphemerisExecutor(workers) if workers is not None else executor
+    try:
+        scored = score_bars([b["time"] for b in bars], pool)
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+    rules = list(RULE_WEIGHTS)
+    matrix = ScoreMatrix(
+        times=np.array([b["time"] for b in bars], dtype="datetime64[m]"),
+        rules=rules,
+        raw=np.array([[row[3].get(name, 0.0) for name in rules] for row in scored]).reshape(len(bars), -1),
+        opens=np.array([b["open"] for b in bars]),
+        closes=np.array([b["close"] for b in bars]),
+    )
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        matrix.save(cache_path)
+    return matrix
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Backtest final_score against OHLC bars.")
+    parser.add_argument("path", help="CSV (or Parquet) with date[/time], open, high, low, close")
+    parser.add_argument("--session-time", default=DEFAULT_SESSION_TIME, help="HH:MM for daily bars")
+    parser.add_argument("--returns", choices=RETURN_MODES, default="open_close")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args()
+    print(json.dumps(run_backtest(args.path, args.session_time, args.returns, workers=args.workers),
+                     indent=2, ensure_ascii=False))
+    ephemeris.shutdown()
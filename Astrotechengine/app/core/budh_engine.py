@@ -9,13 +9,17 @@ From document:
   6. Asth effect starts 2 days before
 """
 from .combust_engine import is_combust
+from .config import BUDH_STATION_LEAD_DAYS
 
 
-def evaluate_budh(planets: dict) -> dict:
+def evaluate_budh(planets: dict, station: dict = None) -> dict:
     """
     Evaluates Mercury special logic.
     planets: dict with at least 'mercury', 'sun', 'jupiter', 'venus' entries.
     Each entry must have 'degree', 'retrograde'.
+    station: optional station_engine.station_status("mercury") result. When
+    the next station is within BUDH_STATION_LEAD_DAYS its effect starts
+    early (rule 6): Bakri/Margi is read as after the station.
     Returns dict with 'score', 'details'.
     """
     mercury = planets["mercury"]
@@ -25,13 +29,21 @@ def evaluate_budh(planets: dict) -> dict:
 
     combust = is_combust("mercury", mercury["degree"], sun["degree"])
 
+    # Rule 6: effect starts 2 days before a station
+    retrograde = mercury["retrograde"]
+    upcoming = station["next_station"] if station else None
+    if upcoming and station["days_to_next_station"] <= BUDH_STATION_LEAD_DAYS:
+        retrograde = upcoming["type"] == "retrograde"
+        state = "Bakri" if retrograde else "Margi"
+        details.append(f"Budh turns {state} in {station['days_to_next_station']} days → effect starts")
+
     # Rule 1: Retro + Combust → Teji
-    if mercury["retrograde"] and combust:
+    if retrograde and combust:
         score += 4
         details.append("Budh Bakri+Asth → Strong Teji")
 
     # Rule 2: Margi → Mandi
-    if not mercury["retrograde"]:
+    if not retrograde:
         score -= 2
         details.append("Budh Margi → Mandi")
 
@@ -52,4 +64,7 @@ def evaluate_budh(planets: dict) -> dict:
         score += 3
         details.append("Budh 0° with Sun → Big Move")
 
-    return {"score": score, "details": details, "combust": combust}
+    result = {"score": score, "details": details, "combust": combust}
+    if station:
+        result["station"] = station
+    return result
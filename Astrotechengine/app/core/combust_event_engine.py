@@ -0,0 +1,151 @@
+"""
+Combust Event Engine — exact combustion (asth) windows per planet.
+
+is_combust answers yes/no for one instant. Here the Sun–planet separation
+is sampled and every crossing of the planet's COMBUST_DEGREES orb is
+root-found, giving the instant combustion begins and ends. Entries and
+exits live in an EventIndex ("combustion"), keyed by planet and orb so a
+changed orb in config.py gets its own table, and range or "hours into /
+until combustion" questions are answered by bisection.
+
+The separation is folded to ≤ 180° exactly as in is_combust.
+"""
+
+import datetime
+import math
+from typing import Optional
+
+import pytz
+import swisseph as swe
+
+from .config import COMBUST_DEGREES, TIMEZONE
+from .event_index import EventIndex
+from .root_finder import datetime_from_jd, find_root, jd_from_datetime, signed_arc
+
+COMBUST_PLANETS = {
+    "moon": swe.MOON,
+    "mercury": swe.MERCURY,
+    "venus": swe.VENUS,
+    "mars": swe.MARS,
+    "jupiter": swe.JUPITER,
+    "saturn": swe.SATURN,
+}
+COMBUST_TABLE_VERSION = 1
+_SAMPLE_DAYS = {"moon": 0.25}
+_FLAGS = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+# Longest gap between two combustion events: Mars, about two years
+_HORIZON_DAYS = {"moon": 30}
+_DEFAULT_HORIZON_DAYS = 1000
+
+
+def _body(name: str) -> str:
+    return f"{name}@{COMBUST_DEGREES[name]:g}"
+
+
+def _excess(jd: float, pid: int, orb: float) -> float:
+    """Separation from the Sun minus the orb; negative while combust."""
+    sun = swe.calc_ut(jd, swe.SUN, _FLAGS)[0][0]
+    planet = swe.calc_ut(jd, pid, _FLAGS)[0][0]
+    return abs(signed_arc(planet, sun)) - orb
+
+
+def _combust_events(body: str, start_jd: float, end_jd: float) -> list:
+    """Combustion entries and exits in [start_jd, end_jd) as (jd, kind, orb, "") tuples."""
+    name, orb = body.split("@")
+    pid, orb = COMBUST_PLANETS[name], float(orb)
+    step = _SAMPLE_DAYS.get(name, 1.0)
+    count = max(1, math.ceil((end_jd - start_jd) / step))
+    times = [start_jd + i * (end_jd - start_jd) / count for i in range(count + 1)]
+    values = [_excess(t, pid, orb) for t in times]
+    events = []
+    for t0, t1, v0, v1 in zip(times, times[1:], values, values[1:]):
+        if (v0 > 0) == (v1 > 0):
+            continue
+        jd = find_root(lambda t: _excess(t, pid, orb), t0, t1, v0, v1)
+        if start_jd <= jd < end_jd:
+            events.append((jd, "combust_start" if v0 > 0 else "combust_end", orb, ""))
+    return events
+
+
+combust_index = EventIndex("combustion", _combust_events, COMBUST_TABLE_VERSION)
+
+
+def _horizon(name: str) -> float:
+    return _HORIZON_DAYS.get(name, _DEFAULT_HORIZON_DAYS)
+
+
+def _check_planets(planets):
+    unknown = [p for p in planets or [] if p not in COMBUST_PLANETS]
+    if unknown:
+        raise ValueError(f"Unknown planet(s): {', '.join(unknown)}")
+
+
+def _local(jd: Optional[float], tz) -> Optional[str]:
+    return datetime_from_jd(jd, tz).strftime("%Y-%m-%d %H:%M:%S") if jd is not None else None
+
+
+def combustion_windows(date_from: datetime.date, date_to: datetime.date, planets=None,
+                       index: EventIndex = combust_index) -> list:
+    """
+    Combustion windows overlapping date_from..date_to (inclusive, IST days).
+    Windows are whole: a window already running on date_from, or still
+    running after date_to, keeps its real entry / exit time.
+    """
+    _check_planets(planets)
+    tz = pytz.timezone(TIMEZONE)
+    start_jd = jd_from_datetime(tz.localize(datetime.datetime.combine(date_from, datetime.time())))
+    end_jd = jd_from_datetime(tz.localize(datetime.datetime.combine(date_to, datetime.time()))) + 1
+
+    windows = []
+    for name in planets or COMBUST_PLANETS:
+        body = _body(name)
+        events = index.between(body, start_jd, end_jd)
+        before = index.previous_event(body, start_jd, lookback_days=_horizon(name))
+        if before is not None and before.kind == "combust_start":
+            events = [before] + events
+        if events and events[-1].kind == "combust_start":
+            after = index.next_event(body, events[-1].jd, kinds=("combust_end",), horizon_days=_horizon(name))
+            if after is not None:
+                events = events + [after]
+        if events and events[0].kind == "combust_end":
+            events = events[1:]
+        for entry, exit_ in zip(events[::2], events[1::2] + [None]):
+            windows.append({
+                "planet": name,
+                "orb": COMBUST_DEGREES[name],
+                "start": _local(entry.jd, tz),
+                "end": _local(exit_.jd if exit_ else None, tz),
+                "duration_hours": round((exit_.jd - entry.jd) * 24, 2) if exit_ else None,
+                "start_jd": entry.jd,
+                "end_jd": exit_.jd if exit_ else None,
+            })
+    windows.sort(key=lambda w: w["start_jd"])
+    return windows
+
+
+def combustion_status(name: str, when: datetime.datetime = None,
+                      index: EventIndex = combust_index) -> dict:
+    """
+    Whether a planet is combust at an instant (naive = IST), with
+    hours_into / hours_left of the current window, or hours_until the next.
+    """
+    _check_planets([name])
+    tz = pytz.timezone(TIMEZONE)
+    if when is None:
+        when = datetime.datetime.now(tz)
+    elif when.tzinfo is None:
+        when = tz.localize(when)
+    jd = jd_from_datetime(when)
+    body = _body(name)
+    previous = index.previous_event(body, jd, lookback_days=_horizon(name))
+    following = index.next_event(body, jd, horizon_days=_horizon(name))
+    combust = previous is not None and previous.kind == "combust_start"
+    status = {"planet": name, "orb": COMBUST_DEGREES[name], "combust": combust}
+    if combust:
+        status.update(since=_local(previous.jd, tz), hours_into=round((jd - previous.jd) * 24, 2),
+                      until=_local(following.jd if following else None, tz),
+                      hours_left=round((following.jd - jd) * 24, 2) if following else None)
+    else:
+        status.update(next_start=_local(following.jd if following else None, tz),
+                      hours_until=round((following.jd - jd) * 24, 2) if following else None)
+    return status
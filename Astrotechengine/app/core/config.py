@@ -7,6 +7,33 @@ MUMBAI_LAT = 19.0760
 MUMBAI_LON = 72.8777
 TIMEZONE = "Asia/Kolkata"
 
+# --- Exchanges (KP scans: location, local timezone and session) ---
+EXCHANGES = {
+    "NSE":  {"lat": 19.0760, "lon": 72.8777, "timezone": "Asia/Kolkata", "open": "09:00", "close": "15:30"},
+    "MCX":  {"lat": 19.0760, "lon": 72.8777, "timezone": "Asia/Kolkata", "open": "09:00", "close": "23:30"},
+    "NYSE": {"lat": 40.7069, "lon": -74.0113, "timezone": "America/New_York", "open": "09:30", "close": "16:00"},
+    "LSE":  {"lat": 51.5145, "lon": -0.0990, "timezone": "Europe/London", "open": "08:00", "close": "16:30"},
+    "TSE":  {"lat": 35.6828, "lon": 139.7745, "timezone": "Asia/Tokyo", "open": "09:00", "close": "15:30"},
+    "SGX":  {"lat": 1.2789, "lon": 103.8536, "timezone": "Asia/Singapore", "open": "09:00", "close": "17:00"},
+}
+
+# --- Sky Snapshot ---
+SNAPSHOT_BUCKET_SECONDS = 30  # "now" positions are shared within each bucket
+
+# --- Prediction memo (/predict/daily, /predict/range) ---
+PREDICTION_CACHE_SIZE = 4096           # memoized results kept (LRU)
+PREDICTION_CACHE_TTL_SECONDS = 21600   # and for at most this long
+PREDICTION_RANGE_MAX_POINTS = 2000     # largest /predict/range request
+PREDICTION_RANGE_CACHE_SIZE = 16       # range results kept in their own LRU
+
+# --- Live scoring (/predict/live) ---
+LIVE_CLIENTS_MAX = 256  # client tokens whose last-sent rule scores are kept (LRU)
+
+# --- Stations (retrograde / direct) ---
+STATION_TABLE_PAST_DAYS = 1000     # station table covers this far back from first use...
+STATION_TABLE_FUTURE_DAYS = 1830   # ...and this far ahead; later lookups extend it
+BUDH_STATION_LEAD_DAYS = 2         # Budh effect starts this many days before a station
+
 # --- Nakshatra ---
 NAKSHATRA_SPAN = 13 + 20 / 60  # 13°20' = 13.3333...
 TOTAL_NAKSHATRAS = 27
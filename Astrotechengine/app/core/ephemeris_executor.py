@@ -0,0 +1,179 @@
+"""
+Ephemeris Executor — isolated Swiss Ephemeris state for concurrent requests.
+
+swisseph keeps the ephemeris path, sidereal mode and topocentric position
+as process-wide globals. FastAPI runs sync routes on a thread pool, so two
+requests needing different settings could switch them under each other
+mid-calculation. Every ephemeris computation made on behalf of a request
+goes through this executor instead:
+
+  EPHEMERIS_WORKERS > 0   one process pool per EphemerisConfig; each worker
+                          applies its config once at start-up, so requests
+                          with the same settings run in parallel across cores.
+                          Defaults to the number of cores this process may use.
+  EPHEMERIS_WORKERS = 0   a single in-process worker thread that runs jobs
+                          one at a time and applies the job's config before
+                          it runs if it differs from the last.
+
+Jobs are plain module-level functions plus arguments, so they pickle into
+worker processes. Calls made from inside a job run inline rather than
+being queued behind the job itself; an inline job with another config
+restores the outer job's settings when it returns.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import swisseph as swe
+
+
+def _available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not on Linux
+        return os.cpu_count() or 1
+
+
+EPHEMERIS_WORKERS = int(os.getenv("EPHEMERIS_WORKERS", str(_available_cores())))
+EPHE_PATH = os.getenv("EPHE_PATH", "./ephemeris")
+
+
+@dataclass(frozen=True)
+class EphemerisConfig:
+    sid_mode: int = swe.SIDM_LAHIRI
+    topo: Optional[Tuple[float, float, float]] = None   # (lon, lat, altitude)
+    ephe_path: str = EPHE_PATH
+
+    def apply(self):
+        swe.set_ephe_path(self.ephe_path)
+        swe.set_sid_mode(self.sid_mode)
+        if self.topo is not None:
+            swe.set_topo(*self.topo)
+
+
+DEFAULT_CONFIG = EphemerisConfig()
+
+_local = threading.local()
+_applied: Optional[EphemerisConfig] = None
+
+
+def _init_worker(config: EphemerisConfig):
+    global _applied
+    config.apply()
+    _applied = config
+    _local.inside = True
+
+
+def _run_serial(config: EphemerisConfig, func: Callable, args, kwargs):
+    global _applied
+    _local.inside = True
+    if _applied != config:
+        config.apply()
+        _applied = config
+    return func(*args, **kwargs)
+
+
+def _run_nested(config: EphemerisConfig, func: Callable, args, kwargs):
+    """Inline job from inside another; puts the outer job's settings back afterwards."""
+    global _applied
+    outer = _applied
+    if outer == config:
+        return func(*args, **kwargs)
+    config.apply()
+    _applied = config
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if outer is not None:
+            outer.apply()
+        _applied = outer
+
+
+def timed(func: Callable, *args, **kwargs):
+    """Job wrapper returning (result, seconds) measured where the job ran."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class EphemerisExecutor:
+    def __init__(self, workers: int = EPHEMERIS_WORKERS):
+        self.workers = workers
+        self._pools: Dict[EphemerisConfig, ProcessPoolExecutor] = {}
+        self._serial: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.jobs = 0
+
+    def _pool(self, config: EphemerisConfig):
+        with self._lock:
+            if self.workers <= 0:
+                if self._serial is None:
+                    self._serial = ThreadPoolExecutor(1, thread_name_prefix="ephemeris")
+                return self._serial
+            pool = self._pools.get(config)
+            if pool is None:
+                # spawn: a forked child would inherit the parent's threads and locks
+                pool = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(config,),
+                )
+                self._pools[config] = pool
+            return pool
+
+    def submit(self, func: Callable, *args, config: EphemerisConfig = DEFAULT_CONFIG,
+               **kwargs) -> Future:
+        self.jobs += 1
+        if getattr(_local, "inside", False):
+            # Already on an ephemeris worker: run here instead of deadlocking on ourselves
+            future = Future()
+            try:
+                future.set_result(_run_nested(config, func, args, kwargs))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        pool = self._pool(config)
+        if self.workers <= 0:
+            return pool.submit(_run_serial, config, func, args, kwargs)
+        return pool.submit(func, *args, **kwargs)
+
+    async def run(self, func: Callable, *args, config: EphemerisConfig = DEFAULT_CONFIG,
+                  **kwargs):
+        return await asyncio.wrap_future(self.submit(func, *args, config=config, **kwargs))
+
+    def run_sync(self, func: Callable, *args, config: EphemerisConfig = DEFAULT_CONFIG,
+                 **kwargs):
+        return self.submit(func, *args, config=config, **kwargs).result()
+
+    def stats(self) -> Dict:
+        return {
+            "mode": "processes" if self.workers > 0 else "serial",
+            "workers": self.workers,
+            "configs": len(self._pools),
+            "jobs": self.jobs,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            for pool in self._pools.values():
+                pool.shutdown(cancel_futures=True)
+            self._pools.clear()
+            if self._serial is not None:
+                self._serial.shutdown(cancel_futures=True)
+                self._serial = None
+
+
+ephemeris = EphemerisExecutor()
+
+
+async def run_ephemeris(func: Callable, *args, config: EphemerisConfig = DEFAULT_CONFIG,
+                        **kwargs):
+    """Run func(*args, **kwargs) on the ephemeris executor and await its result."""
+    return await ephemeris.run(func, *args, config=config, **kwargs)
@@ -0,0 +1,190 @@
+"""
+Event Index — persisted, sorted per-body event timelines.
+
+Engines that answer "when does X next happen" (equator crossings, sign
+ingresses, stations) register a finder(body, start_jd, end_jd) returning
+the events with start_jd <= jd < end_jd. The index calls it only for the
+part of a requested span not covered yet, stores the events in the result
+store and keeps them in memory as sorted lists, so lookups are a bisect.
+
+Each body's coverage is one contiguous [start_jd, end_jd) span that grows
+at either end. Finders run on the ephemeris executor; the index itself
+(and every store write) stays in the calling process.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .ephemeris_executor import ephemeris
+from .result_store import result_store
+
+EVENT_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS index_events (
+    engine  TEXT    NOT NULL,
+    version INTEGER NOT NULL,
+    body    TEXT    NOT NULL,
+    jd      REAL    NOT NULL,
+    kind    TEXT    NOT NULL,
+    value   REAL,
+    detail  TEXT,
+    PRIMARY KEY (engine, version, body, jd, kind)
+);
+CREATE TABLE IF NOT EXISTS index_coverage (
+    engine   TEXT    NOT NULL,
+    version  INTEGER NOT NULL,
+    body     TEXT    NOT NULL,
+    start_jd REAL    NOT NULL,
+    end_jd   REAL    NOT NULL,
+    PRIMARY KEY (engine, version, body)
+);
+"""
+
+
+@dataclass(frozen=True)
+class IndexedEvent:
+    body: str
+    jd: float
+    kind: str
+    value: Optional[float] = None
+    detail: str = ""
+
+
+class EventIndex:
+    def __init__(self, engine: str, finder: Callable, version: int = 1,
+                 store=result_store, executor=ephemeris):
+        self.engine = engine
+        self.finder = finder
+        self.version = version
+        self.store = store
+        self.executor = executor
+        self._events: Dict[str, List[IndexedEvent]] = {}
+        self._jds: Dict[str, List[float]] = {}
+        self._coverage: Dict[str, Optional[Tuple[float, float]]] = {}
+        self._lock = threading.RLock()
+        self.finder_calls = 0
+
+    def _load(self, body: str):
+        if body in self._coverage:
+            return
+        self.store.ensure(EVENT_INDEX_SCHEMA)
+        rows = self.store.query(
+            "SELECT start_jd, end_jd FROM index_coverage WHERE engine = ? AND version = ? AND body = ?",
+            (self.engine, self.version, body))
+        self._coverage[body] = (rows[0]["start_jd"], rows[0]["end_jd"]) if rows else None
+        events = [
+            IndexedEvent(body, row["jd"], row["kind"], row["value"], row["detail"] or "")
+            for row in self.store.query(
+                "SELECT jd, kind, value, detail FROM index_events"
+                " WHERE engine = ? AND version = ? AND body = ? ORDER BY jd",
+                (self.engine, self.version, body))
+        ]
+        self._events[body] = events
+        self._jds[body] = [e.jd for e in events]
+
+    def coverage(self, body: str) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            self._load(body)
+            return self._coverage[body]
+
+    def ensure(self, body: str, start_jd: float, end_jd: float):
+        """
+        Make [start_jd, end_jd) covered, computing only the missing margins.
+        Finders run without the lock, so lookups on covered spans are not
+        held up by a long build; results are merged under it.
+        """
+        while True:
+            with self._lock:
+                self._load(body)
+                covered = self._coverage[body]
+            if covered is None:
+                gaps = [(start_jd, end_jd)]
+            else:
+                gaps = []
+                if start_jd < covered[0]:
+                    gaps.append((start_jd, covered[0]))
+                if end_jd > covered[1]:
+                    gaps.append((covered[1], end_jd))
+            if not gaps:
+                return
+            futures = [self.executor.submit(self.finder, body, lo, hi) for lo, hi in gaps]
+            found = [IndexedEvent(body, *event) for f in futures for event in f.result()]
+            lo = min(start_jd, covered[0]) if covered else start_jd
+            hi = max(end_jd, covered[1]) if covered else end_jd
+            if self._merge(body, covered, lo, hi, found, len(gaps)):
+                return
+
+    def _merge(self, body: str, covered, lo: float, hi: float,
+               found: List[IndexedEvent], calls: int) -> bool:
+        """
+        Add events found for [lo, hi) that was computed from coverage
+        `covered`. False if another caller meanwhile grew the coverage so
+        the two spans would not be contiguous; the caller then retries.
+        """
+        with self._lock:
+            self._load(body)
+            current = self._coverage[body]
+            if current != covered and current is not None:
+                if current[1] < lo or hi < current[0]:
+                    return False
+                lo, hi = min(lo, current[0]), max(hi, current[1])
+            self.finder_calls += calls
+            with self.store.transaction() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO index_events (engine, version, body, jd, kind, value, detail)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(self.engine, self.version, body, e.jd, e.kind, e.value, e.detail) for e in found])
+                conn.execute(
+                    "INSERT OR REPLACE INTO index_coverage (engine, version, body, start_jd, end_jd)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (self.engine, self.version, body, lo, hi))
+            self._coverage[body] = (lo, hi)
+            # Spans computed concurrently can overlap; keep one event per (jd, kind) as the table does
+            merged = {(e.jd, e.kind): e for e in self._events[body] + found}
+            events = sorted(merged.values(), key=lambda e: e.jd)
+            self._events[body] = events
+            self._jds[body] = [e.jd for e in events]
+            return True
+
+    def between(self, body: str, start_jd: float, end_jd: float,
+                kinds: Optional[Sequence[str]] = None) -> List[IndexedEvent]:
+        """Events with start_jd <= jd < end_jd, computing the span if needed."""
+        self.ensure(body, start_jd, end_jd)
+        with self._lock:
+            jds, events = self._jds[body], self._events[body]
+            found = events[bisect_left(jds, start_jd):bisect_left(jds, end_jd)]
+        return [e for e in found if kinds is None or e.kind in kinds]
+
+    def next_event(self, body: str, jd: float, kinds: Optional[Sequence[str]] = None,
+                   chunk_days: float = 60.0, horizon_days: float = 6000.0) -> Optional[IndexedEvent]:
+        """First event after jd, extending coverage chunk by chunk up to horizon_days."""
+        reach = jd
+        while True:
+            with self._lock:
+                self._load(body)
+                covered = self._coverage[body]
+                if covered and covered[0] <= jd:
+                    jds, events = self._jds[body], self._events[body]
+                    for e in events[bisect_right(jds, jd):bisect_left(jds, covered[1])]:
+                        if kinds is None or e.kind in kinds:
+                            return e
+                    reach = max(reach, covered[1])
+            if reach - jd >= horizon_days:
+                return None
+            self.ensure(body, jd, min(reach + chunk_days, jd + horizon_days))
+            reach = self._coverage[body][1]
+            chunk_days *= 2
+
+    def previous_event(self, body: str, jd: float, kinds: Optional[Sequence[str]] = None,
+                       lookback_days: float = 400.0) -> Optional[IndexedEvent]:
+        """Last event at or before jd within lookback_days."""
+        for e in reversed(self.between(body, jd - lookback_days, jd + 1e-9, kinds)):
+            return e
+        return None
+
+    def clear_memory(self):
+        with self._lock:
+            self._events.clear()
+            self._jds.clear()
+            self._coverage.clear()
@@ -0,0 +1,194 @@
+"""
+Incremental Scoring Engine — rescore only the rules whose inputs changed.
+
+Between two live ticks the outer planets barely move and most rules give
+the same result. Each rule in scoring_engine.RULES has an input key here:
+the discrete facts its whole result (score and detail) depends on, e.g.
+the Moon's and Sun's rashi for Tarva Rashi, the Mercury combust / retro /
+conjunction flags for Budh, the weekday and Moon nakshatra for the day
+rule. IncrementalScorer keeps the last key and result of every rule and
+reruns a rule only when its key differs; the output equals final_score.
+
+The rule cache is shared by every caller. "changed_rules" is per client:
+each client token keeps the rule scores it was last sent (the most recent
+LIVE_CLIENTS_MAX tokens), so two dashboards polling the same scorer each
+see every change since their own previous call.
+
+  rule                  input key
+  01_SBC_Vedh           nakshatra of every planet's degree
+  02_Drishti            aspect zone of each benefic / malefic from Sun and Moon
+  03_Tarva_Rashi        Moon, Sun rashi
+  04_Nakshatra_Tendency Moon, Sun nakshatra
+  05_Planet_Power       every planet's rashi
+  06_Sun_Moon_Zero      Moon, Sun degree in rashi as printed (0.1° / 0.01°)
+  07_Paap_Khatri        malefics and Mercury within 10° of the Moon
+  08_Budh_Yog           Mercury retro / combust, within 5° of Jupiter, Venus, 1° of Sun
+  09_Surya_Nakshatra    Sun nakshatra
+  10_Day_Nakshatra      weekday, Moon nakshatra
+  11_Planet_Info        every planet's rashi, retro, combust
+  12_Viprit_Raj         every planet's rashi, retro, combust
+  13_Tithi_Purnima      tithi, Moon combust
+  Moon_Rashi            Moon rashi
+  Navansh_Barguttam     Moon D1, D9 rashi
+
+Results are shared between ticks; treat them as read-only.
+"""
+
+import bisect
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import pytz
+
+from .combust_engine import is_combust
+from .config import (
+    ASPECT_ORB, ASPECT_SCORES, BENEFIC_PLANETS, LIVE_CLIENTS_MAX, MALEFIC_PLANETS, TIMEZONE,
+)
+from .nakshatra_engine import calculate_nakshatra
+from .scoring_engine import RULES, summarize
+from .tithi_engine import calculate_tithi
+
+
+def _sep(a: float, b: float) -> float:
+    diff = abs(a - b)
+    return min(diff, 360 - diff)
+
+
+def _status(planets: dict) -> tuple:
+    sun = planets["sun"]["degree"]
+    return tuple((p, d.get("rashi"), d.get("retrograde", False), is_combust(p, d["degree"], sun))
+                 for p, d in planets.items())
+
+
+# Aspect windows open and close only at these separations
+_ASPECT_EDGES = sorted({edge for angle in ASPECT_SCORES for edge in (angle - ASPECT_ORB, angle + ASPECT_ORB)})
+_EDGE_MARGIN = 1e-9
+
+
+def _aspect_zone(diff: float):
+    """Same zone ⇒ same calculate_aspect score; separations within a hair of an edge key on themselves."""
+    i = bisect.bisect(_ASPECT_EDGES, diff)
+    if (i and diff - _ASPECT_EDGES[i - 1] < _EDGE_MARGIN) or (
+            i < len(_ASPECT_EDGES) and _ASPECT_EDGES[i] - diff < _EDGE_MARGIN):
+        return diff
+    return i
+
+
+def _drishti(planets: dict) -> tuple:
+    targets = (planets["sun"]["degree"], planets["moon"]["degree"])
+    return tuple(_aspect_zone(_sep(d["degree"], target)) for target in targets
+                 for p, d in planets.items()
+                 if p not in ("sun", "moon") and (p in BENEFIC_PLANETS or p in MALEFIC_PLANETS))
+
+
+def _zero(planets: dict) -> tuple:
+    moon, sun = planets["moon"]["degree"] % 30, planets["sun"]["degree"] % 30
+    return moon < 1.0, sun < 1.0, f"{moon:.2f}", f"{sun:.2f}", f"{moon:.1f}", f"{sun:.1f}"
+
+
+def _pap_khatri(planets: dict) -> tuple:
+    moon = planets["moon"]["degree"]
+    near = tuple(_sep(planets[p]["degree"], moon) < 10 for p in MALEFIC_PLANETS if p in planets)
+    return near, "mercury" in planets and _sep(planets["mercury"]["degree"], moon) < 10
+
+
+def _budh(planets: dict) -> tuple:
+    mercury, sun = planets["mercury"], planets["sun"]["degree"]
+    return (mercury["retrograde"], is_combust("mercury", mercury["degree"], sun),
+            tuple(_sep(planets[p]["degree"], mercury["degree"]) < 5 for p in ("jupiter", "venus") if p in planets),
+            _sep(mercury["degree"], sun) < 1)
+
+
+RULE_INPUTS: Dict[str, Callable] = {
+    "01_SBC_Vedh":           lambda p, at: tuple(calculate_nakshatra(d["degree"]) for d in p.values()),
+    "02_Drishti":            lambda p, at: _drishti(p),
+    "03_Tarva_Rashi":        lambda p, at: (p["moon"].get("rashi"), p["sun"].get("rashi")),
+    "04_Nakshatra_Tendency": lambda p, at: (p["moon"].get("nakshatra"), p["sun"].get("nakshatra")),
+    "05_Planet_Power":       lambda p, at: tuple((n, d.get("rashi")) for n, d in p.items()),
+    "06_Sun_Moon_Zero":      lambda p, at: _zero(p),
+    "07_Paap_Khatri":        lambda p, at: _pap_khatri(p),
+    "08_Budh_Yog":           lambda p, at: _budh(p),
+    "09_Surya_Nakshatra":    lambda p, at: p["sun"].get("nakshatra"),
+    "10_Day_Nakshatra":      lambda p, at: (at.weekday(), p["moon"].get("nakshatra")),
+    "11_Planet_Info":        lambda p, at: _status(p),
+    "12_Viprit_Raj":         lambda p, at: _status(p),
+    "13_Tithi_Purnima":      lambda p, at: (calculate_tithi(p["sun"]["degree"], p["moon"]["degree"]),
+                                            is_combust("moon", p["moon"]["degree"], p["sun"]["degree"])),
+    "Moon_Rashi":            lambda p, at: p["moon"].get("rashi"),
+    "Navansh_Barguttam":     lambda p, at: (p["moon"].get("rashi"), p["moon"].get("d9_rashi")),
+}
+
+_MISSING = object()
+
+
+class IncrementalScorer:
+    """final_score that keeps each rule's last input key and result between ticks."""
+
+    def __init__(self, max_clients: int = LIVE_CLIENTS_MAX):
+        self._lock = threading.Lock()
+        self._keys: Dict[str, object] = {}
+        self._results: Dict[str, Optional[dict]] = {}
+        self._sent: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+        self.max_clients = max_clients
+        self.ticks = 0
+        self.recomputed = 0
+
+    def score(self, planets: dict, at: datetime.datetime = None, client: Optional[str] = None) -> dict:
+        """
+        final_score(planets, at) plus "recomputed_rules" (inputs changed since
+        the cache's previous tick, whoever asked) and "changed_rules" (score
+        differs from what this client was last sent; every rule on a client's
+        first call, and on every call without a client token).
+        """
+        if at is None:
+            at = datetime.datetime.now(pytz.timezone(TIMEZONE))
+        breakdown, recomputed, scores = {}, [], {}
+        with self._lock:
+            for name, rule in RULES:
+                key = RULE_INPUTS[name](planets, at)
+                previous = self._results.get(name, _MISSING)
+                if previous is not _MISSING and self._keys[name] == key:
+                    result = previous
+                else:
+                    result = rule(planets, at)
+                    recomputed.append(name)
+                    self._keys[name], self._results[name] = key, result
+                scores[name] = _score(result)
+                if result is not None:
+                    breakdown[name] = result
+            sent = self._sent.pop(client, None) if client is not None else None
+            if client is not None:
+                self._sent[client] = scores
+                while len(self._sent) > self.max_clients:
+                    self._sent.popitem(last=False)
+            self.ticks += 1
+            self.recomputed += len(recomputed)
+        scored = summarize(breakdown)
+        scored["recomputed_rules"] = recomputed
+        scored["changed_rules"] = [name for name, score in scores.items()
+                                   if sent is None or sent.get(name, _MISSING) != score]
+        return scored
+
+    def reset(self):
+        with self._lock:
+            self._keys.clear()
+            self._results.clear()
+            self._sent.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "ticks": self.ticks,
+            "rules": len(RULES),
+            "recomputed": self.recomputed,
+            "clients": len(self._sent),
+            "reuse_rate": round(1 - self.recomputed / (self.ticks * len(RULES)), 4) if self.ticks else None,
+        }
+
+
+def _score(result: Optional[dict]):
+    return None if result is None else result["score"]
+
+
+live_scorer = IncrementalScorer()
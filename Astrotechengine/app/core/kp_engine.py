@@ -14,7 +14,12 @@ are embedded to avoid CSV file dependencies.
 """
 
 import swisseph as swe
+from bisect import bisect_right
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from fractions import Fraction
+
+import numpy as np
 
 # ─── Swiss Ephemeris Config ──────────────────────────────────
 swe.set_ephe_path("./ephemeris")
@@ -28,6 +33,13 @@ IST = timezone(timedelta(hours=5, minutes=30))
 MUMBAI_LAT = 19.0760
 MUMBAI_LON = 72.8777
 
+# Default trading session (IST)
+SESSION_START = "09:00"
+SESSION_END = "15:30"
+
+# Bump when slot output changes, so stored scans are recomputed
+KP_ENGINE_VERSION = 1
+
 # ─── Planet IDs ──────────────────────────────────────────────
 PLANETS = {
     "Sun": swe.SUN,
@@ -70,6 +82,64 @@ NAK_DEG = 13 + 20 / 60          # 13°20'
 NAK_ARCMIN = 800.0               # 13°20' in arc-minutes
 TOTAL_YEARS = 120.0
 
+
+ARCSEC_PER_SIGN = 30 * 3600
+ARCSEC_PER_NAK = 48000           # 13°20'
+
+
+@dataclass(frozen=True)
+class KPDivision:
+    index: int
+    start: float                 # degrees, inclusive
+    end: float                   # degrees, exclusive
+    sign_lord: str
+    star_lord: str
+    sub_lord: str
+
+
+def _dasha_from(lord: str) -> list:
+    idx = DASHA_ORDER.index(lord)
+    return [DASHA_ORDER[(idx + i) % 9] for i in range(9)]
+
+
+def _build_kp_tables():
+    """
+    The 249 KP sign/star/sub divisions and the 2187 sub-sub divisions.
+    Boundaries are accumulated exactly in arc-seconds (a sub spans
+    400 × dasha years) and only converted to degrees at the end.
+    """
+    divisions, sub_subs = [], []
+    for nak in range(27):
+        star = NAKSHATRA_LORDS[nak]
+        start = Fraction(nak * ARCSEC_PER_NAK)
+        for sub in _dasha_from(star):
+            span = Fraction(ARCSEC_PER_NAK * DASHA_YEARS[sub], int(TOTAL_YEARS))
+            # A sign boundary inside a sub splits it into two divisions
+            cuts = [start]
+            sign_edge = (start // ARCSEC_PER_SIGN + 1) * ARCSEC_PER_SIGN
+            if sign_edge < start + span:
+                cuts.append(Fraction(sign_edge))
+            cuts.append(start + span)
+            for lo, hi in zip(cuts, cuts[1:]):
+                divisions.append((lo, hi, RASHI_LORDS[int(lo // ARCSEC_PER_SIGN)], star, sub))
+            ss_start = start
+            for sub_sub in _dasha_from(sub):
+                sub_subs.append((float(ss_start / 3600), sub_sub))
+                ss_start += span * DASHA_YEARS[sub_sub] / int(TOTAL_YEARS)
+            start += span
+    table = [
+        KPDivision(i, float(lo / 3600), float(hi / 3600), sign, star, sub)
+        for i, (lo, hi, sign, star, sub) in enumerate(divisions)
+    ]
+    return table, [s for s, _ in sub_subs], [lord for _, lord in sub_subs]
+
+
+KP_TABLE, SUB_SUB_STARTS, SUB_SUB_LORDS = _build_kp_tables()
+KP_BOUNDARIES = [row.start for row in KP_TABLE]
+_KP_STARTS = np.array(KP_BOUNDARIES)
+_SUB_LORD_NAMES = np.array([row.sub_lord for row in KP_TABLE])
+_SUB_SUB_STARTS = np.array(SUB_SUB_STARTS)
+
 # ─── Bhava Impact Map (Planet-House → Impact) ────────────────
 BHAVA_IMPACT = {
     "Mars-1": "Trending", "Mars-2": "Positive", "Mars-3": "Positive",
@@ -189,20 +259,62 @@ def _star_lord(deg: float) -> str:
 
 
 def _sub_lord(deg: float) -> str:
-    deg = _norm(deg)
-    nak = int(deg // NAK_DEG)
-    offset = (deg - nak * NAK_DEG) * 60  # in arc-minutes
-    start = NAKSHATRA_LORDS[nak]
-    idx = DASHA_ORDER.index(start)
-    total = 0.0
-    lord = start
-    for i in range(9):
-        lord = DASHA_ORDER[(idx + i) % 9]
-        span = NAK_ARCMIN * (DASHA_YEARS[lord] / TOTAL_YEARS)
-        total += span
-        if offset <= total:
-            return lord
-    return lord
+    return kp_division(deg).sub_lord
+
+
+def kp_division(deg: float) -> KPDivision:
+    """Sign/star/sub division containing a sidereal longitude."""
+    return KP_TABLE[bisect_right(KP_BOUNDARIES, _norm(deg)) - 1]
+
+
+def kp_sub_sub_lord(deg: float) -> str:
+    return SUB_SUB_LORDS[bisect_right(SUB_SUB_STARTS, _norm(deg)) - 1]
+
+
+def kp_lords(deg: float) -> dict:
+    """All four KP lords of a longitude, e.g. for /kp/sublord."""
+    row = kp_division(deg)
+    return {
+        "longitude": round(_norm(deg), 6),
+        "division": row.index,
+        "start": round(row.start, 6),
+        "end": round(row.end, 6),
+        "sign_lord": row.sign_lord,
+        "star_lord": row.star_lord,
+        "sub_lord": row.sub_lord,
+        "sub_sub_lord": kp_sub_sub_lord(deg),
+    }
+
+
+def kp_division_indices(degs) -> np.ndarray:
+    """Vectorised kp_division: KP_TABLE row index for each longitude."""
+    return np.searchsorted(_KP_STARTS, np.mod(np.asarray(degs, dtype=float), 360.0),
+                           side="right") - 1
+
+
+def sub_lords(degs) -> np.ndarray:
+    return _SUB_LORD_NAMES[kp_division_indices(degs)]
+
+
+def kp_lords_batch(degs) -> list[dict]:
+    """kp_lords for many longitudes with two searchsorted calls."""
+    degs = np.mod(np.asarray(degs, dtype=float), 360.0)
+    rows = kp_division_indices(degs)
+    sub_subs = np.searchsorted(_SUB_SUB_STARTS, degs, side="right") - 1
+    out = []
+    for deg, i, j in zip(degs.tolist(), rows.tolist(), sub_subs.tolist()):
+        row = KP_TABLE[i]
+        out.append({
+            "longitude": round(deg, 6),
+            "division": i,
+            "start": round(row.start, 6),
+            "end": round(row.end, 6),
+            "sign_lord": row.sign_lord,
+            "star_lord": row.star_lord,
+            "sub_lord": row.sub_lord,
+            "sub_sub_lord": SUB_SUB_LORDS[j],
+        })
+    return out
 
 
 def _bhava_house(lon: float, ascmc, lat: float, eps: float) -> int:
@@ -228,6 +340,37 @@ def _get_outcome(final_view: str, moon_view: str) -> str:
 # KP SLOT CALCULATION
 # ═══════════════════════════════════════════════════════════════
 
+class KPSlotContext:
+    """
+    Positions for one instant. Each body is computed once, on first use,
+    and its bhava placement is memoised, so views that share a lord (or
+    Rahu and Ketu, which share the node) cost one ephemeris call.
+    """
+
+    def __init__(self, dt: datetime, lat: float = MUMBAI_LAT, lon: float = MUMBAI_LON):
+        self.dt, self.lat = dt, lat
+        self.jd = _jd_from_ist(dt)
+        self.houses, self.ascmc = swe.houses_ex(self.jd, lat, lon, b'P', SID_FLAG)
+        self.eps = swe.calc_ut(self.jd, swe.ECL_NUT, 0)[0][0]
+        self._longitudes = {}
+        self._bhavas = {}
+
+    def planet_lon(self, name: str) -> float:
+        body = PLANETS[name]
+        if body not in self._longitudes:
+            self._longitudes[body] = swe.calc_ut(self.jd, body, SID_FLAG)[0][0]
+        return self._longitudes[body]
+
+    def bhava_house(self, lon: float) -> int:
+        if lon not in self._bhavas:
+            self._bhavas[lon] = _bhava_house(lon, self.ascmc, self.lat, self.eps)
+        return self._bhavas[lon]
+
+    def slot(self) -> dict:
+        return kp_slot_from_positions(self.dt, self.houses, self.ascmc, self.eps, self.lat,
+                                      self.planet_lon, self.bhava_house)
+
+
 def calculate_kp_slot(dt: datetime,
                       lat: float = MUMBAI_LAT,
                       lon: float = MUMBAI_LON) -> dict:
@@ -239,38 +382,46 @@ def calculate_kp_slot(dt: datetime,
       moon_view, 5th_sign_view, 5th_star_view, 11th_view,
       final_view, outcome
     """
-    jd = _jd_from_ist(dt)
+    return KPSlotContext(dt, lat, lon).slot()
 
-    # Placidus houses
-    houses, ascmc = swe.houses_ex(jd, lat, lon, b'P', SID_FLAG)
-    eps = swe.calc_ut(jd, swe.ECL_NUT, 0)[0][0]
+
+def kp_slot_from_positions(dt: datetime, houses, ascmc, eps: float, lat: float,
+                           planet_lon, bhava_house=None) -> dict:
+    """
+    KP slot fields from already-known cusps and a planet_lon(name) lookup.
+    Shared by the per-slot scan and the event timeline.
+    """
+    if bhava_house is None:
+        def bhava_house(lon: float) -> int:
+            return _bhava_house(lon, ascmc, lat, eps)
 
     # ── Moon Sub Lord ──
-    moon_lon = swe.calc_ut(jd, swe.MOON, SID_FLAG)[0][0]
+    moon_lon = planet_lon("Moon")
     moon_sl = _sub_lord(moon_lon)
     if moon_sl == "Ketu":
-        rahu_lon = swe.calc_ut(jd, swe.MEAN_NODE, SID_FLAG)[0][0]
+        rahu_lon = planet_lon("Rahu")
         moon_sl_lon = _norm(rahu_lon + 180)
     else:
-        moon_sl_lon = swe.calc_ut(jd, PLANETS[moon_sl], SID_FLAG)[0][0]
-    moon_sl_house = _bhava_house(moon_sl_lon, ascmc, lat, eps)
+        moon_sl_lon = planet_lon(moon_sl)
+    moon_sl_house = bhava_house(moon_sl_lon)
 
     # ── 5th House ──
     h5 = houses[4]
     fifth_rl = _rashi_lord(h5)
     fifth_stl = _star_lord(h5)
 
-    fifth_rl_lon = swe.calc_ut(jd, PLANETS[fifth_rl], SID_FLAG)[0][0]
-    fifth_rl_house = _bhava_house(fifth_rl_lon, ascmc, lat, eps)
+    fifth_rl_lon = planet_lon(fifth_rl)
+    fifth_rl_house = bhava_house(fifth_rl_lon)
 
-    fifth_stl_lon = swe.calc_ut(jd, PLANETS[fifth_stl], SID_FLAG)[0][0]
-    fifth_stl_house = _bhava_house(fifth_stl_lon, ascmc, lat, eps)
+    # PLANETS maps Ketu to the node itself, so a Ketu star lord is placed at Rahu
+    fifth_stl_lon = planet_lon(fifth_stl)
+    fifth_stl_house = bhava_house(fifth_stl_lon)
 
     # ── 11th House ──
     h11 = houses[10]
     eleventh_stl = _star_lord(h11)
-    eleventh_stl_lon = swe.calc_ut(jd, PLANETS[eleventh_stl], SID_FLAG)[0][0]
-    eleventh_stl_house = _bhava_house(eleventh_stl_lon, ascmc, lat, eps)
+    eleventh_stl_lon = planet_lon(eleventh_stl)
+    eleventh_stl_house = bhava_house(eleventh_stl_lon)
 
     # ── Views ──
     moon_sub_label = f"{moon_sl}-{moon_sl_house}"
@@ -305,11 +456,17 @@ def calculate_kp_slot(dt: datetime,
 # FULL DAY KP SCAN
 # ═══════════════════════════════════════════════════════════════
 
-def generate_time_slots(date: datetime, step_minutes: int = 5):
-    """Yield IST datetimes from 9:00 AM to 3:30 PM in `step_minutes` intervals."""
-    t = datetime(date.year, date.month, date.day, 9, 0, tzinfo=IST)
-    end = datetime(date.year, date.month, date.day, 15, 30, tzinfo=IST)
-    while t <= end:
+def _session_bound(date: datetime, hhmm: str, tz=IST) -> datetime:
+    h, m = map(int, hhmm.split(":"))
+    return datetime(date.year, date.month, date.day, h, m, tzinfo=tz)
+
+
+def generate_time_slots(date: datetime, step_minutes: int = 5,
+                        start: str = SESSION_START, end: str = SESSION_END, tz=IST):
+    """Yield datetimes from `start` to `end` (HH:MM, local to tz) in `step_minutes` intervals."""
+    t = _session_bound(date, start, tz)
+    stop = _session_bound(date, end, tz)
+    while t <= stop:
         yield t
         t += timedelta(minutes=step_minutes)
 
@@ -317,7 +474,10 @@ def generate_time_slots(date: datetime, step_minutes: int = 5):
 def calculate_kp_intraday(date: datetime = None,
                           step_minutes: int = 5,
                           lat: float = MUMBAI_LAT,
-                          lon: float = MUMBAI_LON) -> list[dict]:
+                          lon: float = MUMBAI_LON,
+                          start: str = SESSION_START,
+                          end: str = SESSION_END,
+                          tz=IST) -> list[dict]:
     """
     Generate KP intraday data for every `step_minutes` slot on a given date.
 
@@ -325,6 +485,8 @@ def calculate_kp_intraday(date: datetime = None,
         date: Date to scan (defaults to today IST).
         step_minutes: Interval between slots (default 5).
         lat, lon: Location coordinates.
+        start, end: Session window, HH:MM (default 09:00–15:30).
+        tz: Timezone of the session window and slot times (default IST).
 
     Returns:
         List of dicts, one per time slot.
@@ -332,7 +494,37 @@ def calculate_kp_intraday(date: datetime = None,
     if date is None:
         date = datetime.now(IST)
 
-    slots = []
-    for dt in generate_time_slots(date, step_minutes):
-        slots.append(calculate_kp_slot(dt, lat, lon))
-    return slots
+    return [KPSlotContext(dt, lat, lon).slot()
+            for dt in generate_time_slots(date, step_minutes, start, end, tz)]
+
+
+# ─── Multi-day scans ─────────────────────────────────────────
+KP_SLOT_FIELDS = (
+    "moon_sub", "fifth_sign", "fifth_star", "eleventh_star",
+    "moon_view", "fifth_sign_view", "fifth_star_view", "eleventh_view",
+    "final_view", "outcome",
+)
+KP_SCAN_DTYPE = np.dtype([("date", "U10"), ("time", "U5")]
+                         + [(field, "U24") for field in KP_SLOT_FIELDS])
+
+
+def calculate_kp_scan(start_date: datetime,
+                      days: int = 1,
+                      step_minutes: int = 5,
+                      lat: float = MUMBAI_LAT,
+                      lon: float = MUMBAI_LON,
+                      start: str = SESSION_START,
+                      end: str = SESSION_END) -> np.ndarray:
+    """
+    KP slots for `days` consecutive dates as one structured array
+    (KP_SCAN_DTYPE), so columns can be filtered and counted without
+    walking lists of dicts.
+    """
+    rows = []
+    for d in range(days):
+        date = start_date + timedelta(days=d)
+        for dt in generate_time_slots(date, step_minutes, start, end):
+            slot = KPSlotContext(dt, lat, lon).slot()
+            rows.append((dt.strftime("%Y-%m-%d"), slot["time"])
+                        + tuple(slot[field] for field in KP_SLOT_FIELDS))
+    return np.array(rows, dtype=KP_SCAN_DTYPE)
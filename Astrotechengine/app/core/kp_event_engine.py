@@ -0,0 +1,216 @@
+"""
+KP Event Engine — exact KP lord changes instead of fixed 5-minute slots.
+
+calculate_kp_intraday() evaluates every 5-minute slot, so a Moon sub-lord
+change or a 5th/11th cusp lord change between two samples is reported up
+to 5 minutes late, and each slot costs a full set of ephemeris calls.
+
+This engine samples the planets once per SAMPLE_MINUTES, interpolates their
+longitudes, and evaluates Placidus cusps exactly (pure sidereal-time maths,
+no ephemeris file access). It then root-finds the instants when
+  - the Moon crosses one of the KP sub boundaries,
+  - the 5th or 11th cusp crosses one of the 249 sign/star/sub boundaries,
+  - a cusp passes a planet (the planet changes bhava, with the same
+    house_pos convention as calculate_kp_slot),
+and returns the session as intervals whose KP reading is constant, each
+with exact start and end times.
+"""
+
+import math
+from datetime import datetime
+
+import swisseph as swe
+
+from .kp_engine import (
+    IST, MUMBAI_LAT, MUMBAI_LON, PLANETS, SID_FLAG, KP_BOUNDARIES, KP_TABLE,
+    SESSION_END, SESSION_START, KP_SLOT_FIELDS,
+    _jd_from_ist, _norm, _rashi_lord, _session_bound, _star_lord, _sub_lord,
+    kp_slot_from_positions,
+)
+from .root_finder import SECOND, AngleTrack, crossings, datetime_from_jd, find_root, signed_arc
+
+SAMPLE_MINUTES = 60
+
+# Boundaries where the sub lord itself changes (sign starts inside a sub do not count)
+SUB_STARTS = [row.start for row in KP_TABLE if row.sub_lord != KP_TABLE[row.index - 1].sub_lord]
+
+SAMPLED_BODIES = [name for name in PLANETS if name != "Ketu"]
+
+
+def _ist_from_jd(jd: float) -> datetime:
+    return datetime_from_jd(jd, IST)
+
+
+def _lords(deg: float) -> tuple:
+    return _rashi_lord(deg), _star_lord(deg), _sub_lord(deg)
+
+
+class KPSession:
+    """Interpolated planets and exact cusps over one trading session."""
+
+    def __init__(self, start: datetime, end: datetime, lat: float, lon: float,
+                 sample_minutes: int = SAMPLE_MINUTES):
+        self.lat, self.lon = lat, lon
+        self.jd_start, self.jd_end = _jd_from_ist(start), _jd_from_ist(end)
+        step = sample_minutes / 1440.0
+        count = max(3, math.ceil((self.jd_end - self.jd_start) / step) + 1)
+        self.times = [self.jd_start + i * step for i in range(count)]
+
+        self.ephemeris_calls = 0
+        self.house_evaluations = 0
+        self.tracks = {}
+        for name in SAMPLED_BODIES:
+            lons = [swe.calc_ut(t, PLANETS[name], SID_FLAG)[0][0] for t in self.times]
+            self.ephemeris_calls += len(self.times)
+            self.tracks[name] = AngleTrack(self.times, lons)
+        # Obliquity drifts by milli-arcseconds over a session
+        self.eps = swe.calc_ut(self.jd_start, swe.ECL_NUT, 0)[0][0]
+        self.ephemeris_calls += 1
+
+    def planet_lon(self, name: str, jd: float) -> float:
+        # Same convention as PLANETS: "Ketu" reads the node itself
+        return _norm(self.tracks["Rahu" if name == "Ketu" else name](jd))
+
+    def houses(self, jd: float):
+        self.house_evaluations += 1
+        return swe.houses_ex(jd, self.lat, self.lon, b'P', SID_FLAG)
+
+    def cusp(self, jd: float, house: int) -> float:
+        return self.houses(jd)[0][house - 1]
+
+    def bhava_cusp(self, jd: float, house: int) -> float:
+        # _bhava_house runs house_pos on the tropical ARMC with the sidereal
+        # longitude, so bhava changes happen where the tropical cusp meets it
+        self.house_evaluations += 1
+        return swe.houses_ex(jd, self.lat, self.lon, b'P')[0][house - 1]
+
+    def slot(self, jd: float) -> dict:
+        houses, ascmc = self.houses(jd)
+        return kp_slot_from_positions(_ist_from_jd(jd), houses, ascmc, self.eps, self.lat,
+                                      lambda name: self.planet_lon(name, jd))
+
+
+# ═══════════════════════════════════════════════════════════════
+# EVENT SEARCH
+# ═══════════════════════════════════════════════════════════════
+
+def _moon_sub_events(session: KPSession) -> list:
+    track = session.tracks["Moon"]
+    events = []
+    lo, hi = track.span()
+    for level in crossings(lo, hi, SUB_STARTS):
+        i = next(k for k in range(len(track.times) - 1)
+                 if track.values[k] < level <= track.values[k + 1])
+        jd = find_root(lambda t: track(t) - level, track.times[i], track.times[i + 1])
+        before, after = _sub_lord(level - 1e-6), _sub_lord(level + 1e-6)
+        events.append((jd, "moon_sub", f"Moon sub {before} → {after}"))
+    return events
+
+
+def _cusp_lord_events(session: KPSession, cusp_samples: list, house: int) -> list:
+    events = []
+    values = [c[house - 1] for c in cusp_samples]
+    for i in range(len(values) - 1):
+        a = values[i]
+        b = a + signed_arc(values[i + 1], a)
+        for level in crossings(a, b, KP_BOUNDARIES):
+            target = level % 360.0
+            jd = find_root(lambda t: signed_arc(session.cusp(t, house), target),
+                           session.times[i], session.times[i + 1])
+            before, after = _lords(target - 1e-6), _lords(target + 1e-6)
+            changed = [f"{kind} {old} → {new}"
+                       for kind, old, new in zip(("sign", "star", "sub"), before, after)
+                       if old != new]
+            events.append((jd, f"cusp{house}", f"Cusp {house}: " + ", ".join(changed)))
+    return events
+
+
+def _bhava_events(session: KPSession) -> list:
+    """A planet changes house when a cusp passes over it."""
+    events = []
+    cusp_samples = []
+    for t in session.times:
+        session.house_evaluations += 1
+        cusp_samples.append(swe.houses_ex(t, session.lat, session.lon, b'P')[0])
+    bodies = {name: (lambda t, n=name: session.planet_lon(n, t)) for name in SAMPLED_BODIES}
+    bodies["Ketu (true)"] = lambda t: _norm(session.planet_lon("Rahu", t) + 180)
+    for name, planet in bodies.items():
+        planet_samples = [planet(t) for t in session.times]
+        for house in range(1, 13):
+            gaps = [signed_arc(c[house - 1], p) for c, p in zip(cusp_samples, planet_samples)]
+            for i in range(len(gaps) - 1):
+                g0, g1 = gaps[i], gaps[i + 1]
+                # Ignore the ±180° wrap; a real crossing passes through 0
+                if g0 < 0 <= g1 and g1 - g0 < 180:
+                    jd = find_root(
+                        lambda t: signed_arc(session.bhava_cusp(t, house), planet(t)),
+                        session.times[i], session.times[i + 1], g0, g1)
+                    events.append((jd, "bhava", f"{name} → house {house - 1 or 12}"))
+    return events
+
+
+# ═══════════════════════════════════════════════════════════════
+# SESSION TIMELINE
+# ═══════════════════════════════════════════════════════════════
+
+def calculate_kp_timeline(date: datetime = None,
+                          lat: float = MUMBAI_LAT,
+                          lon: float = MUMBAI_LON,
+                          start_time: str = SESSION_START,
+                          end_time: str = SESSION_END,
+                          sample_minutes: int = SAMPLE_MINUTES) -> dict:
+    """
+    Exact KP timeline for one session.
+
+    Returns dict with:
+      intervals: [{start, end, duration_mins, moon_sub, ..., outcome}] —
+                 consecutive spans with an identical KP reading
+      events:    [{time, type, detail}] — every lord change and bhava change
+      ephemeris_calls, house_evaluations
+    """
+    if date is None:
+        date = datetime.now(IST)
+    session = KPSession(_session_bound(date, start_time), _session_bound(date, end_time), lat, lon, sample_minutes)
+
+    cusp_samples = [session.houses(t)[0] for t in session.times]
+    found = (_moon_sub_events(session)
+             + _cusp_lord_events(session, cusp_samples, 5)
+             + _cusp_lord_events(session, cusp_samples, 11)
+             + _bhava_events(session))
+    found = sorted(e for e in found if session.jd_start < e[0] < session.jd_end)
+
+    cuts = [session.jd_start]
+    for jd, _, _ in found:
+        if jd - cuts[-1] > SECOND:
+            cuts.append(jd)
+    cuts.append(session.jd_end)
+
+    intervals = []
+    for lo, hi in zip(cuts, cuts[1:]):
+        reading = session.slot((lo + hi) / 2)
+        reading = {k: reading[k] for k in KP_SLOT_FIELDS}
+        if intervals and all(intervals[-1][k] == reading[k] for k in KP_SLOT_FIELDS):
+            intervals[-1]["_end"] = hi
+            continue
+        intervals.append({"_start": lo, "_end": hi, **reading})
+
+    for entry in intervals:
+        start, end = _ist_from_jd(entry.pop("_start")), _ist_from_jd(entry.pop("_end"))
+        entry["start"] = start.strftime("%H:%M:%S")
+        entry["end"] = end.strftime("%H:%M:%S")
+        entry["duration_mins"] = round((end - start).total_seconds() / 60, 2)
+        # Keep the output key order close to calculate_kp_slot
+        for k in KP_SLOT_FIELDS:
+            entry[k] = entry.pop(k)
+
+    return {
+        "date": date.strftime("%Y-%m-%d"),
+        "session": f"{start_time}-{end_time}",
+        "intervals": intervals,
+        "events": [
+            {"time": _ist_from_jd(jd).strftime("%H:%M:%S"), "type": kind, "detail": detail}
+            for jd, kind, detail in found
+        ],
+        "ephemeris_calls": session.ephemeris_calls,
+        "house_evaluations": session.house_evaluations,
+    }
@@ -0,0 +1,129 @@
+"""
+KP Scan Engine — KP intraday tables over date ranges and exchanges.
+
+Each (date, location) day is one job on the ephemeris executor, so with
+EPHEMERIS_WORKERS > 0 a month of scans for several exchanges fans out over
+the worker processes. Finished days are saved in the result store keyed by
+(date, location, step, KP_ENGINE_VERSION) and later queries read them
+back without recomputation.
+
+Locations are exchange codes from config.EXCHANGES (slots in the
+exchange's own timezone and session) or "lat,lon" pairs, which use the
+default IST session.
+"""
+
+import json
+from datetime import date as Date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from .config import EXCHANGES, TIMEZONE
+from .ephemeris_executor import ephemeris
+from .kp_engine import KP_ENGINE_VERSION, SESSION_END, SESSION_START, calculate_kp_intraday
+from .result_store import result_store
+
+KP_SCAN_MAX_DAYS = 92
+KP_SCAN_MAX_LOCATIONS = 8
+
+KP_SCAN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kp_scan (
+    date     TEXT    NOT NULL,
+    location TEXT    NOT NULL,
+    step     INTEGER NOT NULL,
+    version  INTEGER NOT NULL,
+    slots    TEXT    NOT NULL,
+    PRIMARY KEY (date, location, step, version)
+);
+"""
+
+
+def resolve_location(spec: str) -> dict:
+    """Exchange code or "lat,lon" → {key, lat, lon, timezone, open, close}."""
+    code = spec.strip().upper()
+    if code in EXCHANGES:
+        return {"key": code, **EXCHANGES[code]}
+    try:
+        lat, lon = (float(part) for part in spec.split(","))
+    except ValueError:
+        raise ValueError(f"Unknown location '{spec}': use an exchange code "
+                         f"({', '.join(EXCHANGES)}) or 'lat,lon'")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"Coordinates out of range: '{spec}'")
+    return {"key": f"{lat:.4f},{lon:.4f}", "lat": lat, "lon": lon,
+            "timezone": TIMEZONE, "open": SESSION_START, "close": SESSION_END}
+
+
+def scan_dates(start: Date, end: Date, skip_weekends: bool = True) -> list:
+    days = []
+    d = start
+    while d <= end:
+        if not (skip_weekends and d.weekday() >= 5):
+            days.append(d.isoformat())
+        d += timedelta(days=1)
+    return days
+
+
+def _scan_day(day: str, location: dict, step_minutes: int) -> list:
+    # Module-level so it pickles into ephemeris worker processes
+    date = datetime.strptime(day, "%Y-%m-%d")
+    return calculate_kp_intraday(date, step_minutes, location["lat"], location["lon"],
+                                 location["open"], location["close"],
+                                 ZoneInfo(location["timezone"]))
+
+
+def scan_kp(start: Date, end: Date, locations: list, step_minutes: int = 5,
+            skip_weekends: bool = True, store=result_store, executor=ephemeris) -> dict:
+    """
+    KP intraday slots for every date in [start, end] and every location.
+
+    Blocks until all missing days are computed; call it from a worker
+    thread, not the event loop.
+    """
+    resolved = list({loc["key"]: loc for loc in map(resolve_location, locations)}.values())
+    if len(resolved) > KP_SCAN_MAX_LOCATIONS:
+        raise ValueError(f"Scan covers {len(resolved)} locations; the limit is {KP_SCAN_MAX_LOCATIONS}")
+    days = scan_dates(start, end, skip_weekends)
+    if len(days) > KP_SCAN_MAX_DAYS:
+        raise ValueError(f"Scan covers {len(days)} days; the limit is {KP_SCAN_MAX_DAYS}")
+    wanted = set(days)
+
+    store.ensure(KP_SCAN_SCHEMA)
+    results = {}
+    for loc in resolved:
+        rows = store.query(
+            "SELECT date, slots FROM kp_scan WHERE location = ? AND step = ? AND version = ?"
+            " AND date BETWEEN ? AND ?",
+            (loc["key"], step_minutes, KP_ENGINE_VERSION, start.isoformat(), end.isoformat()),
+        )
+        # Weekend rows stored by an earlier scan are not part of this one
+        for row in rows:
+            if row["date"] in wanted:
+                results[(row["date"], loc["key"])] = json.loads(row["slots"])
+
+    # Submit every missing day before waiting on any of them
+    pending = {
+        (day, loc["key"]): executor.submit(_scan_day, day, loc, step_minutes)
+        for loc in resolved for day in days if (day, loc["key"]) not in results
+    }
+    fresh = {key: future.result() for key, future in pending.items()}
+    if fresh:
+        store.write_many(
+            "INSERT OR REPLACE INTO kp_scan (date, location, step, version, slots)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [(day, key, step_minutes, KP_ENGINE_VERSION, json.dumps(slots))
+             for (day, key), slots in fresh.items()],
+        )
+    results.update(fresh)
+
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "step_minutes": step_minutes,
+        "engine_version": KP_ENGINE_VERSION,
+        "locations": resolved,
+        "computed": len(fresh),
+        "cached": len(results) - len(fresh),
+        "days": [
+            {"date": day, "location": loc["key"], "slots": results[(day, loc["key"])]}
+            for loc in resolved for day in days
+        ],
+    }
@@ -0,0 +1,218 @@
+"""
+Panchang Engine — exact tithi, nakshatra and pada boundaries over time.
+
+calculate_tithi and calculate_nakshatra give the value at one instant, so
+a rule evaluated at 09:15 cannot tell that the tithi ends at 11:40. This
+engine solves for every boundary instead:
+
+  tithi          Moon − Sun elongation crossing a multiple of 12°
+  nakshatra      Moon longitude crossing a multiple of 13°20'
+  pada           Moon longitude crossing a multiple of 3°20'
+  sun_nakshatra  Sun longitude crossing a multiple of 13°20'
+
+Each IST day is sampled hourly, every crossing is bracketed and then
+root-found on the ephemeris itself. Days are computed once and cached, so
+callers can ask panchang_at() for the current values together with the
+instant they next change, and re-evaluate only then.
+
+Unlike get_planetary_positions, times here are proper IST (converted to UT
+before the ephemeris call).
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date as Date, datetime, time, timedelta, timezone
+from typing import Dict, List
+
+import swisseph as swe
+
+from .config import NAKSHATRA_SPAN, TITHI_SPAN
+from .ephemeris_executor import ephemeris
+from .nakshatra_engine import get_nakshatra_lord, get_nakshatra_name
+from .root_finder import crossings, datetime_from_jd, find_root, jd_from_datetime, signed_arc
+from .tithi_engine import is_amavasya, is_purnima
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+SAMPLE_MINUTES = 60
+PANCHANG_CACHE_DAYS = 64
+PANCHANG_MAX_DAYS = 31
+
+# element -> (span in degrees, number of divisions in 360°)
+ELEMENTS = {
+    "tithi": (TITHI_SPAN, 30),
+    "nakshatra": (NAKSHATRA_SPAN, 27),
+    "pada": (NAKSHATRA_SPAN / 4, 108),
+    "sun_nakshatra": (NAKSHATRA_SPAN, 27),
+}
+_FLAGS = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+
+
+def _sun_moon(jd: float) -> tuple:
+    return swe.calc_ut(jd, swe.SUN, _FLAGS)[0][0], swe.calc_ut(jd, swe.MOON, _FLAGS)[0][0]
+
+
+def _angle(element: str, sun: float, moon: float) -> float:
+    if element == "tithi":
+        return (moon - sun) % 360.0
+    if element == "sun_nakshatra":
+        return sun % 360.0
+    return moon % 360.0
+
+
+def _division(element: str, angle: float) -> int:
+    """1-based division of the circle: tithi 1-30, nakshatra 1-27, pada 1-108."""
+    span, count = ELEMENTS[element]
+    return min(int(angle / span), count - 1) + 1
+
+
+def _panchang_events(start_jd: float, end_jd: float, sample_minutes: int = SAMPLE_MINUTES) -> dict:
+    """
+    Values at start_jd and every boundary in [start_jd, end_jd) as
+    (jd, element, new_value) tuples in time order.
+    """
+    step = sample_minutes / 1440.0
+    count = max(1, int((end_jd - start_jd) / step + 0.999999))
+    times = [start_jd + i * (end_jd - start_jd) / count for i in range(count + 1)]
+    samples = [_sun_moon(t) for t in times]
+
+    start = {element: _division(element, _angle(element, *samples[0])) for element in ELEMENTS}
+    events = []
+    for element, (span, divisions) in ELEMENTS.items():
+        levels = [k * span for k in range(divisions)]
+        angles = [_angle(element, sun, moon) for sun, moon in samples]
+        for t0, t1, a, b in zip(times, times[1:], angles, angles[1:]):
+            # All four quantities only ever increase
+            for level in crossings(a, a + signed_arc(b, a), levels):
+                boundary = level % 360.0
+                jd = find_root(lambda t: signed_arc(_angle(element, *_sun_moon(t)), boundary), t0, t1)
+                if start_jd <= jd < end_jd:
+                    events.append((jd, element, round(boundary / span) % divisions + 1))
+    events.sort()
+    return {"start": start, "events": events}
+
+
+# ═══════════════════════════════════════════════════════════════
+# PER-DAY CACHE
+# ═══════════════════════════════════════════════════════════════
+
+_cache: "OrderedDict[Date, dict]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _day_bounds(day: Date) -> tuple:
+    start = datetime.combine(day, time(0, 0), IST)
+    return jd_from_datetime(start), jd_from_datetime(start + timedelta(days=1))
+
+
+def panchang_day(day: Date, executor=ephemeris) -> dict:
+    """Start values and boundaries of one IST day, computed once per day."""
+    with _cache_lock:
+        cached = _cache.get(day)
+        if cached is not None:
+            _cache.move_to_end(day)
+            return cached
+    start_jd, end_jd = _day_bounds(day)
+    result = executor.run_sync(_panchang_events, start_jd, end_jd)
+    result.update(date=day, start_jd=start_jd, end_jd=end_jd)
+    with _cache_lock:
+        _cache[day] = result
+        while len(_cache) > PANCHANG_CACHE_DAYS:
+            _cache.popitem(last=False)
+    return result
+
+
+def clear_panchang_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _values_at(day: dict, jd: float) -> Dict[str, int]:
+    values = dict(day["start"])
+    for event_jd, element, value in day["events"]:
+        if event_jd > jd:
+            break
+        values[element] = value
+    return values
+
+
+def _describe(element: str, value: int) -> dict:
+    if element == "tithi":
+        return {"tithi": value, "paksha": "Shukla" if value <= 15 else "Krishna",
+                "is_purnima": is_purnima(value), "is_amavasya": is_amavasya(value)}
+    if element == "pada":
+        nak = (value - 1) // 4 + 1
+        return {"nakshatra": nak, "name": get_nakshatra_name(nak), "pada": (value - 1) % 4 + 1}
+    return {"nakshatra": value, "name": get_nakshatra_name(value), "lord": get_nakshatra_lord(value)}
+
+
+def _ist(jd: float) -> str:
+    return datetime_from_jd(jd, IST).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _aware(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=IST) if dt.tzinfo is None else dt
+
+
+# ═══════════════════════════════════════════════════════════════
+# PUBLIC API
+# ═══════════════════════════════════════════════════════════════
+
+def panchang_timeline(start: datetime, end: datetime, executor=ephemeris) -> dict:
+    """
+    Every tithi, nakshatra and pada between two instants (naive = IST).
+
+    Returns dict with one segment list per element ({..., start, end},
+    the first and last clipped to the range) and "events", every boundary
+    in time order as {time, element, from, to}.
+    """
+    start, end = _aware(start), _aware(end)
+    if end <= start:
+        raise ValueError("end must be after start")
+    first, last = start.astimezone(IST).date(), end.astimezone(IST).date()
+    if (last - first).days >= PANCHANG_MAX_DAYS:
+        raise ValueError(f"range is limited to {PANCHANG_MAX_DAYS} days")
+    start_jd, end_jd = jd_from_datetime(start), jd_from_datetime(end)
+
+    days = [panchang_day(first + timedelta(days=i), executor) for i in range((last - first).days + 1)]
+    current = _values_at(days[0], start_jd)
+    open_since = {element: start_jd for element in ELEMENTS}
+    segments: Dict[str, List[dict]] = {element: [] for element in ELEMENTS}
+    events = []
+
+    def close(element: str, at: float):
+        segments[element].append({**_describe(element, current[element]),
+                                   "start": _ist(open_since[element]), "end": _ist(at)})
+
+    for day in days:
+        for jd, element, value in day["events"]:
+            if not start_jd < jd < end_jd or value == current[element]:
+                continue
+            close(element, jd)
+            events.append({"time": _ist(jd), "element": element,
+                           "from": current[element], "to": value})
+            current[element], open_since[element] = value, jd
+    for element in ELEMENTS:
+        close(element, end_jd)
+
+    return {"start": _ist(start_jd), "end": _ist(end_jd), **segments, "events": events}
+
+
+def panchang_at(when: datetime = None, executor=ephemeris) -> dict:
+    """
+    Tithi, nakshatra, pada and Sun nakshatra at one instant, plus
+    "valid_until": the next boundary of any of them. Nothing derived from
+    these values needs recomputing before then.
+    """
+    when = _aware(when or datetime.now(IST))
+    jd = jd_from_datetime(when)
+    day = panchang_day(when.astimezone(IST).date(), executor)
+    values = _values_at(day, jd)
+    upcoming = [e for e in day["events"] if e[0] > jd]
+    if not upcoming:
+        upcoming = panchang_day(day["date"] + timedelta(days=1), executor)["events"]
+    return {
+        "time": _ist(jd),
+        **{element: _describe(element, value) for element, value in values.items()},
+        "valid_until": _ist(upcoming[0][0]),
+    }
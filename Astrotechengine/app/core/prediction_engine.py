@@ -0,0 +1,198 @@
+"""
+Prediction Engine — final_score for an explicit instant, memoized.
+
+/predict/daily used to score "now" only, and the day-of-week rule read the
+wall clock on its own. Here every prediction is a pure function of:
+
+  instant    floored to the minute (get_planetary_positions ignores seconds)
+  exchange   a config.EXCHANGES key, or None for Mumbai / IST. Naive times
+             are read in the exchange's timezone and the day-of-week rule
+             uses the exchange's local weekday; positions are geocentric,
+             computed from the IST wall clock like every other route
+  config     CONFIG_HASH of config.py, so edited weights or tables never
+             serve a stale result
+
+and results are memoized on that key in an LRU of PREDICTION_CACHE_SIZE
+entries, each kept at most PREDICTION_CACHE_TTL_SECONDS. predict_range
+scores up to PREDICTION_RANGE_MAX_POINTS instants through
+vector_scoring_engine; a range result is thousands of times larger than
+a single prediction, so ranges have their own LRU of
+PREDICTION_RANGE_CACHE_SIZE entries. Callers get copies; editing a result
+cannot leak into the memo.
+
+predict_live scores the shared "now" snapshot with the incremental scorer
+for dashboards polling every few seconds, reporting which rules changed
+since that dashboard's previous call.
+"""
+
+import copy
+import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import pytz
+
+from . import config
+from .config import (
+    EXCHANGES, PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL_SECONDS,
+    PREDICTION_RANGE_CACHE_SIZE, PREDICTION_RANGE_MAX_POINTS, TIMEZONE,
+)
+from .ephemeris_executor import ephemeris
+from .incremental_scoring_engine import IncrementalScorer, live_scorer
+from .scoring_engine import final_score, scoring_planets
+from .snapshot_engine import SnapshotProvider, sky_snapshot
+from .swiss_engine import get_planetary_positions
+from .vector_scoring_engine import score_times
+
+CONFIG_HASH = hashlib.sha1(repr(sorted(
+    (name, repr(value)) for name, value in vars(config).items() if name.isupper()
+)).encode()).hexdigest()[:16]
+
+
+class PredictionMemo:
+    """Thread-safe LRU with a time-to-live per entry, plus hit / miss counters."""
+
+    def __init__(self, maxsize: int = PREDICTION_CACHE_SIZE,
+                 ttl_seconds: float = PREDICTION_CACHE_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "config_hash": CONFIG_HASH,
+            }
+
+
+prediction_memo = PredictionMemo()
+range_memo = PredictionMemo(maxsize=PREDICTION_RANGE_CACHE_SIZE)
+
+
+def _zone(exchange: Optional[str]):
+    if exchange is None:
+        return pytz.timezone(TIMEZONE)
+    if exchange not in EXCHANGES:
+        raise ValueError(f"Unknown exchange '{exchange}'; use one of {', '.join(EXCHANGES)}")
+    return pytz.timezone(EXCHANGES[exchange]["timezone"])
+
+
+def _instant(when: Optional[datetime.datetime],
+             exchange: Optional[str]) -> Tuple[datetime.datetime, datetime.datetime]:
+    """(exchange-local time, naive IST wall clock), both floored to the minute."""
+    tz = _zone(exchange)
+    if when is None:
+        when = datetime.datetime.now(tz)
+    elif when.tzinfo is None:
+        when = tz.localize(when)
+    local = when.astimezone(tz).replace(second=0, microsecond=0)
+    ist = local.astimezone(pytz.timezone(TIMEZONE)).replace(tzinfo=None)
+    return local, ist
+
+
+def _predict(ist: datetime.datetime, local: datetime.datetime) -> dict:
+    raw = get_planetary_positions(ist)
+    result = final_score(scoring_planets(raw), at=local)
+    result["planets"] = raw
+    return result
+
+
+def predict_at(when: datetime.datetime = None, exchange: str = None,
+               executor=ephemeris, memo: PredictionMemo = prediction_memo) -> dict:
+    """final_score with breakdown and planets at an instant (default now)."""
+    local, ist = _instant(when, exchange)
+    key = ("at", ist, exchange, CONFIG_HASH)
+    result = memo.get_or_compute(key, lambda: executor.run_sync(_predict, ist, local))
+    return {"at": local.isoformat(), "exchange": exchange, **copy.deepcopy(result)}
+
+
+def predict_range(start: datetime.datetime, end: datetime.datetime, step_minutes: int = 1440,
+                  exchange: str = None, executor=ephemeris,
+                  memo: PredictionMemo = range_memo) -> dict:
+    """
+    Score, trend and per-rule scores every step_minutes from start to end
+    (inclusive); naive times are exchange-local.
+    """
+    if step_minutes < 1:
+        raise ValueError("step_minutes must be at least 1")
+    first, first_ist = _instant(start, exchange)
+    last, _ = _instant(end, exchange)
+    if last < first:
+        raise ValueError("end must not be before start")
+    # Steps are in exchange wall-clock time, so a daily step keeps the session time across DST
+    naive_first = first.replace(tzinfo=None)
+    count = int((last.replace(tzinfo=None) - naive_first).total_seconds() // 60 // step_minutes) + 1
+    if count > PREDICTION_RANGE_MAX_POINTS:
+        raise ValueError(f"Range has {count} points; the limit is {PREDICTION_RANGE_MAX_POINTS}")
+
+    def compute() -> dict:
+        step = datetime.timedelta(minutes=step_minutes)
+        local, ist = zip(*(_instant(naive_first + i * step, exchange) for i in range(count)))
+        scored = score_times(ist, executor=executor, weekdays=[t.weekday() for t in local])
+        rules = scored["rules"]
+        return {
+            "points": [
+                {"at": at.isoformat(), "score": score, "trend": trend,
+                 "rules": dict(zip(rules, weighted))}
+                for at, score, trend, weighted in zip(local, scored["score"].tolist(), scored["trend"],
+                                                      scored["weighted"].tolist())
+            ],
+        }
+
+    key = ("range", first_ist, step_minutes, count, exchange, CONFIG_HASH)
+    result = memo.get_or_compute(key, compute)
+    return {"start": first.isoformat(), "end": last.isoformat(), "step_minutes": step_minutes,
+            "exchange": exchange,
+            "points": [{**point, "rules": dict(point["rules"])} for point in result["points"]]}
+
+
+def predict_live(client: Optional[str] = None, snapshot: SnapshotProvider = sky_snapshot,
+                 scorer: IncrementalScorer = live_scorer) -> dict:
+    """
+    Score of the current sky snapshot, rescoring only rules whose inputs
+    moved since the scorer's previous tick; adds recomputed_rules and
+    changed_rules (since this client's previous call).
+    """
+    current = snapshot.current()
+    return {"at": current.at.isoformat(), **scorer.score(current.planets(), at=current.at, client=client)}
@@ -7,16 +7,23 @@ Rashi Parivartan is a key event in Vedic market astrology:
   - Planets near rashi boundary (sandhi) are weakened.
   - Direction of change (e.g., from Teji rashi to Mandi rashi) matters.
 
-Uses real-time speed to estimate hours/days to next rashi change.
+The next rashi change is the exact ingress time from a persisted
+per-planet ingress table (retrograde re-entries included), not an
+extrapolation of the current speed, which is far off near stations and
+for the Moon's varying speed.
 """
 
 import swisseph as swe
 import datetime
+import math
 import pytz
 from .config import (
     MUMBAI_LAT, MUMBAI_LON, TIMEZONE,
     TEJI_RASHI, MANDI_RASHI,
 )
+from .ephemeris_executor import ephemeris
+from .event_index import EventIndex
+from .root_finder import crossings, datetime_from_jd, find_root, jd_from_datetime, signed_arc
 
 RASHI_NAMES = {
     1: "Aries", 2: "Taurus", 3: "Gemini", 4: "Cancer",
@@ -44,54 +51,111 @@ def _rashi_type(r: int) -> str:
     return "Neutral"
 
 
-def calculate_rashi_parivartan(dt=None) -> dict:
+# Sampling step (days) when building the ingress table. Within a step the
+# motion is split at stations, so retrograde loops across a boundary are kept.
+_SAMPLE_DAYS = {"moon": 0.25}
+# Rahu (mean node) stays in a sign for about 18 months
+INGRESS_HORIZON_DAYS = 1000
+INGRESS_TABLE_VERSION = 1
+_SIGN_STARTS = [30.0 * i for i in range(12)]
+_FLAGS = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+
+def _lon_speed(jd: float, pid: int) -> tuple:
+    data = swe.calc_ut(jd, pid, _FLAGS)[0]
+    return data[0] % 360.0, data[3]
+
+
+def _ingress_events(name: str, start_jd: float, end_jd: float) -> list:
+    """
+    Sign entries of one planet in [start_jd, end_jd) as (jd, kind, value,
+    detail) tuples: kind "ingress", value the rashi entered, detail
+    "forward" or "backward".
+    """
+    pid = PLANETS[name]
+    step = _SAMPLE_DAYS.get(name, 1.0)
+    count = max(1, math.ceil((end_jd - start_jd) / step))
+    times = [start_jd + i * (end_jd - start_jd) / count for i in range(count + 1)]
+    samples = [_lon_speed(t, pid) for t in times]
+
+    # Split each step at a station so longitude is monotonic on every piece
+    knots = [(times[0], *samples[0])]
+    for t1, (lon1, v1) in zip(times[1:], samples[1:]):
+        t0, _, v0 = knots[-1]
+        if (v0 > 0) != (v1 > 0):
+            ts = find_root(lambda t: _lon_speed(t, pid)[1], t0, t1, v0, v1)
+            knots.append((ts, *_lon_speed(ts, pid)))
+        knots.append((t1, lon1, v1))
+
+    events = []
+    for (t0, lon0, _), (t1, lon1, _) in zip(knots, knots[1:]):
+        a = lon0
+        b = a + signed_arc(lon1, a)
+        for level in crossings(a, b, _SIGN_STARTS):
+            boundary = level % 360.0
+            jd = find_root(lambda t: signed_arc(_lon_speed(t, pid)[0], boundary), t0, t1)
+            if not start_jd <= jd < end_jd:
+                continue
+            if b > a:
+                events.append((jd, "ingress", float(int(boundary // 30) + 1), "forward"))
+            else:
+                events.append((jd, "ingress", float((int(boundary // 30) - 1) % 12 + 1), "backward"))
+    return events
+
+
+ingress_index = EventIndex("ingress", _ingress_events, INGRESS_TABLE_VERSION)
+
+
+def _current_positions(jd: float) -> dict:
+    return {name: _lon_speed(jd, pid) for name, pid in PLANETS.items()}
+
+
+def calculate_rashi_parivartan(dt=None, index: EventIndex = ingress_index) -> dict:
     """
     For each planet, calculate:
       - Current rashi and degree within it
-      - Degrees remaining to rashi boundary
-      - Estimated time to rashi change (using current speed)
-      - Next rashi and its type
+      - The next rashi change (exact, from the ingress table): time left,
+        direction, the rashi entered and its type
+      - Degrees of arc from the current position to that boundary
       - Whether planet is in sandhi zone (last 1 degree or first 1 degree)
       - Trend change direction (Teji->Mandi, Mandi->Teji, etc.)
     """
+    tz = pytz.timezone(TIMEZONE)
     if dt is None:
-        tz = pytz.timezone(TIMEZONE)
         dt = datetime.datetime.now(tz)
+    elif dt.tzinfo is None:
+        dt = tz.localize(dt)
 
-    jd = swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60)
-    flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
+    # True UT, the time base of the ingress index, so the countdown matches ingress_calendar
+    jd = jd_from_datetime(dt)
+    current = ephemeris.run_sync(_current_positions, jd)
 
     results = {}
 
-    for name, pid in PLANETS.items():
-        data = swe.calc_ut(jd, pid, flags)
-        longitude = data[0][0]
-        if longitude < 0:
-            longitude += 360
-        speed = data[0][3]  # degrees per day
+    for name in PLANETS:
+        longitude, speed = current[name]
         retrograde = speed < 0
 
         rashi = int(longitude // 30) + 1
         degree_in_rashi = longitude % 30
 
-        # For direct motion: degrees left to cross into next rashi
-        # For retrograde: degrees left to cross back into previous rashi
-        if not retrograde:
+        ingress = index.next_event(name, jd, horizon_days=INGRESS_HORIZON_DAYS)
+        if ingress is not None:
+            next_rashi = int(ingress.value)
+            direction = ingress.detail
+            days_to_change = ingress.jd - jd
+        else:
+            next_rashi = (rashi % 12) + 1 if not retrograde else ((rashi - 2) % 12) + 1
+            direction = "forward" if not retrograde else "backward"
+            days_to_change = float(INGRESS_HORIZON_DAYS)
+        # The boundary being approached: end of this rashi going forward, its start going back
+        if direction == "forward":
             degrees_to_change = 30.0 - degree_in_rashi
-            next_rashi = (rashi % 12) + 1
-            direction = "forward"
         else:
             degrees_to_change = degree_in_rashi
-            next_rashi = ((rashi - 2) % 12) + 1  # previous rashi
-            direction = "backward"
-
-        # Estimate time to change
-        abs_speed = abs(speed) if speed != 0 else 0.001
-        days_to_change = degrees_to_change / abs_speed
         hours_to_change = days_to_change * 24
 
-        # Approximate date of change
-        change_date = dt + datetime.timedelta(days=days_to_change)
+        change_date = (dt + datetime.timedelta(days=days_to_change)).astimezone(tz)
 
         # Sandhi zone: within 1 degree of rashi boundary
         in_sandhi = degree_in_rashi < 1.0 or degree_in_rashi > 29.0
@@ -125,3 +189,33 @@ def calculate_rashi_parivartan(dt=None) -> dict:
         }
 
     return results
+
+
+def ingress_calendar(date_from, date_to, planets=None, index: EventIndex = ingress_index) -> list:
+    """Every sign entry from date_from to date_to (inclusive, IST days), in time order."""
+    unknown = [p for p in planets or [] if p not in PLANETS]
+    if unknown:
+        raise ValueError(f"Unknown planet(s): {', '.join(unknown)}")
+    tz = pytz.timezone(TIMEZONE)
+    start_jd = jd_from_datetime(tz.localize(datetime.datetime(date_from.year, date_from.month, date_from.day)))
+    end_jd = jd_from_datetime(tz.localize(datetime.datetime(date_to.year, date_to.month, date_to.day))) + 1
+
+    events = []
+    for name in planets or PLANETS:
+        for e in index.between(name, start_jd, end_jd):
+            entered = int(e.value)
+            left = (entered - 2) % 12 + 1 if e.detail == "forward" else entered % 12 + 1
+            from_type, to_type = _rashi_type(left), _rashi_type(entered)
+            events.append({
+                "planet": name,
+                "jd": e.jd,
+                "time": datetime_from_jd(e.jd, tz).strftime("%Y-%m-%d %H:%M:%S"),
+                "direction": e.detail,
+                "from_rashi": left,
+                "from_rashi_name": RASHI_NAMES[left],
+                "to_rashi": entered,
+                "to_rashi_name": RASHI_NAMES[entered],
+                "trend_change": f"{from_type} -> {to_type}" if from_type != to_type else f"{to_type} (same)",
+            })
+    events.sort(key=lambda e: e["jd"])
+    return events
@@ -0,0 +1,80 @@
+"""
+Result Store — local SQLite tables for precomputed engine output.
+
+Engines whose output depends only on their inputs (a date range, a
+location, a step) persist it here and answer repeat queries without
+touching the ephemeris. Each engine owns its tables and declares them
+with ensure(); the database file lives in ASTRO_DATA_DIR.
+
+Only the API process reads and writes the store: ephemeris workers return
+their results and the caller saves them.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+
+DATA_DIR = os.getenv("ASTRO_DATA_DIR", "./data")
+STORE_FILE = "astro_results.sqlite3"
+
+
+class ResultStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(DATA_DIR, STORE_FILE)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._schemas = set()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            if self.path != ":memory:":
+                # Let several server processes read while one writes
+                self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    def ensure(self, schema: str):
+        """Run a CREATE TABLE/INDEX IF NOT EXISTS script once per store."""
+        if schema in self._schemas:
+            return
+        with self._lock:
+            self._connect().executescript(schema)
+            self._schemas.add(schema)
+
+    def query(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._connect().execute(sql, tuple(params)).fetchall()
+
+    def write_many(self, sql: str, rows: Iterable[Iterable]):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(sql, rows)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Exclusive connection for a read-modify-write that must commit as one.
+        BEGIN IMMEDIATE takes the write lock up front, so reads inside the
+        transaction also see no concurrent writer from another process.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                yield conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._schemas.clear()
+
+
+result_store = ResultStore()
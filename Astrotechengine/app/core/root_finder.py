@@ -0,0 +1,154 @@
+"""
+Root Finder — shared tools for exact event times.
+
+Engines that need the instant a smoothly varying quantity reaches a
+threshold (a longitude reaching a KP boundary, a separation reaching an
+exact aspect, declination reaching 0°) sample it coarsely, bracket each
+sign change and refine the bracket with find_root.
+
+Times are Julian days throughout; SECOND is one second in those units.
+"""
+
+import math
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+SECOND = 1.0 / 86400.0
+J2000 = 2451545.0
+_J2000_UTC = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def jd_from_datetime(dt: datetime) -> float:
+    """Julian day (UT) of an aware datetime."""
+    return J2000 + (dt - _J2000_UTC).total_seconds() / 86400.0
+
+
+def datetime_from_jd(jd: float, tz=timezone.utc) -> datetime:
+    """Aware datetime for a Julian day, rounded to the second."""
+    return (_J2000_UTC + timedelta(seconds=round((jd - J2000) * 86400.0))).astimezone(tz)
+
+
+def signed_arc(a: float, b: float) -> float:
+    """a - b folded into [-180, 180) degrees."""
+    return (a - b + 180.0) % 360.0 - 180.0
+
+
+def unwrap(angles: Sequence[float]) -> List[float]:
+    """Remove 360° jumps so a sampled longitude becomes continuous."""
+    out = [angles[0]]
+    for a in angles[1:]:
+        out.append(out[-1] + signed_arc(a, out[-1]))
+    return out
+
+
+def find_root(f: Callable[[float], float], lo: float, hi: float,
+              f_lo: Optional[float] = None, f_hi: Optional[float] = None,
+              tol: float = 0.5 * SECOND, max_iter: int = 60) -> float:
+    """
+    Root of f on [lo, hi] where f changes sign, by Illinois regula falsi.
+    Converges superlinearly on smooth functions but, unlike plain secant,
+    never leaves the bracket.
+    """
+    f_lo = f(lo) if f_lo is None else f_lo
+    f_hi = f(hi) if f_hi is None else f_hi
+    if f_lo == 0:
+        return lo
+    if f_hi == 0:
+        return hi
+    if (f_lo > 0) == (f_hi > 0):
+        raise ValueError("find_root needs a bracket with a sign change")
+    side = 0
+    for _ in range(max_iter):
+        mid = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        f_mid = f(mid)
+        if f_mid == 0 or hi - lo <= tol:
+            return mid
+        if (f_mid > 0) == (f_hi > 0):
+            hi, f_hi = mid, f_mid
+            if side == -1:
+                f_lo /= 2
+            side = -1
+        else:
+            lo, f_lo = mid, f_mid
+            if side == 1:
+                f_hi /= 2
+            side = 1
+        if hi - lo <= tol:
+            break
+    return (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+
+
+def sign_changes(values: Sequence[float]) -> Iterator[int]:
+    """Indices i where values[i] and values[i + 1] bracket a zero."""
+    for i in range(len(values) - 1):
+        a, b = values[i], values[i + 1]
+        if a == 0 or (a < 0) != (b < 0):
+            yield i
+
+
+def crossings(lo_value: float, hi_value: float, levels: Sequence[float]) -> List[float]:
+    """
+    Unwrapped values v with lo_value < v <= hi_value and v % 360 in levels
+    (levels sorted, within [0, 360)). Works for either direction of motion.
+    """
+    if hi_value < lo_value:
+        lo_value, hi_value = hi_value, lo_value
+    found = []
+    turn = math.floor(lo_value / 360.0)
+    while turn * 360.0 <= hi_value:
+        base = turn * 360.0
+        i = bisect_right(levels, lo_value - base)
+        while i < len(levels) and base + levels[i] <= hi_value:
+            found.append(base + levels[i])
+            i += 1
+        turn += 1
+    return found
+
+
+class AngleTrack:
+    """
+    Longitude sampled on a time grid, unwrapped and interpolated with a
+    3-point quadratic. With the 60-minute samples the event engines use
+    (SAMPLE_MINUTES) this is accurate to about 0.005 arc-second for the
+    Moon and better for every other planet, so event searches can
+    evaluate it freely instead of calling the ephemeris again.
+    """
+
+    def __init__(self, times: Sequence[float], angles: Sequence[float]):
+        if len(times) < 3:
+            raise ValueError("AngleTrack needs at least three samples")
+        self.times = list(times)
+        self.values = unwrap(angles)
+
+    def __call__(self, t: float) -> float:
+        i = bisect_right(self.times, t) - 1
+        i = min(max(i, 0), len(self.times) - 3)
+        (t0, t1, t2), (y0, y1, y2) = self.times[i:i + 3], self.values[i:i + 3]
+        return (y0 * (t - t1) * (t - t2) / ((t0 - t1) * (t0 - t2))
+                + y1 * (t - t0) * (t - t2) / ((t1 - t0) * (t1 - t2))
+                + y2 * (t - t0) * (t - t1) / ((t2 - t0) * (t2 - t1)))
+
+    def span(self) -> Tuple[float, float]:
+        return self.values[0], self.values[-1]
+
+    def turning_points(self) -> List[float]:
+        """
+        Times where the interpolant changes direction, e.g. a planet's
+        station or the closest approach of two bodies. Between turning
+        points the track is monotonic, so bracketing by sign changes
+        cannot miss a crossing.
+        """
+        out = []
+        for i in range(len(self.times) - 1):
+            j = min(i, len(self.times) - 3)
+            (t0, t1, t2), (y0, y1, y2) = self.times[j:j + 3], self.values[j:j + 3]
+            d01 = (y1 - y0) / (t1 - t0)
+            curvature = ((y2 - y1) / (t2 - t1) - d01) / (t2 - t0)
+            if curvature == 0:
+                continue
+            # p'(t) = d01 + curvature * (2t - t0 - t1)
+            vertex = (t0 + t1) / 2 - d01 / (2 * curvature)
+            if self.times[i] < vertex < self.times[i + 1]:
+                out.append(vertex)
+        return out
@@ -11,8 +11,26 @@ From document:
   Shubh Vedh on Moon → Mandi.
   Ashubh Vedh on Moon → Teji.
   Vedh > Aspect (higher priority).
+
+The three vedh tables are compiled once into 27-bit masks per source
+nakshatra (bit n-1 = nakshatra n is hit), per direction and per planet
+mode (3-direction, retrograde, normal), and into a (mode × source × target)
+code matrix. Vedh on a target is a shift and an AND; over a timeline it is
+one fancy-indexing step on T × planet nakshatra columns (vedh_codes).
+vedh_timeline uses this to list when each vedh on the Moon begins and ends.
 """
 
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytz
+
+from .config import TIMEZONE
+from .ephemeris_executor import ephemeris
+from .nakshatra_engine import calculate_nakshatra
+from .vector_scoring_engine import planet_columns
+
 # ── 27 Nakshatra names ──
 NAKSHATRA_NAMES = {
     1: "Ashwini",       2: "Bharani",       3: "Krittika",
@@ -95,6 +113,48 @@ SBC_SIDES = {
 }
 
 
+# ── Compiled vedh masks ──
+VEDH_TABLES = {"Samukh": SAMUKH_VEDH, "Bam": BAM_VEDH, "Dakshin": DAKSHIN_VEDH}
+# Slots run to 28 so any nakshatra index (1-27, or 28 from a rounded 360°) is safe
+_SLOTS = 29
+VEDH_MASKS = {
+    direction: [1 << (table[n] - 1) if n in table else 0 for n in range(_SLOTS)]
+    for direction, table in VEDH_TABLES.items()
+}
+# Planet mode → (table direction, reported direction), in the order get_vedh_targets lists them
+VEDH_MODES = {
+    "normal": (("Samukh", "Samukh"),),
+    "retro": (("Dakshin", "Dakshin (Retro)"),),
+    "three": (("Samukh", "Samukh"), ("Bam", "Bam"), ("Dakshin", "Dakshin")),
+}
+PLANET_VEDH_MASKS = {
+    mode: [sum(VEDH_MASKS[direction][n] for direction, _ in directions) for n in range(_SLOTS)]
+    for mode, directions in VEDH_MODES.items()
+}
+# DIRECTION_CODES[code - 1] is the direction of a vedh code; 0 = no vedh
+DIRECTION_CODES = ("Samukh", "Bam", "Dakshin", "Dakshin (Retro)")
+_MODE_INDEX = {mode: i for i, mode in enumerate(VEDH_MODES)}
+
+
+def _code_matrix() -> np.ndarray:
+    """(mode, source, target) → direction code; each target is hit by at most one direction."""
+    codes = np.zeros((len(VEDH_MODES), _SLOTS, _SLOTS), dtype=np.uint8)
+    for mode, directions in VEDH_MODES.items():
+        for direction, label in directions:
+            for source, target in VEDH_TABLES[direction].items():
+                codes[_MODE_INDEX[mode], source, target] = DIRECTION_CODES.index(label) + 1
+    return codes
+
+
+VEDH_CODES = _code_matrix()
+
+
+def vedh_mode(planet: str, retrograde: bool = False) -> str:
+    if planet in THREE_DIR_PLANETS:
+        return "three"
+    return "retro" if retrograde else "normal"
+
+
 def get_nakshatra_name(nak: int) -> str:
     return NAKSHATRA_NAMES.get(nak, f"Nak-{nak}")
 
@@ -117,25 +177,18 @@ def get_vedh_targets(source_nak: int, planet: str, retrograde: bool = False) ->
     Retrograde → gives Dakshin vedh instead of Samukh.
     """
     targets = []
+    for direction, label in VEDH_MODES[vedh_mode(planet, retrograde)]:
+        mask = VEDH_MASKS[direction][source_nak]
+        if mask:
+            targets.append({"target": mask.bit_length(), "direction": label})
+    return targets
 
-    if planet in THREE_DIR_PLANETS:
-        # 3 direction vedh
-        if source_nak in SAMUKH_VEDH:
-            targets.append({"target": SAMUKH_VEDH[source_nak], "direction": "Samukh"})
-        if source_nak in BAM_VEDH:
-            targets.append({"target": BAM_VEDH[source_nak], "direction": "Bam"})
-        if source_nak in DAKSHIN_VEDH:
-            targets.append({"target": DAKSHIN_VEDH[source_nak], "direction": "Dakshin"})
-    elif retrograde:
-        # Retrograde → Dakshin vedh only
-        if source_nak in DAKSHIN_VEDH:
-            targets.append({"target": DAKSHIN_VEDH[source_nak], "direction": "Dakshin (Retro)"})
-    else:
-        # Normal → Samukh vedh only
-        if source_nak in SAMUKH_VEDH:
-            targets.append({"target": SAMUKH_VEDH[source_nak], "direction": "Samukh"})
 
-    return targets
+def vedh_on(target_nak: int, planets: dict) -> list:
+    """Planets whose vedh hits target_nak: one mask test per planet."""
+    bit = 1 << (target_nak - 1)
+    return [planet for planet, data in planets.items()
+            if PLANET_VEDH_MASKS[vedh_mode(planet, data.get("retrograde", False))][data["nakshatra"]] & bit]
 
 
 def classify_vedh(planet: str) -> str:
@@ -227,3 +280,136 @@ def calculate_sbc(planets: dict) -> dict:
         "total_vedh_count": len(all_vedh),
         "all_vedh": all_vedh,
     }
+
+
+# ═══════════════════════════════════════════════════════════════
+# VECTORIZED VEDH AND MOON VEDH TIMELINE
+# ═══════════════════════════════════════════════════════════════
+
+SBC_TIMELINE_MAX_DAYS = 366
+# Sampled instants per request (~2.3 s per 10,000 on the ephemeris executor); a year needs step_minutes >= 27
+SBC_TIMELINE_MAX_POINTS = 20000
+_SCORES = {"Shubh": -3, "Ashubh": 3}
+
+
+def vedh_codes(names, naks: np.ndarray, retro: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Direction code (see DIRECTION_CODES, 0 = none) of each planet's vedh on
+    each row's target: naks and retro are T × len(names), targets has T entries.
+    """
+    three = np.array([p in THREE_DIR_PLANETS for p in names])
+    modes = np.where(three, _MODE_INDEX["three"],
+                     np.where(retro, _MODE_INDEX["retro"], _MODE_INDEX["normal"]))
+    return VEDH_CODES[modes, naks, np.asarray(targets)[:, None]]
+
+
+def vedh_scores(names, codes: np.ndarray) -> np.ndarray:
+    """SBC score per row (Shubh −3, Ashubh +3 per vedh) from vedh_codes."""
+    signs = np.array([_SCORES.get(classify_vedh(p), 0) for p in names])
+    return (codes > 0) @ signs
+
+
+def sbc_columns(times) -> tuple:
+    """
+    (names, nakshatras, retrograde) for each time as in /sbc/calculate: the
+    snapshot planets plus Ketu opposite Rahu, always retrograde. Naive
+    times are IST; run on the ephemeris executor.
+    """
+    cols = planet_columns(times)
+    ketu = (cols.column("degree", "rahu") + 180) % 360
+    ketu_nak = np.array([calculate_nakshatra(d) for d in ketu.tolist()], dtype=np.int64)
+    return (cols.names + ("ketu",),
+            np.column_stack([cols.nakshatra, ketu_nak]),
+            np.column_stack([cols.retrograde, np.ones(len(times), dtype=bool)]))
+
+
+def _moon_state(times) -> tuple:
+    names, naks, retro = sbc_columns(times)
+    moon = names.index("moon")
+    codes = vedh_codes(names, naks, retro, naks[:, moon])
+    codes[:, moon] = 0
+    return names, codes, naks[:, moon]
+
+
+def _describe_state(names, codes, moon_nak: int) -> dict:
+    vedh = [{"planet": p, "direction": DIRECTION_CODES[c - 1], "vedh_type": classify_vedh(p),
+             "effect": vedh_effect(classify_vedh(p))}
+            for p, c in zip(names, codes) if c]
+    return {
+        "moon_nakshatra": moon_nak,
+        "moon_nakshatra_name": get_nakshatra_name(moon_nak),
+        "sbc_score": sum(_SCORES.get(v["vedh_type"], 0) for v in vedh),
+        "moon_vedh": vedh,
+    }
+
+
+def _vedh_timeline(start: datetime, end: datetime, step_minutes: int) -> dict:
+    minute = timedelta(minutes=1)
+    step = timedelta(minutes=step_minutes)
+    times = [start + i * step for i in range(int((end - start) / step) + 1)]
+    if times[-1] < end:
+        times.append(end)
+    names, codes, moon = _moon_state(times)
+    states = [(int(m), tuple(int(c) for c in row)) for m, row in zip(moon, codes)]
+
+    def state_at(t: datetime) -> tuple:
+        _, c, m = _moon_state([t])
+        return int(m[0]), tuple(int(x) for x in c[0])
+
+    segments, events = [], []
+    current, since = states[0], times[0]
+
+    def close(until: datetime):
+        segments.append({"start": since.strftime("%Y-%m-%d %H:%M"), "end": until.strftime("%Y-%m-%d %H:%M"),
+                         **_describe_state(names, current[1], current[0])})
+
+    for i in range(1, len(times)):
+        lo = times[i - 1]
+        while current != states[i]:
+            # First minute after lo with a different state (positions change per minute)
+            hi = times[i]
+            while hi - lo > minute:
+                mid = lo + (hi - lo) // 2 // minute * minute
+                if state_at(mid) == current:
+                    lo = mid
+                else:
+                    hi = mid
+            new = states[i] if hi == times[i] else state_at(hi)
+            close(hi)
+            for p, old_code, new_code in zip(names, current[1], new[1]):
+                if old_code != new_code:
+                    if old_code:
+                        events.append({"time": hi.strftime("%Y-%m-%d %H:%M"), "planet": p, "kind": "end",
+                                       "direction": DIRECTION_CODES[old_code - 1]})
+                    if new_code:
+                        events.append({"time": hi.strftime("%Y-%m-%d %H:%M"), "planet": p, "kind": "start",
+                                       "direction": DIRECTION_CODES[new_code - 1]})
+            current, since, lo = new, hi, hi
+    close(end)
+    return {"segments": segments, "events": events}
+
+
+def vedh_timeline(start: datetime, end: datetime, step_minutes: int = 15, executor=ephemeris) -> dict:
+    """
+    Vedh on the Moon between two times (naive = IST): segments of constant
+    Moon nakshatra and vedh set with their SBC score, and "events", each vedh
+    starting or ending. The span is sampled every step_minutes and each
+    change is narrowed to the minute; a vedh that starts and ends within
+    one step is not seen.
+    """
+    tz = pytz.timezone(TIMEZONE)
+    start, end = [t.astimezone(tz).replace(tzinfo=None) if t.tzinfo else t for t in (start, end)]
+    start, end = start.replace(second=0, microsecond=0), end.replace(second=0, microsecond=0)
+    if end <= start:
+        raise ValueError("end must be after start")
+    if (end - start).days >= SBC_TIMELINE_MAX_DAYS:
+        raise ValueError(f"range is limited to {SBC_TIMELINE_MAX_DAYS} days")
+    if step_minutes < 1:
+        raise ValueError("step_minutes must be at least 1")
+    minutes = int((end - start).total_seconds() // 60)
+    count = minutes // step_minutes + 1
+    if count > SBC_TIMELINE_MAX_POINTS:
+        raise ValueError(f"Timeline has {count} points; the limit is {SBC_TIMELINE_MAX_POINTS}, "
+                         f"use step_minutes >= {math.ceil(minutes / (SBC_TIMELINE_MAX_POINTS - 1))}")
+    result = executor.run_sync(_vedh_timeline, start, end, step_minutes)
+    return {"start": start.strftime("%Y-%m-%d %H:%M"), "end": end.strftime("%Y-%m-%d %H:%M"), **result}
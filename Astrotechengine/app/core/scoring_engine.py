@@ -85,6 +85,7 @@ def _rule_01_sbc_vedh(planets: dict) -> dict:
     v = vedh_score(planets)
     return {
         "score": v["score"] * WEIGHT_SBC_VEDH,
+        "raw_score": v["score"],
         "description": "SBC Vedh (benefic→mandi, malefic→teji)",
         "detail": v,
     }
@@ -112,6 +113,7 @@ def _rule_02_drishti(planets: dict) -> dict:
                 details.append(f"{p.title()} {asp['type']} {tgt_name.title()} → Teji ({asp['score']:+d})")
     return {
         "score": score * WEIGHT_DRISHTI,
+        "raw_score": score,
         "description": "Drishti on Sun/Moon (benefic→mandi, malefic→teji)",
         "detail": details,
     }
@@ -134,6 +136,7 @@ def _rule_03_tarva_rashi(planets: dict) -> dict:
             details.append(f"{name} in Jal Tarva rashi {rashi} → Mandi")
     return {
         "score": score * WEIGHT_TARVA_RASHI,
+        "raw_score": score,
         "description": "Tarva Rashi: Agni(1,5,9)=teji, Jal(4,8,12)=mandi",
         "detail": details,
     }
@@ -165,6 +168,7 @@ def _rule_04_nakshatra_tendency(planets: dict) -> dict:
             details.append(f"Sun in {nak_name} (Nak {sun_nak}) → Mandi tendency")
     return {
         "score": score * WEIGHT_NAKSHATRA_TEND,
+        "raw_score": score,
         "description": "Sun & Moon nakshatra teji/mandi tendency",
         "detail": details,
     }
@@ -193,6 +197,7 @@ def _rule_05_planet_power(planets: dict) -> dict:
             details.append(f"{p.title()} debilitated in rashi {rashi} → Weak (-2)")
     return {
         "score": score * WEIGHT_PLANET_POWER,
+        "raw_score": score,
         "description": "Planet strength: exalted/own/friend/debilitated",
         "detail": details,
     }
@@ -220,6 +225,7 @@ def _rule_06_sun_moon_zero(planets: dict) -> dict:
         details.append(f"Moon at {moon_deg_in_rashi:.1f}°, Sun at {sun_deg_in_rashi:.1f}° — no 0° effect")
     return {
         "score": score * WEIGHT_SUN_MOON_ZERO,
+        "raw_score": score,
         "description": "Sun/Moon at 0° of rashi = strong Mandi",
         "detail": details,
     }
@@ -230,6 +236,7 @@ def _rule_07_pap_khatri(planets: dict) -> dict:
     pky = pap_khatri_yog(planets)
     return {
         "score": pky["score"] * WEIGHT_PAP_KHATRI,
+        "raw_score": pky["score"],
         "description": "Paap Khatri Yog (Moon between malefics; Budh reverses)",
         "detail": pky,
     }
@@ -240,6 +247,7 @@ def _rule_08_budh(planets: dict) -> dict:
     budh = evaluate_budh(planets)
     return {
         "score": budh["score"] * WEIGHT_BUDH,
+        "raw_score": budh["score"],
         "description": "Budh ka Yog (retro+combust=teji, margi=mandi, conjunctions)",
         "detail": budh,
     }
@@ -249,7 +257,7 @@ def _rule_09_surya_nakshatra(planets: dict) -> dict:
     """Rule 9: Surya nakshatra sheet — teji when Sun in certain nakshatras."""
     sun_nak = planets["sun"].get("nakshatra")
     if not sun_nak:
-        return {"score": 0, "description": "Surya nakshatra (no data)", "detail": []}
+        return {"score": 0, "raw_score": 0, "description": "Surya nakshatra (no data)", "detail": []}
     nak_name = get_nakshatra_name(sun_nak)
     if sun_nak in SURYA_TEJI_NAKSHATRAS:
         score = 2
@@ -259,22 +267,23 @@ def _rule_09_surya_nakshatra(planets: dict) -> dict:
         detail = f"Sun in {nak_name} (Nak {sun_nak}) → Mandi per Surya sheet"
     return {
         "score": score * WEIGHT_SURYA_NAK,
+        "raw_score": score,
         "description": "Surya nakshatra sheet teji/mandi",
         "detail": [detail],
     }
 
 
-def _rule_10_day_nakshatra(planets: dict) -> dict:
+def _rule_10_day_nakshatra(planets: dict, at: datetime.datetime = None) -> dict:
     """Rule 10: Day-of-week nakshatra match (80% probability).
     Monday=Moon, Tuesday=Mars, etc. If Moon's nakshatra lord matches
-    the day's ruling planet → Teji."""
+    the day's ruling planet → Teji. The day is today unless at is given."""
     tz = pytz.timezone(TIMEZONE)
-    today = datetime.datetime.now(tz)
+    today = at if at is not None else datetime.datetime.now(tz)
     weekday = today.weekday()  # 0=Monday
     day_planet = DAY_PLANET_MAP.get(weekday, "sun")
     moon_nak = planets["moon"].get("nakshatra")
     if not moon_nak:
-        return {"score": 0, "description": "Day-nakshatra match (no data)", "detail": []}
+        return {"score": 0, "raw_score": 0, "description": "Day-nakshatra match (no data)", "detail": []}
     nak_lord = get_nakshatra_lord(moon_nak).lower()
     day_name = today.strftime("%A")
     if nak_lord == day_planet:
@@ -287,6 +296,7 @@ def _rule_10_day_nakshatra(planets: dict) -> dict:
                   f"day planet={day_planet.title()} → No match")
     return {
         "score": score * WEIGHT_DAY_NAK,
+        "raw_score": score,
         "description": "Day-of-week nakshatra match (80% probability)",
         "detail": [detail],
     }
@@ -328,6 +338,7 @@ def _rule_11_planet_info(planets: dict) -> dict:
             details.append(f"{p.title()}: Normal")
     return {
         "score": score * WEIGHT_PLANET_INFO,
+        "raw_score": score,
         "description": "Planet status summary (retro/exalted/debilitated/combust)",
         "detail": details,
     }
@@ -368,6 +379,7 @@ def _rule_12_viprit_raj(planets: dict) -> dict:
         details.append("No Viprit Raj Yog or special reversal conditions active")
     return {
         "score": score * WEIGHT_VIPRIT_RAJ,
+        "raw_score": score,
         "description": "Viprit Raj Yog (combust+debil=teji); retro/combust/debil reversals",
         "detail": details,
     }
@@ -405,6 +417,7 @@ def _rule_13_tithi(planets: dict) -> dict:
 
     return {
         "score": score * WEIGHT_TITHI,
+        "raw_score": score,
         "description": "Tithi: Purnima/Amavasya one-sided; Moon combust big move",
         "detail": details,
         "one_sided": one_sided,
@@ -415,78 +428,137 @@ def _rule_13_tithi(planets: dict) -> dict:
 
 # ─────────────── MASTER AGGREGATION ───────────────
 
-def final_score(planets: dict) -> dict:
+# breakdown key -> config.py weight that multiplies its raw_score
+RULE_WEIGHTS = {
+    "01_SBC_Vedh":           "WEIGHT_SBC_VEDH",
+    "02_Drishti":            "WEIGHT_DRISHTI",
+    "03_Tarva_Rashi":        "WEIGHT_TARVA_RASHI",
+    "04_Nakshatra_Tendency": "WEIGHT_NAKSHATRA_TEND",
+    "05_Planet_Power":       "WEIGHT_PLANET_POWER",
+    "06_Sun_Moon_Zero":      "WEIGHT_SUN_MOON_ZERO",
+    "07_Paap_Khatri":        "WEIGHT_PAP_KHATRI",
+    "08_Budh_Yog":           "WEIGHT_BUDH",
+    "09_Surya_Nakshatra":    "WEIGHT_SURYA_NAK",
+    "10_Day_Nakshatra":      "WEIGHT_DAY_NAK",
+    "11_Planet_Info":        "WEIGHT_PLANET_INFO",
+    "12_Viprit_Raj":         "WEIGHT_VIPRIT_RAJ",
+    "13_Tithi_Purnima":      "WEIGHT_TITHI",
+    "Moon_Rashi":            "WEIGHT_RASHI",
+    "Navansh_Barguttam":     "WEIGHT_NAVANSH",
+}
+
+def scoring_planets(raw: dict) -> dict:
+    """Flat planet dict for final_score from swiss_engine.get_planetary_positions output."""
+    planets = {}
+    for name, data in raw.items():
+        planets[name] = {
+            "degree": data["D1"]["longitude"],
+            "rashi": data["D1"]["rashi"],
+            "retrograde": data["D1"]["retrograde"],
+            "speed": data["D1"]["speed"],
+            "nakshatra": data["D1"]["nakshatra"],
+            "d9_rashi": data["D9"]["navansh_rashi"],
+        }
+    return planets
+
+
+def trend_label(total_score: float) -> str:
+    """Trend label for a (rounded) total score."""
+    if total_score >= TREND_VERY_STRONG_TEJI:
+        return "Very Strong Teji 🟢🟢"
+    if total_score >= TREND_TEJI:
+        return "Teji 🟢"
+    if total_score <= TREND_VERY_STRONG_MANDI:
+        return "Very Strong Mandi 🔴🔴"
+    if total_score <= TREND_MANDI:
+        return "Mandi 🔴"
+    return "Sideways ⚪"
+
+
+def _rule_moon_rashi(planets: dict) -> dict:
+    """Legacy: Moon rashi teji/mandi classification."""
+    moon_rashi = planets["moon"].get("rashi")
+    if not moon_rashi:
+        return None
+    r_raw = rashi_score(moon_rashi)
+    r_val = r_raw * WEIGHT_RASHI
+    return {
+        "score": r_val,
+        "raw_score": r_raw,
+        "description": "Moon rashi teji/mandi classification",
+        "detail": [f"Moon rashi {moon_rashi} → score {r_val:+.1f}"],
+    }
+
+
+def _rule_navansh(planets: dict) -> dict:
+    """Legacy: D9 Barguttam for the Moon."""
+    d1 = planets["moon"].get("rashi")
+    d9 = planets["moon"].get("d9_rashi")
+    if not (d1 and d9):
+        return None
+    nav_raw = navansh_score(d1, d9)
+    nav_val = nav_raw * WEIGHT_NAVANSH
+    barg = d1 == d9
+    return {
+        "score": nav_val,
+        "raw_score": nav_raw,
+        "description": "D9 Barguttam (D1==D9 = strong teji +3)",
+        "detail": [f"D1={d1}, D9={d9} → {'BARGUTTAM' if barg else 'No Barguttam'} → {nav_val:+.1f}"],
+    }
+
+
+# (breakdown key, rule(planets, at)); a rule returning None is left out of the breakdown
+RULES = [
+    ("01_SBC_Vedh",           lambda p, at: _rule_01_sbc_vedh(p)),
+    ("02_Drishti",            lambda p, at: _rule_02_drishti(p)),
+    ("03_Tarva_Rashi",        lambda p, at: _rule_03_tarva_rashi(p)),
+    ("04_Nakshatra_Tendency", lambda p, at: _rule_04_nakshatra_tendency(p)),
+    ("05_Planet_Power",       lambda p, at: _rule_05_planet_power(p)),
+    ("06_Sun_Moon_Zero",      lambda p, at: _rule_06_sun_moon_zero(p)),
+    ("07_Paap_Khatri",        lambda p, at: _rule_07_pap_khatri(p)),
+    ("08_Budh_Yog",           lambda p, at: _rule_08_budh(p)),
+    ("09_Surya_Nakshatra",    lambda p, at: _rule_09_surya_nakshatra(p)),
+    ("10_Day_Nakshatra",      _rule_10_day_nakshatra),
+    ("11_Planet_Info",        lambda p, at: _rule_11_planet_info(p)),
+    ("12_Viprit_Raj",         lambda p, at: _rule_12_viprit_raj(p)),
+    ("13_Tithi_Purnima",      lambda p, at: _rule_13_tithi(p)),
+    ("Moon_Rashi",            lambda p, at: _rule_moon_rashi(p)),
+    ("Navansh_Barguttam",     lambda p, at: _rule_navansh(p)),
+]
+
+
+def final_score(planets: dict, at: datetime.datetime = None) -> dict:
     """
     Aggregates all 13 rules with configurable weights.
     planets: dict of planet name -> {degree, rashi, retrograde, speed, nakshatra, d9_rashi}
-    Returns dict with score, trend, confidence, breakdown, alerts.
+    at: the moment being scored, for the day-of-week rule (default now);
+    backtests pass the session time.
+    Returns dict with score, trend, confidence, breakdown, alerts. Each
+    breakdown entry has the weighted "score" and the unweighted "raw_score".
     """
-    rules = [
-        ("01_SBC_Vedh",           _rule_01_sbc_vedh),
-        ("02_Drishti",            _rule_02_drishti),
-        ("03_Tarva_Rashi",        _rule_03_tarva_rashi),
-        ("04_Nakshatra_Tendency", _rule_04_nakshatra_tendency),
-        ("05_Planet_Power",       _rule_05_planet_power),
-        ("06_Sun_Moon_Zero",      _rule_06_sun_moon_zero),
-        ("07_Paap_Khatri",        _rule_07_pap_khatri),
-        ("08_Budh_Yog",           _rule_08_budh),
-        ("09_Surya_Nakshatra",    _rule_09_surya_nakshatra),
-        ("10_Day_Nakshatra",      _rule_10_day_nakshatra),
-        ("11_Planet_Info",        _rule_11_planet_info),
-        ("12_Viprit_Raj",         _rule_12_viprit_raj),
-        ("13_Tithi_Purnima",      _rule_13_tithi),
-    ]
+    breakdown = {}
+    for rule_name, rule_fn in RULES:
+        result = rule_fn(planets, at)
+        if result is not None:
+            breakdown[rule_name] = result
+    return summarize(breakdown)
 
+
+def summarize(breakdown: dict) -> dict:
+    """Total, trend, confidence, rule counts and alerts for a rule breakdown (in RULES order)."""
     total_score = 0.0
-    breakdown = {}
     alerts = []
-
-    for rule_name, rule_fn in rules:
-        result = rule_fn(planets)
-        rule_score = result["score"]
-        total_score += rule_score
-        breakdown[rule_name] = result
+    for result in breakdown.values():
+        total_score += result["score"]
         # Collect big-move / one-sided alerts
         if result.get("one_sided"):
             alerts.append("⚠ ONE-SIDED MARKET (Purnima/Amavasya)")
         if result.get("big_move"):
             alerts.append("⚠ BIG MOVE 200-300 pts (Moon Combust)")
 
-    # Also add legacy rashi & navansh scores
-    moon_rashi = planets["moon"].get("rashi")
-    if moon_rashi:
-        r_val = rashi_score(moon_rashi) * WEIGHT_RASHI
-        total_score += r_val
-        breakdown["Moon_Rashi"] = {
-            "score": r_val,
-            "description": "Moon rashi teji/mandi classification",
-            "detail": [f"Moon rashi {moon_rashi} → score {r_val:+.1f}"],
-        }
-
-    d1 = planets["moon"].get("rashi")
-    d9 = planets["moon"].get("d9_rashi")
-    if d1 and d9:
-        nav_val = navansh_score(d1, d9) * WEIGHT_NAVANSH
-        total_score += nav_val
-        barg = d1 == d9
-        breakdown["Navansh_Barguttam"] = {
-            "score": nav_val,
-            "description": "D9 Barguttam (D1==D9 = strong teji +3)",
-            "detail": [f"D1={d1}, D9={d9} → {'BARGUTTAM' if barg else 'No Barguttam'} → {nav_val:+.1f}"],
-        }
-
     # Determine trend
     total_score = round(total_score, 2)
-    if total_score >= TREND_VERY_STRONG_TEJI:
-        trend = "Very Strong Teji 🟢🟢"
-    elif total_score >= TREND_TEJI:
-        trend = "Teji 🟢"
-    elif total_score <= TREND_VERY_STRONG_MANDI:
-        trend = "Very Strong Mandi 🔴🔴"
-    elif total_score <= TREND_MANDI:
-        trend = "Mandi 🔴"
-    else:
-        trend = "Sideways ⚪"
+    trend = trend_label(total_score)
 
     # Confidence: higher absolute score = more confident, cap at 95%
     confidence = min(abs(total_score) * 5, 95)
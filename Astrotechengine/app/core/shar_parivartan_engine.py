@@ -11,12 +11,20 @@ In Vedic market astrology:
 Moon crosses the equator ~2 times per month.
 All grahas exhibit this behaviour at their own frequency.
 This is considered one of the highest-priority signals.
+
+Crossings (and local declination maxima / minima) come from a persisted
+event table, built on first use and extended as later dates are asked
+for; see build_declination_table to precompute a span.
 """
 
 import swisseph as swe
 import datetime
+import math
 import pytz
 from .config import MUMBAI_LAT, MUMBAI_LON, TIMEZONE
+from .ephemeris_executor import ephemeris
+from .event_index import EventIndex, IndexedEvent
+from .root_finder import find_root, jd_from_datetime
 
 PLANETS = {
     "sun": swe.SUN,
@@ -29,17 +37,12 @@ PLANETS = {
     "rahu": swe.MEAN_NODE,
 }
 
-# Max days to search forward for next declination crossing
-_MAX_SEARCH_DAYS = {
-    "moon": 16,       # crosses ~every 13-14 days
-    "sun": 200,       # crosses ~every 6 months
-    "mercury": 60,
-    "venus": 120,
-    "mars": 365,
-    "jupiter": 400,
-    "saturn": 400,
-    "rahu": 400,
-}
+# Coarse sampling step (days) when building the crossing table
+_SAMPLE_DAYS = {"moon": 0.25}
+# How far ahead to look for a next crossing; Saturn and Rahu can stay on one side for years
+CROSSING_HORIZON_DAYS = 6000
+# Bump when the event table changes, so stored events are rebuilt
+DECLINATION_TABLE_VERSION = 2
 
 
 def _get_declination(jd: float, planet_id: int) -> tuple:
@@ -55,95 +58,144 @@ def _get_declination(jd: float, planet_id: int) -> tuple:
     return decl, decl_speed
 
 
-def _find_next_crossing(jd_start: float, planet_id: int, current_decl: float,
-                        max_days: int) -> dict | None:
+def _declination_events(name: str, start_jd: float, end_jd: float) -> list:
     """
-    Step forward in time to find the next moment declination crosses 0°.
-    Uses coarse search (step_days) then bisection to refine.
-    Returns dict with crossing info or None if not found.
+    Equator crossings and local declination maxima / minima of one planet
+    in [start_jd, end_jd): sample, bracket sign changes of declination (and
+    of its speed), then root-find each one.
+    Returns (jd, kind, value, detail) tuples for the event index.
     """
-    # Coarse step: Moon needs finer steps
-    step = 0.25 if planet_id == swe.MOON else 1.0
-    prev_decl = current_decl
-    prev_jd = jd_start
-
-    jd = jd_start + step
-    limit_jd = jd_start + max_days
-
-    while jd <= limit_jd:
-        decl, _ = _get_declination(jd, planet_id)
-        # Check if sign changed (crossed 0°)
-        if (prev_decl > 0 and decl <= 0) or (prev_decl < 0 and decl >= 0):
-            # Bisection to narrow down
-            lo, hi = prev_jd, jd
-            for _ in range(30):  # ~30 iterations → sub-second accuracy
-                mid = (lo + hi) / 2
-                mid_decl, _ = _get_declination(mid, planet_id)
-                if (prev_decl > 0 and mid_decl > 0) or (prev_decl < 0 and mid_decl < 0):
-                    lo = mid
-                else:
-                    hi = mid
-            cross_jd = (lo + hi) / 2
-            cross_decl, _ = _get_declination(cross_jd, planet_id)
-            # Direction: N→S or S→N
-            if prev_decl > 0:
-                direction = "North → South"
-                trend = "Mandi → Teji"
-            else:
-                direction = "South → North"
-                trend = "Teji → Mandi"
-            # Convert JD back to datetime
-            y, m, d, h = swe.revjul(cross_jd)
-            hours = int(h)
-            minutes = int((h - hours) * 60)
-            cross_dt = datetime.datetime(y, m, d, hours, minutes)
-            days_away = cross_jd - jd_start
-            return {
-                "cross_jd": cross_jd,
-                "cross_date": cross_dt.strftime("%Y-%m-%d %H:%M"),
-                "days_away": round(days_away, 2),
-                "direction": direction,
-                "trend": trend,
-            }
-        prev_decl = decl
-        prev_jd = jd
-        jd += step
-
-    return None
-
-
-def calculate_shar_parivartan(dt=None) -> dict:
+    pid = PLANETS[name]
+    step = _SAMPLE_DAYS.get(name, 1.0)
+    count = max(1, math.ceil((end_jd - start_jd) / step))
+    times = [start_jd + i * (end_jd - start_jd) / count for i in range(count + 1)]
+    samples = [_get_declination(t, pid) for t in times]
+
+    events = []
+    for (t0, (d0, v0)), (t1, (d1, v1)) in zip(zip(times, samples), zip(times[1:], samples[1:])):
+        if (d0 > 0 and d1 <= 0) or (d0 < 0 and d1 >= 0):
+            jd = find_root(lambda t: _get_declination(t, pid)[0], t0, t1, d0, d1)
+            if start_jd <= jd < end_jd:
+                detail = "North → South" if d0 > 0 else "South → North"
+                events.append((jd, "crossing", 0.0, detail))
+        if (v0 > 0 and v1 <= 0) or (v0 < 0 and v1 >= 0):
+            jd = find_root(lambda t: _get_declination(t, pid)[1], t0, t1, v0, v1)
+            if start_jd <= jd < end_jd:
+                decl = _get_declination(jd, pid)[0]
+                # Named by turning direction; a maximum can lie south of the equator
+                kind = "local_max" if v0 > 0 else "local_min"
+                events.append((jd, kind, decl, f"{abs(decl):.4f}° {'N' if decl >= 0 else 'S'}"))
+    return events
+
+
+declination_index = EventIndex("declination", _declination_events, DECLINATION_TABLE_VERSION)
+
+
+def _jd_to_label(jd: float) -> str:
+    y, m, d, h = swe.revjul(jd)
+    hours = int(h)
+    minutes = int((h - hours) * 60)
+    return datetime.datetime(y, m, d, hours, minutes).strftime("%Y-%m-%d %H:%M")
+
+
+def _crossing_info(event: IndexedEvent, jd_from: float) -> dict:
+    return {
+        "cross_jd": event.jd,
+        "cross_date": _jd_to_label(event.jd),
+        "days_away": round(event.jd - jd_from, 2),
+        "direction": event.detail,
+        "trend": "Mandi → Teji" if event.detail == "North → South" else "Teji → Mandi",
+    }
+
+
+def _current_declinations(jd: float) -> dict:
+    return {name: _get_declination(jd, pid) for name, pid in PLANETS.items()}
+
+
+def calculate_shar_parivartan(dt=None, index: EventIndex = declination_index) -> dict:
     """
     For each planet, calculate:
       - Current declination (degrees)
       - Side: North or South
       - Declination speed (deg/day)
       - Market implication: North=Mandi, South=Teji
-      - Next crossing date & direction
+      - Next crossing date & direction (from the crossing table)
       - Days until next crossing
     """
+    tz = pytz.timezone(TIMEZONE)
     if dt is None:
-        tz = pytz.timezone(TIMEZONE)
         dt = datetime.datetime.now(tz)
+    elif dt.tzinfo is None:
+        dt = tz.localize(dt)
 
-    jd = swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60)
+    # True UT, the time base of the crossing index
+    jd = jd_from_datetime(dt)
+    current = ephemeris.run_sync(_current_declinations, jd)
     results = {}
 
-    for name, pid in PLANETS.items():
-        decl, decl_speed = _get_declination(jd, pid)
+    for name in PLANETS:
+        decl, decl_speed = current[name]
 
         side = "North" if decl >= 0 else "South"
         market = "Mandi" if decl >= 0 else "Teji"
 
-        max_days = _MAX_SEARCH_DAYS.get(name, 200)
-        crossing = _find_next_crossing(jd, pid, decl, max_days)
+        crossing = index.next_event(name, jd, kinds=("crossing",),
+                                                horizon_days=CROSSING_HORIZON_DAYS)
 
         results[name] = {
             "declination": round(decl, 4),
             "side": side,
             "market": market,
             "decl_speed": round(decl_speed, 6),
-            "next_crossing": crossing,
+            "next_crossing": _crossing_info(crossing, jd) if crossing else None,
         }
 
     return results
+
+
+def _day_jd(day) -> float:
+    return swe.julday(day.year, day.month, day.day, 0.0)
+
+
+def declination_calendar(date_from, date_to, planets=None, include_extremes: bool = False,
+                         index: EventIndex = declination_index) -> list:
+    """
+    Every equator crossing from date_from to date_to (inclusive, UT days),
+    and with include_extremes also each planet's local maxima and minima
+    of declination (event "local_max" / "local_min"), in time order.
+    """
+    unknown = [p for p in planets or [] if p not in PLANETS]
+    if unknown:
+        raise ValueError(f"Unknown planet(s): {', '.join(unknown)}")
+    start_jd, end_jd = _day_jd(date_from), _day_jd(date_to) + 1
+    kinds = None if include_extremes else ("crossing",)
+    events = []
+    for name in planets or PLANETS:
+        for e in index.between(name, start_jd, end_jd, kinds):
+            entry = {"planet": name, "jd": e.jd, "date": _jd_to_label(e.jd), "event": e.kind}
+            if e.kind == "crossing":
+                entry["direction"] = e.detail
+                entry["trend"] = "Mandi → Teji" if e.detail == "North → South" else "Teji → Mandi"
+            else:
+                entry["declination"] = round(e.value, 4)
+            events.append(entry)
+    events.sort(key=lambda e: e["jd"])
+    return events
+
+
+def build_declination_table(date_from, date_to, planets=None, index: EventIndex = declination_index):
+    """Precompute the table for a span, e.g. at deploy time."""
+    for name in planets or PLANETS:
+        index.ensure(name, _day_jd(date_from), _day_jd(date_to) + 1)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the Shar Parivartan crossing table.")
+    parser.add_argument("--from", dest="start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", required=True, help="YYYY-MM-DD")
+    args = parser.parse_args()
+    build_declination_table(datetime.datetime.strptime(args.start, "%Y-%m-%d"),
+                            datetime.datetime.strptime(args.end, "%Y-%m-%d"))
+    ephemeris.shutdown()
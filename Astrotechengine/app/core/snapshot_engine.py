@@ -0,0 +1,132 @@
+"""
+Sky Snapshot Engine — one shared position set per time bucket.
+
+Every real-time router needs the same planetary positions for "now".
+Instead of each request running swiss_engine.get_planetary_positions(),
+the snapshot provider computes the full set (D1, D9, nakshatra, tithi,
+speed, declination) once per SNAPSHOT_BUCKET_SECONDS bucket and serves
+that same snapshot to every caller.
+
+Snapshots are immutable; raw() and planets() hand out copies, so a caller
+editing its result cannot leak into another request. The computation runs
+on the ephemeris executor and is single-flight: every caller arriving at a
+bucket boundary, sync (current) or async (acurrent), waits on the same
+pending future instead of starting its own.
+"""
+
+import asyncio
+import copy
+import datetime
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+import pytz
+
+from .config import SNAPSHOT_BUCKET_SECONDS, TIMEZONE
+from .ephemeris_executor import ephemeris, timed
+from .swiss_engine import get_planetary_positions
+
+
+@dataclass(frozen=True)
+class SkySnapshot:
+    bucket: int                     # epoch seconds at the start of the bucket
+    at: datetime.datetime           # bucket start in TIMEZONE; positions are for this instant
+    computed_in: float              # seconds spent computing
+    _positions: Dict = field(repr=False)
+
+    def raw(self) -> Dict:
+        """Copy of the swiss_engine-shaped {planet: {"D1": ..., "D9": ...}} dict."""
+        return copy.deepcopy(self._positions)
+
+    def planets(self) -> Dict:
+        """Flat {planet: {degree, rashi, ...}} dict in the shape the scoring engines take."""
+        planets = {}
+        for name, data in self._positions.items():
+            planets[name] = {
+                "degree": data["D1"]["longitude"],
+                "rashi": data["D1"]["rashi"],
+                "retrograde": data["D1"]["retrograde"],
+                "speed": data["D1"]["speed"],
+                "nakshatra": data["D1"]["nakshatra"],
+                "declination": data["D1"]["declination"],
+                "d9_rashi": data["D9"]["navansh_rashi"],
+            }
+        return planets
+
+
+class SnapshotProvider:
+    def __init__(self, bucket_seconds: int = SNAPSHOT_BUCKET_SECONDS,
+                 compute: Callable = get_planetary_positions,
+                 clock: Callable[[], float] = time.time):
+        self.bucket_seconds = bucket_seconds
+        self._compute = compute
+        self._clock = clock
+        self._tz = pytz.timezone(TIMEZONE)
+        self._lock = threading.RLock()
+        self._current: Optional[SkySnapshot] = None
+        self._pending: Dict[int, Future] = {}
+        self.computations = 0
+
+    def bucket_for(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds) * self.bucket_seconds
+
+    def _fresh(self, bucket: int) -> Optional[SkySnapshot]:
+        snapshot = self._current
+        if snapshot is not None and snapshot.bucket == bucket:
+            return snapshot
+        return None
+
+    def _request(self, bucket: int) -> Future:
+        """Future for this bucket's snapshot; starts the computation only once."""
+        with self._lock:
+            snapshot = self._fresh(bucket)
+            if snapshot is not None:
+                done = Future()
+                done.set_result(snapshot)
+                return done
+            pending = self._pending.get(bucket)
+            if pending is None:
+                pending = Future()
+                self._pending[bucket] = pending
+                at = datetime.datetime.fromtimestamp(bucket, self._tz)
+                job = ephemeris.submit(timed, self._compute, at)
+                job.add_done_callback(lambda j: self._finish(bucket, at, j, pending))
+            return pending
+
+    def _finish(self, bucket: int, at: datetime.datetime, job: Future, pending: Future):
+        with self._lock:
+            self._pending.pop(bucket, None)
+            error = job.exception()
+            if error is None:
+                positions, elapsed = job.result()
+                snapshot = SkySnapshot(bucket, at, elapsed, positions)
+                self.computations += 1
+                if self._current is None or bucket >= self._current.bucket:
+                    self._current = snapshot
+        if error is not None:
+            pending.set_exception(error)
+        else:
+            pending.set_result(snapshot)
+
+    def current(self) -> SkySnapshot:
+        bucket = self.bucket_for(self._clock())
+        return self._fresh(bucket) or self._request(bucket).result()
+
+    async def acurrent(self) -> SkySnapshot:
+        bucket = self.bucket_for(self._clock())
+        return self._fresh(bucket) or await asyncio.wrap_future(self._request(bucket))
+
+    def stats(self) -> Dict:
+        snapshot = self._current
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "computations": self.computations,
+            "current_at": snapshot.at.isoformat() if snapshot else None,
+            "computed_in": round(snapshot.computed_in, 6) if snapshot else None,
+        }
+
+
+sky_snapshot = SnapshotProvider()
@@ -0,0 +1,149 @@
+"""
+Station Engine — exact stationary-retrograde and stationary-direct times.
+
+Elsewhere retrograde is the sign of the instantaneous speed, which says
+nothing about when the motion turned or will turn. Here the longitudinal
+speed of Mercury through Saturn is sampled daily and every sign change is
+root-found, giving each station to the second. Stations are kept in an
+EventIndex ("station"), first built over STATION_TABLE_PAST_DAYS /
+STATION_TABLE_FUTURE_DAYS around the first lookup and extended on demand,
+so "days to next station" is a bisect.
+"""
+
+import datetime
+import math
+from typing import Optional
+
+import pytz
+import swisseph as swe
+
+from .config import STATION_TABLE_FUTURE_DAYS, STATION_TABLE_PAST_DAYS, TIMEZONE
+from .ephemeris_executor import ephemeris
+from .event_index import EventIndex, IndexedEvent
+from .root_finder import datetime_from_jd, find_root, jd_from_datetime
+
+STATION_PLANETS = {
+    "mercury": swe.MERCURY,
+    "venus": swe.VENUS,
+    "mars": swe.MARS,
+    "jupiter": swe.JUPITER,
+    "saturn": swe.SATURN,
+}
+STATION_TABLE_VERSION = 1
+_FLAGS = swe.FLG_SIDEREAL | swe.FLG_SPEED
+# Longest gap between stations is Mars, about 2 years
+_HORIZON_DAYS = 1000
+
+
+def _lon_speed(jd: float, pid: int) -> tuple:
+    data = swe.calc_ut(jd, pid, _FLAGS)[0]
+    return data[0] % 360.0, data[3]
+
+
+def _station_events(name: str, start_jd: float, end_jd: float) -> list:
+    """Stations of one planet in [start_jd, end_jd) as (jd, kind, longitude, "") tuples."""
+    pid = STATION_PLANETS[name]
+    count = max(1, math.ceil(end_jd - start_jd))
+    times = [start_jd + i * (end_jd - start_jd) / count for i in range(count + 1)]
+    speeds = [_lon_speed(t, pid)[1] for t in times]
+    events = []
+    for t0, t1, v0, v1 in zip(times, times[1:], speeds, speeds[1:]):
+        if (v0 > 0) == (v1 > 0):
+            continue
+        jd = find_root(lambda t: _lon_speed(t, pid)[1], t0, t1, v0, v1)
+        if start_jd <= jd < end_jd:
+            kind = "station_retrograde" if v0 > 0 else "station_direct"
+            events.append((jd, kind, _lon_speed(jd, pid)[0], ""))
+    return events
+
+
+station_index = EventIndex("station", _station_events, STATION_TABLE_VERSION)
+
+
+def _ensure_span(name: str, jd: float, index: EventIndex):
+    if index.coverage(name) is None:
+        index.ensure(name, jd - STATION_TABLE_PAST_DAYS, jd + STATION_TABLE_FUTURE_DAYS)
+
+
+def _describe(event: Optional[IndexedEvent], jd: float, tz) -> Optional[dict]:
+    if event is None:
+        return None
+    return {
+        "type": "retrograde" if event.kind == "station_retrograde" else "direct",
+        "time": datetime_from_jd(event.jd, tz).strftime("%Y-%m-%d %H:%M:%S"),
+        "longitude": round(event.value, 4),
+        "rashi": int(event.value // 30) + 1,
+        "days": round(abs(event.jd - jd), 2),
+    }
+
+
+def station_status(name: str, when: datetime.datetime = None,
+                   index: EventIndex = station_index) -> dict:
+    """
+    Motion of one planet at an instant (naive = IST) from its stations:
+    retrograde, the previous and next station, and days_to_next_station.
+    """
+    if name not in STATION_PLANETS:
+        raise ValueError(f"No stations for '{name}'; use one of {', '.join(STATION_PLANETS)}")
+    tz = pytz.timezone(TIMEZONE)
+    if when is None:
+        when = datetime.datetime.now(tz)
+    elif when.tzinfo is None:
+        when = tz.localize(when)
+    jd = jd_from_datetime(when)
+    _ensure_span(name, jd, index)
+    previous = index.previous_event(name, jd, lookback_days=_HORIZON_DAYS)
+    following = index.next_event(name, jd, horizon_days=_HORIZON_DAYS)
+    return {
+        "planet": name,
+        "retrograde": previous is not None and previous.kind == "station_retrograde",
+        "previous_station": _describe(previous, jd, tz),
+        "next_station": _describe(following, jd, tz),
+        "days_to_next_station": round(following.jd - jd, 2) if following else None,
+    }
+
+
+def _ist_days(date_from: datetime.date, date_to: datetime.date) -> tuple:
+    """[start_jd, end_jd) of the IST days date_from to date_to inclusive."""
+    tz = pytz.timezone(TIMEZONE)
+    start_jd = jd_from_datetime(tz.localize(datetime.datetime.combine(date_from, datetime.time())))
+    end_jd = jd_from_datetime(tz.localize(datetime.datetime.combine(date_to, datetime.time()))) + 1
+    return start_jd, end_jd
+
+
+def station_calendar(date_from: datetime.date, date_to: datetime.date, planets=None,
+                     index: EventIndex = station_index) -> list:
+    """Every station from date_from to date_to (inclusive, IST days), in time order."""
+    unknown = [p for p in planets or [] if p not in STATION_PLANETS]
+    if unknown:
+        raise ValueError(f"Unknown planet(s): {', '.join(unknown)}")
+    tz = pytz.timezone(TIMEZONE)
+    start_jd, end_jd = _ist_days(date_from, date_to)
+    events = []
+    for name in planets or STATION_PLANETS:
+        for e in index.between(name, start_jd, end_jd):
+            events.append({"planet": name, "jd": e.jd, **_describe(e, e.jd, tz)})
+    for e in events:
+        del e["days"]
+    events.sort(key=lambda e: e["jd"])
+    return events
+
+
+def build_station_table(date_from: datetime.date, date_to: datetime.date,
+                        index: EventIndex = station_index):
+    """Precompute stations for a span of IST days, e.g. at deploy time; covers what station_calendar asks for."""
+    start, end = _ist_days(date_from, date_to)
+    for name in STATION_PLANETS:
+        index.ensure(name, start, end)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the station table.")
+    parser.add_argument("--from", dest="start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", required=True, help="YYYY-MM-DD")
+    args = parser.parse_args()
+    build_station_table(datetime.datetime.strptime(args.start, "%Y-%m-%d").date(),
+                        datetime.datetime.strptime(args.end, "%Y-%m-%d").date())
+    ephemeris.shutdown()
@@ -1,5 +1,6 @@
 import swisseph as swe
 import datetime
+import math
 import pytz
 from .config import MUMBAI_LAT, MUMBAI_LON, TIMEZONE
 from .nakshatra_engine import calculate_nakshatra
@@ -46,39 +47,41 @@ def calculate_navansh(longitude):
     navansh_rashi = (((d1_rashi - 1) * 9 + pada_index) % 12) + 1
     return navansh_rashi
 
+def _declination(tropical_long, latitude, obliquity):
+    """Ecliptic (tropical longitude, latitude) to declination, all in degrees."""
+    lam, beta, eps = math.radians(tropical_long), math.radians(latitude), math.radians(obliquity)
+    return math.degrees(math.asin(
+        math.sin(beta) * math.cos(eps) + math.cos(beta) * math.sin(eps) * math.sin(lam)
+    ))
+
 def get_planetary_positions(dt=None):
     if dt is None:
         dt = get_mumbai_datetime()
     jd = swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute/60)
-    positions = {}
-    sun_long = None
-    moon_long = None
     # Sidereal flag for Lahiri ayanamsha
     flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
-    # First pass: get Sun and Moon longitude for Tithi (use tropical for tithi)
-    for name, pid in PLANETS.items():
-        data = swe.calc_ut(jd, pid, flags)
-        longitude = data[0][0]
-        if longitude < 0:
-            longitude += 360
-        if name == "sun":
-            sun_long = longitude
-        if name == "moon":
-            moon_long = longitude
-    # Second pass: build positions with nakshatra and tithi
-    for name, pid in PLANETS.items():
-        data = swe.calc_ut(jd, pid, flags)
-        longitude = data[0][0]
+    # One ephemeris call per planet; declination comes from the same ecliptic
+    # position via the ayanamsa and true obliquity instead of a second call
+    data = {name: swe.calc_ut(jd, pid, flags)[0] for name, pid in PLANETS.items()}
+    ayanamsa = swe.get_ayanamsa_ut(jd)
+    # ECL_NUT: (true obliquity, mean obliquity, nutation in longitude, ...)
+    obliquity, _, nutation = swe.calc_ut(jd, swe.ECL_NUT)[0][:3]
+    sun_long = data["sun"][0] % 360
+    moon_long = data["moon"][0] % 360
+    positions = {}
+    for name, xx in data.items():
+        longitude = xx[0]
         if longitude < 0:
             longitude += 360
-        speed = data[0][3]
+        speed = xx[3]
         rashi = int(longitude // 30) + 1
         degree_in_rashi = longitude % 30
         retrograde = speed < 0
         navansh_rashi = calculate_navansh(longitude)
         nakshatra = calculate_nakshatra(longitude)
+        declination = _declination(longitude + ayanamsa + nutation, xx[1], obliquity)
         tithi = None
-        if sun_long is not None and moon_long is not None and name in ("sun", "moon"):
+        if name in ("sun", "moon"):
             tithi = calculate_tithi(sun_long, moon_long)
         # Format degree as DD:MM:SS
         deg_int = int(degree_in_rashi)
@@ -96,7 +99,8 @@ def get_planetary_positions(dt=None):
                 "retrograde": retrograde,
                 "speed": round(speed, 6),
                 "nakshatra": nakshatra,
-                "tithi": tithi if tithi is not None else "-"
+                "tithi": tithi if tithi is not None else "-",
+                "declination": round(declination, 4),
             },
             "D9": {
                 "navansh_rashi": navansh_rashi,
@@ -0,0 +1,317 @@
+"""
+Vector Scoring Engine — final_score for many timestamps at once.
+
+final_score takes one planet dict and runs the rules in Python, building
+detail strings on the way. Here the planets of T timestamps are held as
+columns (T × planets arrays of degree, rashi, nakshatra, retrograde, speed
+and D9 rashi) and every rule is an array expression over them: the
+exaltation / own / friend / debilitation tables, nakshatra and weekday
+lookups become small index tables, aspects, combustion and tithi are
+computed on whole columns. rule_scores returns the unweighted T × rules
+matrix in RULE_WEIGHTS order; score_columns adds the weighted totals and
+trend labels.
+
+Given the same planet dicts, results equal scoring_engine.final_score
+exactly, rule by rule. Detail strings, alerts and the Budh station lead
+are scalar-only.
+"""
+
+import datetime
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from . import config
+from .config import (
+    AGNI_RASHI, ASPECT_ORB, ASPECT_SCORES, BENEFIC_PLANETS, COMBUST_DEGREES,
+    DAY_PLANET_MAP, DEBILITATION, EXALTATION, JALTARVA_RASHI, MALEFIC_PLANETS,
+    MANDI_RASHI, MOON_COMBUST_BIG_MOVE_SCORE, MOON_MANDI_NAKSHATRAS,
+    MOON_TEJI_NAKSHATRAS, NAKSHATRA_SPAN, PLANET_FRIEND_SIGN, PLANET_OWN_SIGN,
+    PURNIMA_AMAVASYA_SCORE, SURYA_TEJI_NAKSHATRAS, TEJI_RASHI, TITHI_SPAN,
+)
+from .ephemeris_executor import ephemeris
+from .nakshatra_engine import NAKSHATRA_LORDS, calculate_nakshatra
+from .scoring_engine import RULE_WEIGHTS, trend_label
+from .swiss_engine import PLANETS, calculate_navansh
+
+CHUNK_TIMES = 2000
+FIELDS = ("degree", "rashi", "nakshatra", "retrograde", "speed", "d9_rashi")
+# Index tables run to 29 so a degree rounded up to 360.0 (nakshatra 28) stays in range
+_RASHI_SLOTS = 14
+_NAKSHATRA_SLOTS = 29
+
+
+@dataclass
+class PlanetColumns:
+    """Planet positions of T timestamps as T × len(names) arrays, plus the weekday of each."""
+    names: Tuple[str, ...]
+    degree: np.ndarray
+    rashi: np.ndarray
+    nakshatra: np.ndarray
+    retrograde: np.ndarray
+    speed: np.ndarray
+    d9_rashi: np.ndarray
+    weekday: np.ndarray             # 0 = Monday
+
+    def __len__(self) -> int:
+        return len(self.weekday)
+
+    def column(self, field: str, name: str) -> np.ndarray:
+        return getattr(self, field)[:, self.names.index(name)]
+
+
+def columns_from_planets(planets: Sequence[dict], times: Sequence[datetime.datetime]) -> PlanetColumns:
+    """Stack final_score-shaped planet dicts (all with the same planets) into columns."""
+    names = tuple(planets[0]) if planets else tuple(PLANETS)
+    cols = {f: np.array([[p[name][f] for name in names] for p in planets]).reshape(len(planets), len(names))
+            for f in FIELDS}
+    return PlanetColumns(names=names, weekday=np.array([t.weekday() for t in times], dtype=np.int64),
+                         **cols)
+
+
+def planet_columns(times: Sequence[datetime.datetime]) -> PlanetColumns:
+    """
+    Columns for each time, equal to scoring_planets(get_planetary_positions(t))
+    (wall clock as UT, degree rounded to 4 places) without building the
+    per-time dicts; run on the ephemeris executor.
+    """
+    flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
+    names = tuple(PLANETS)
+    n, p = len(times), len(names)
+    degree, speed = np.empty((n, p)), np.empty((n, p))
+    rashi, nakshatra, d9 = (np.empty((n, p), dtype=np.int64) for _ in range(3))
+    retrograde = np.empty((n, p), dtype=bool)
+    for i, at in enumerate(times):
+        jd = swe.julday(at.year, at.month, at.day, at.hour + at.minute / 60)
+        for j, pid in enumerate(PLANETS.values()):
+            xx = swe.calc_ut(jd, pid, flags)[0]
+            longitude = xx[0] + 360 if xx[0] < 0 else xx[0]
+            degree[i, j] = round(longitude, 4)
+            rashi[i, j] = int(longitude // 30) + 1
+            nakshatra[i, j] = calculate_nakshatra(longitude)
+            d9[i, j] = calculate_navansh(longitude)
+            retrograde[i, j] = xx[3] < 0
+            speed[i, j] = round(xx[3], 6)
+    return PlanetColumns(names, degree, rashi, nakshatra, retrograde, speed, d9,
+                         np.array([t.weekday() for t in times], dtype=np.int64))
+
+
+def concat_columns(parts: Sequence[PlanetColumns]) -> PlanetColumns:
+    """Join column chunks in order; an empty list gives zero rows."""
+    if not parts:
+        return planet_columns([])
+    return PlanetColumns(parts[0].names, weekday=np.concatenate([c.weekday for c in parts]),
+                         **{f: np.concatenate([getattr(c, f) for c in parts]) for f in FIELDS})
+
+
+# ═══════════════════════════════════════════════════════════════
+# LOOKUP TABLES
+# ═══════════════════════════════════════════════════════════════
+
+def _membership(values, slots: int) -> np.ndarray:
+    table = np.zeros(slots)
+    table[list(values)] = 1
+    return table
+
+
+@lru_cache(maxsize=8)
+def _planet_tables(names: Tuple[str, ...]) -> dict:
+    """Per-planet (planets × rashi) score tables and per-planet vectors for one column layout."""
+    power = np.zeros((len(names), _RASHI_SLOTS))
+    info = np.zeros((len(names), _RASHI_SLOTS))
+    debilitated = np.zeros((len(names), _RASHI_SLOTS), dtype=bool)
+    for j, p in enumerate(names):
+        for r in range(1, 13):
+            # Rule 5: exalted / own / friend / debilitated, first match wins
+            if EXALTATION.get(p) == r:
+                power[j, r] = 2
+            elif r in PLANET_OWN_SIGN.get(p, []):
+                power[j, r] = 1
+            elif r in PLANET_FRIEND_SIGN.get(p, []):
+                power[j, r] = 0.5
+            elif DEBILITATION.get(p) == r:
+                power[j, r] = -2
+            # Rule 11: exalted / debilitated benefics and malefics
+            sign = -1 if p in BENEFIC_PLANETS else 1 if p in MALEFIC_PLANETS else 0
+            if EXALTATION.get(p) == r:
+                info[j, r] += sign
+            if DEBILITATION.get(p) == r:
+                info[j, r] -= 0.5 * sign
+            debilitated[j, r] = DEBILITATION.get(p) == r
+
+    def vector(fn):
+        return np.array([fn(p) for p in names], dtype=float)
+
+    return {
+        "power": power,
+        "info": info,
+        "debilitated": debilitated,
+        # Benefic first, as in the scalar rules' if / elif
+        "sign": vector(lambda p: -1 if p in BENEFIC_PLANETS else 1 if p in MALEFIC_PLANETS else 0),
+        "orb": vector(lambda p: np.nan if p in ("sun", "rahu", "ketu") else COMBUST_DEGREES.get(p, np.nan)),
+        "not_luminary": vector(lambda p: p not in ("sun", "moon")),
+        "viprit": vector(lambda p: p not in ("sun", "rahu", "ketu")).astype(bool),
+        "not_moon": vector(lambda p: p != "moon"),
+        "pap_malefic": vector(lambda p: p in MALEFIC_PLANETS).astype(bool),
+    }
+
+
+def _day_lord_table() -> np.ndarray:
+    """(weekday × nakshatra) True where the nakshatra lord rules the day."""
+    table = np.zeros((7, _NAKSHATRA_SLOTS), dtype=bool)
+    for day in range(7):
+        for nak, lord in NAKSHATRA_LORDS.items():
+            table[day, nak] = lord.lower() == DAY_PLANET_MAP.get(day, "sun")
+    return table
+
+
+_TARVA = _membership(AGNI_RASHI, _RASHI_SLOTS) - _membership(
+    set(JALTARVA_RASHI) - set(AGNI_RASHI), _RASHI_SLOTS)
+_MOON_NAK = 2 * (_membership(MOON_TEJI_NAKSHATRAS, _NAKSHATRA_SLOTS) - _membership(
+    set(MOON_MANDI_NAKSHATRAS) - set(MOON_TEJI_NAKSHATRAS), _NAKSHATRA_SLOTS))
+_SURYA_NAK = np.where(_membership(SURYA_TEJI_NAKSHATRAS, _NAKSHATRA_SLOTS) > 0, 2.0, -1.0)
+_MOON_RASHI = _membership(TEJI_RASHI, _RASHI_SLOTS) - _membership(
+    set(MANDI_RASHI) - set(TEJI_RASHI), _RASHI_SLOTS)
+_DAY_LORD = _day_lord_table()
+
+
+# ═══════════════════════════════════════════════════════════════
+# RULES
+# ═══════════════════════════════════════════════════════════════
+
+def _separation(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    diff = np.abs(a - b)
+    return np.minimum(diff, 360 - diff)
+
+
+def _aspect_scores(diff: np.ndarray) -> np.ndarray:
+    """calculate_aspect()["score"] for separations; the first matching aspect wins."""
+    out = np.zeros(diff.shape)
+    done = np.zeros(diff.shape, dtype=bool)
+    for angle, score in ASPECT_SCORES.items():
+        hit = ~done & (np.abs(diff - angle) <= ASPECT_ORB)
+        out[hit] = score
+        done |= hit
+    return out
+
+
+def rule_scores(cols: PlanetColumns) -> np.ndarray:
+    """Unweighted scores, T × len(RULE_WEIGHTS), columns in RULE_WEIGHTS order."""
+    t = _planet_tables(cols.names)
+    deg = cols.degree
+    rows = np.arange(deg.shape[1])
+    sun, moon = deg[:, cols.names.index("sun")], deg[:, cols.names.index("moon")]
+    sun_sep = _separation(deg, sun[:, None])
+    moon_sep = _separation(deg, moon[:, None])
+    combust = sun_sep <= t["orb"]                       # NaN orb → never combust
+    retro = cols.retrograde.astype(bool)
+    debilitated = t["debilitated"][rows, cols.rashi]
+    mercury = cols.names.index("mercury")
+    out = np.zeros((len(cols), len(RULE_WEIGHTS)))
+
+    # 1: SBC vedh on the Moon's nakshatra
+    naks = np.floor(deg / NAKSHATRA_SPAN).astype(np.int64) + 1
+    vedh = (naks == naks[:, [cols.names.index("moon")]]) * t["not_moon"]
+    out[:, 0] = (vedh * 3 * t["sign"]).sum(axis=1)
+
+    # 2: drishti on Sun and Moon
+    strength = np.abs(_aspect_scores(sun_sep)) + np.abs(_aspect_scores(moon_sep))
+    out[:, 1] = (strength * t["sign"] * t["not_luminary"]).sum(axis=1)
+
+    # 3: Agni / Jal tarva rashi of Moon and Sun
+    out[:, 2] = _TARVA[cols.column("rashi", "moon")] + _TARVA[cols.column("rashi", "sun")]
+
+    # 4: Moon (±2) and Sun (±1) nakshatra tendency
+    out[:, 3] = _MOON_NAK[cols.column("nakshatra", "moon")] + _MOON_NAK[cols.column("nakshatra", "sun")] / 2
+
+    # 5: planet power
+    out[:, 4] = t["power"][rows, cols.rashi].sum(axis=1)
+
+    # 6: Sun / Moon at 0° of their rashi
+    moon_zero, sun_zero = moon % 30 < 1.0, sun % 30 < 1.0
+    out[:, 5] = -3.0 * moon_zero - 2.0 * sun_zero - 2.0 * (moon_zero & sun_zero)
+
+    # 7: Paap Khatri — two malefics within 10° of the Moon, reversed by Budh
+    near = moon_sep < 10
+    active = (near & t["pap_malefic"]).sum(axis=1) >= 2
+    out[:, 6] = np.where(active, np.where(near[:, mercury], -3.0, 3.0), 0.0)
+
+    # 8: Budh ka Yog (no station lead)
+    merc_retro = retro[:, mercury]
+    merc_sep = _separation(deg, deg[:, [mercury]])
+    budh = 4.0 * (merc_retro & combust[:, mercury]) - 2.0 * ~merc_retro + 3.0 * (sun_sep[:, mercury] < 1)
+    for p in ("jupiter", "venus"):
+        if p in cols.names:
+            budh += 2.0 * (merc_sep[:, cols.names.index(p)] < 5)
+    out[:, 7] = budh
+
+    # 9: Surya nakshatra sheet
+    out[:, 8] = _SURYA_NAK[cols.column("nakshatra", "sun")]
+
+    # 10: Moon's nakshatra lord rules the weekday
+    out[:, 9] = 3.0 * _DAY_LORD[cols.weekday, cols.column("nakshatra", "moon")]
+
+    # 11: planet info
+    out[:, 10] = t["info"][rows, cols.rashi].sum(axis=1)
+
+    # 12: Viprit Raj Yog and reversals, first match wins
+    viprit = np.select(
+        [combust & debilitated, combust & retro, retro & debilitated, combust, debilitated],
+        [4.0, 2.0, 2.0, -1.0, -1.0], 0.0)
+    out[:, 11] = (viprit * t["viprit"]).sum(axis=1)
+
+    # 13: Purnima / Amavasya and Moon combust
+    tithi = np.floor((moon - sun) % 360 / TITHI_SPAN).astype(np.int64) + 1
+    out[:, 12] = (PURNIMA_AMAVASYA_SCORE * ((tithi == 15) | (tithi == 30))
+                  + MOON_COMBUST_BIG_MOVE_SCORE * combust[:, cols.names.index("moon")])
+
+    # Legacy Moon rashi and D1 == D9 barguttam
+    moon_rashi = cols.column("rashi", "moon")
+    out[:, 13] = _MOON_RASHI[moon_rashi]
+    out[:, 14] = 3.0 * (moon_rashi == cols.column("d9_rashi", "moon"))
+    return out
+
+
+def current_weights() -> np.ndarray:
+    return np.array([getattr(config, name) for name in RULE_WEIGHTS.values()], dtype=float)
+
+
+def score_columns(cols: PlanetColumns, weights: np.ndarray = None) -> dict:
+    """
+    final_score for every row: "raw" and "weighted" (T × rules), "score"
+    (rounded totals) and "trend" labels. weights default to config.py.
+    """
+    raw = rule_scores(cols)
+    weights = current_weights() if weights is None else np.asarray(weights, dtype=float)
+    weighted = raw * weights
+    # Summed rule by rule, as final_score does, so float totals match to the bit
+    total = np.zeros(len(cols))
+    for j in range(weighted.shape[1]):
+        total = total + weighted[:, j]
+    scores = [round(s, 2) for s in total.tolist()]
+    return {
+        "rules": list(RULE_WEIGHTS),
+        "raw": raw,
+        "weighted": weighted,
+        "score": np.array(scores),
+        "trend": [trend_label(s) for s in scores],
+    }
+
+
+def score_times(times: Sequence[datetime.datetime], weights: np.ndarray = None,
+                executor=ephemeris, chunk: int = CHUNK_TIMES,
+                weekdays: Sequence[int] = None) -> dict:
+    """
+    score_columns for a list of times. The ephemeris calls dominate, so
+    the columns are built in chunks on the executor and scored in one pass.
+    weekdays overrides the day-of-week rule's weekday of each time.
+    """
+    times = list(times)
+    jobs = [executor.submit(planet_columns, times[i:i + chunk]) for i in range(0, len(times), chunk)]
+    cols = concat_columns([job.result() for job in jobs])
+    if weekdays is not None:
+        cols.weekday = np.asarray(weekdays, dtype=np.int64)
+    return score_columns(cols, weights)
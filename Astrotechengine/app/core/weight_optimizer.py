@@ -0,0 +1,256 @@
+"""
+Weight Optimizer — search config.py rule weights and trend thresholds.
+
+final_score is a weighted sum of independent rule scores, so once the
+unweighted scores are in a ScoreMatrix (backtest_engine.build_score_matrix)
+any weight vector is scored as raw @ w: a whole batch of candidates is one
+matrix product, with no astrology recomputed.
+
+Each candidate is a weight per rule plus a (TREND_TEJI, TREND_MANDI) pair:
+the position is +1 on bars scoring ≥ TREND_TEJI, −1 on bars ≤ TREND_MANDI,
+and flat otherwise. Candidates are ranked on the first (1 − holdout) of the
+bars by the chosen objective and re-measured on the held-out tail:
+
+  sharpe       annualised mean / std of position × return (default)
+  hit_rate     share of non-flat bars whose direction was right
+  mean_return  average position × return per bar
+
+Searches: "random" (random weight vectors from a value grid, fanned out
+over a process pool) and "coordinate" (coordinate descent from the
+current config weights). export_config writes a candidate back into
+config.py.
+"""
+
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import config
+from .backtest_engine import ScoreMatrix
+from .scoring_engine import RULE_WEIGHTS
+
+OBJECTIVES = ("sharpe", "hit_rate", "mean_return")
+WEIGHT_VALUES = (0.0, 0.5, 1.0, 1.5, 2.0)
+THRESHOLD_PAIRS = tuple((t, -t) for t in (1.0, 2.0, 3.0, 4.0, 6.0, 8.0))
+MIN_COVERAGE = 0.1
+BATCH_SIZE = 2000
+_PERIODS_PER_YEAR = 252
+
+
+@dataclass
+class Candidate:
+    weights: Dict[str, float]          # config name -> value
+    teji: float
+    mandi: float
+    train: Dict[str, float]
+    test: Dict[str, float]
+
+    def as_dict(self) -> dict:
+        return {"weights": self.weights, "thresholds": thresholds_for(self.teji, self.mandi),
+                "train": self.train, "test": self.test}
+
+
+def thresholds_for(teji: float, mandi: float) -> Dict[str, float]:
+    """Trend thresholds to export; the very-strong levels keep config's ratio to TREND_TEJI / TREND_MANDI."""
+    return {
+        "TREND_VERY_STRONG_TEJI": round(teji * config.TREND_VERY_STRONG_TEJI / config.TREND_TEJI, 4),
+        "TREND_TEJI": teji,
+        "TREND_VERY_STRONG_MANDI": round(mandi * config.TREND_VERY_STRONG_MANDI / config.TREND_MANDI, 4),
+        "TREND_MANDI": mandi,
+    }
+
+
+def current_weights(rules: Sequence[str]) -> np.ndarray:
+    return np.array([getattr(config, RULE_WEIGHTS[r]) for r in rules], dtype=float)
+
+
+# ═══════════════════════════════════════════════════════════════
+# EVALUATION
+# ═══════════════════════════════════════════════════════════════
+
+def evaluate(raw: np.ndarray, returns: np.ndarray, weights: np.ndarray,
+             teji: float, mandi: float) -> Dict[str, np.ndarray]:
+    """Metrics for a batch of weight vectors (k × rules) at one threshold pair; each value has shape (k,)."""
+    scores = raw @ weights.T
+    position = (scores >= teji).astype(np.int8) - (scores <= mandi).astype(np.int8)
+    pnl = position * returns[:, None]
+    active = position != 0
+    n_active = active.sum(axis=0)
+    right = (position * np.sign(returns)[:, None] > 0).sum(axis=0)
+    mean = pnl.mean(axis=0)
+    std = pnl.std(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(_PERIODS_PER_YEAR), 0.0)
+        hit_rate = np.where(n_active > 0, right / n_active, 0.0)
+    return {"sharpe": sharpe, "hit_rate": hit_rate, "mean_return": mean,
+            "coverage": n_active / len(returns)}
+
+
+def _objective(metrics: Dict[str, np.ndarray], objective: str, min_coverage: float) -> np.ndarray:
+    return np.where(metrics["coverage"] >= min_coverage, metrics[objective], -np.inf)
+
+
+def _rank_batch(raw, returns, weights, thresholds, objective, min_coverage, top) -> List[tuple]:
+    """Best (value, weight row, threshold pair) of one batch across all threshold pairs."""
+    best = []
+    for teji, mandi in thresholds:
+        values = _objective(evaluate(raw, returns, weights, teji, mandi), objective, min_coverage)
+        for i in np.argsort(values)[::-1][:top]:
+            if np.isfinite(values[i]):
+                best.append((float(values[i]), weights[i].copy(), (teji, mandi)))
+    best.sort(key=lambda c: c[0], reverse=True)
+    return best[:top]
+
+
+def _random_batch(raw, returns, values, count, seed, thresholds, objective, min_coverage, top):
+    rng = np.random.default_rng(seed)
+    weights = rng.choice(np.asarray(values, dtype=float), size=(count, raw.shape[1]))
+    return _rank_batch(raw, returns, weights, thresholds, objective, min_coverage, top)
+
+
+# ═══════════════════════════════════════════════════════════════
+# SEARCH
+# ═══════════════════════════════════════════════════════════════
+
+def _split(matrix: ScoreMatrix, mode: str, holdout: float) -> Tuple[np.ndarray, ...]:
+    returns = matrix.returns(mode)
+    valid = ~np.isnan(returns)
+    raw, returns = matrix.raw[valid], returns[valid]
+    cut = int(len(returns) * (1 - holdout))
+    if cut < 2 or (holdout > 0 and len(returns) - cut < 2):
+        raise ValueError("Not enough bars for this holdout")
+    return raw[:cut], returns[:cut], raw[cut:], returns[cut:]
+
+
+def _metrics_row(raw, returns, weights, teji, mandi) -> Dict[str, float]:
+    if len(returns) == 0:
+        return {}
+    metrics = evaluate(raw, returns, weights[None, :], teji, mandi)
+    return {k: round(float(v[0]), 6) for k, v in metrics.items()}
+
+
+def random_search(raw, returns, samples, values, thresholds, objective, min_coverage, top,
+                  workers: int = 1, seed: int = 0) -> List[tuple]:
+    batches = [(min(BATCH_SIZE, samples - i), seed + n) for n, i in enumerate(range(0, samples, BATCH_SIZE))]
+    args = (thresholds, objective, min_coverage, top)
+    if workers > 1:
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            parts = list(pool.map(_random_batch, *zip(*[(raw, returns, values, count, s, *args)
+                                                          for count, s in batches])))
+    else:
+        parts = [_random_batch(raw, returns, values, count, s, *args) for count, s in batches]
+    found = [c for part in parts for c in part]
+    found.sort(key=lambda c: c[0], reverse=True)
+    return found[:top]
+
+
+def coordinate_descent(raw, returns, start, values, thresholds, objective, min_coverage, top,
+                       rounds: int = 3) -> List[tuple]:
+    """Improve one weight at a time over the value grid, all thresholds per step."""
+    values = np.asarray(values, dtype=float)
+    best = _rank_batch(raw, returns, start[None, :], thresholds, objective, min_coverage, 1)
+    current = start.copy() if not best else best[0][1]
+    seen = list(best)
+    for _ in range(rounds):
+        improved = False
+        for j in range(raw.shape[1]):
+            trial = np.repeat(current[None, :], len(values), axis=0)
+            trial[:, j] = values
+            ranked = _rank_batch(raw, returns, trial, thresholds, objective, min_coverage, top)
+            seen.extend(ranked)
+            if ranked and (not best or ranked[0][0] > best[0][0] + 1e-12):
+                best = ranked[:1]
+                current = ranked[0][1]
+                improved = True
+        if not improved:
+            break
+    unique = {}
+    for value, w, pair in sorted(seen, key=lambda c: c[0], reverse=True):
+        unique.setdefault((tuple(w), pair), (value, w, pair))
+    return list(unique.values())[:top]
+
+
+def optimize(matrix: ScoreMatrix, method: str = "random", objective: str = "sharpe",
+             returns: str = "open_close", samples: int = 20000,
+             values: Sequence[float] = WEIGHT_VALUES,
+             thresholds: Sequence[Tuple[float, float]] = THRESHOLD_PAIRS,
+             min_coverage: float = MIN_COVERAGE, holdout: float = 0.3, top: int = 10,
+             workers: int = 1, seed: int = 0) -> List[Candidate]:
+    """Ranked weight sets and thresholds for a ScoreMatrix, best first."""
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {', '.join(OBJECTIVES)}")
+    train_raw, train_ret, test_raw, test_ret = _split(matrix, returns, holdout)
+    if method == "random":
+        ranked = random_search(train_raw, train_ret, samples, values, thresholds, objective,
+                               min_coverage, top, workers, seed)
+    elif method == "coordinate":
+        ranked = coordinate_descent(train_raw, train_ret, current_weights(matrix.rules), values,
+                                    thresholds, objective, min_coverage, top)
+    else:
+        raise ValueError("method must be 'random' or 'coordinate'")
+
+    return [
+        Candidate(
+            weights={RULE_WEIGHTS[r]: float(w) for r, w in zip(matrix.rules, weights)},
+            teji=teji, mandi=mandi,
+            train=_metrics_row(train_raw, train_ret, weights, teji, mandi),
+            test=_metrics_row(test_raw, test_ret, weights, teji, mandi),
+        )
+        for _, weights, (teji, mandi) in ranked
+    ]
+
+
+# ═══════════════════════════════════════════════════════════════
+# EXPORT
+# ═══════════════════════════════════════════════════════════════
+
+def config_values(candidate: Candidate) -> Dict[str, float]:
+    return {**candidate.weights, **thresholds_for(candidate.teji, candidate.mandi)}
+
+
+def export_config(candidate: Candidate, path: Optional[str] = None) -> str:
+    """Rewrite the WEIGHT_* and TREND_* assignments in config.py (comments kept); returns the new text."""
+    path = path or config.__file__
+    with open(path) as fh:
+        text = fh.read()
+    for name, value in config_values(candidate).items():
+        text, count = re.subn(rf"^({name}\s*=\s*)[-+0-9.eE]+", rf"\g<1>{value:g}", text, flags=re.M)
+        if count != 1:
+            raise ValueError(f"{name} not found exactly once in {path}")
+    with open(path, "w") as fh:
+        fh.write(text)
+    return text
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from .backtest_engine import DEFAULT_SESSION_TIME, RETURN_MODES, build_score_matrix
+    from .ephemeris_executor import ephemeris
+
+    parser = argparse.ArgumentParser(description="Optimise rule weights and trend thresholds.")
+    parser.add_argument("path", help="OHLC CSV (or Parquet) as for backtest_engine")
+    parser.add_argument("--session-time", default=DEFAULT_SESSION_TIME)
+    parser.add_argument("--returns", choices=RETURN_MODES, default="open_close")
+    parser.add_argument("--method", choices=("random", "coordinate"), default="random")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="sharpe")
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--holdout", type=float, default=0.3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--write-config", action="store_true", help="write the best candidate into config.py")
+    args = parser.parse_args()
+
+    matrix = build_score_matrix(args.path, args.session_time,
+                                workers=args.workers if args.workers > 1 else None)
+    ranked = optimize(matrix, args.method, args.objective, args.returns, args.samples,
+                      holdout=args.holdout, top=args.top, workers=args.workers)
+    print(json.dumps([c.as_dict() for c in ranked], indent=2))
+    if args.write_config and ranked:
+        export_config(ranked[0])
+    ephemeris.shutdown()
@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from app.core.ephemeris_executor import ephemeris
 from app.api import (
     astro,
     nakshatra,
@@ -13,6 +14,11 @@ from app.api import (
     predict,
     sbc,
     rashi_parivartan,
+    kp,
+    aspects,
+    shar_parivartan,
+    panchang,
+    stations,
 )
 
 app = FastAPI(
@@ -35,6 +41,16 @@ app.include_router(navansh.router)
 app.include_router(predict.router)
 app.include_router(sbc.router)
 app.include_router(rashi_parivartan.router)
+app.include_router(kp.router)
+app.include_router(aspects.router)
+app.include_router(shar_parivartan.router)
+app.include_router(panchang.router)
+app.include_router(stations.router)
+
+
+@app.on_event("shutdown")
+def shutdown_ephemeris():
+    ephemeris.shutdown()
 
 
 @app.get("/")
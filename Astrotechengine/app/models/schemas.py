@@ -2,7 +2,7 @@
 Request / Response models for all API endpoints.
 """
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 # --- Shared ---
@@ -60,3 +60,19 @@ class NavanshRequest(BaseModel):
 class NavanshResponse(BaseModel):
     barguttam: bool
     score: int
+
+
+# --- KP ---
+class SubLordBatchRequest(BaseModel):
+    longitudes: List[float]
+
+
+class SubLordResponse(BaseModel):
+    longitude: float
+    division: int
+    start: float
+    end: float
+    sign_lord: str
+    star_lord: str
+    sub_lord: str
+    sub_sub_lord: str
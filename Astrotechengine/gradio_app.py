@@ -5,7 +5,7 @@ Each button fetches and displays data from a separate engine module.
 import gradio as gr
 import json
 import datetime
-from app.core.swiss_engine import get_planetary_positions
+from app.core.snapshot_engine import sky_snapshot
 from app.core.nakshatra_engine import calculate_nakshatra
 from app.core.tithi_engine import calculate_tithi, is_purnima, is_amavasya
 from app.core.rashi_engine import get_rashi_type, rashi_score, is_jaltarva, is_agni
@@ -22,11 +22,11 @@ from app.core.nakshatra_engine import calculate_nakshatra
 from app.core.rashi_parivartan_engine import calculate_rashi_parivartan
 from app.core.shar_parivartan_engine import calculate_shar_parivartan
 from app.core.kp_engine import calculate_kp_intraday
-from app.core.aspect_advanced_engine import calculate_daily_aspects
+from app.core.aspect_calendar_engine import aspects_for_day
 
 
 def _get_raw():
-    return get_planetary_positions()
+    return sky_snapshot.current().raw()
 
 
 def _flat(raw):
@@ -575,12 +575,12 @@ def btn_aspects_advanced(date_str: str = None):
     else:
         d = _dt.datetime.now()
 
-    aspects = calculate_daily_aspects(date=d)
+    aspects = aspects_for_day(d)
 
     html = []
     html.append('<div style="font-family:Segoe UI,system-ui,sans-serif;">')
     html.append(f'<h3 style="margin:0 0 4px 0;">🔭 Advanced Aspect Engine — {d.strftime("%d %b %Y")}</h3>')
-    html.append(f'<p style="margin:0 0 8px 0;font-size:12px;color:#666;">{len(aspects)} aspects found (orb ≤1°, 10-min scan)</p>')
+    html.append(f'<p style="margin:0 0 8px 0;font-size:12px;color:#666;">{len(aspects)} aspects found (orb ≤1°, exact times)</p>')
 
     if not aspects:
         html.append('<p style="color:#888;font-size:14px;">No aspects found for this date.</p></div>')
@@ -651,7 +651,7 @@ def btn_aspects_advanced(date_str: str = None):
         '<span style="background:#27ae60;color:#fff;padding:1px 6px;border-radius:3px;">+ Bullish</span> '
         '<span style="background:#e74c3c;color:#fff;padding:1px 6px;border-radius:3px;">– Bearish</span> '
         '<span style="background:#f39c12;color:#fff;padding:1px 6px;border-radius:3px;">Jay Rule</span> &nbsp;|&nbsp; '
-        '● = ongoing at end of day &nbsp;|&nbsp; Special = Mars/Jupiter/Saturn special drishti'
+        '● = ongoing past midnight &nbsp;|&nbsp; Special = Mars/Jupiter/Saturn special drishti'
     )
     html.append('</div></div>')
     return "\n".join(html)
@@ -0,0 +1,11 @@
+import pytest
+
+from app.core.ephemeris_executor import EphemerisExecutor
+
+
+@pytest.fixture
+def executor():
+    """Serial in-process ephemeris executor, shut down after the test."""
+    executor = EphemerisExecutor(workers=0)
+    yield executor
+    executor.shutdown()
@@ -0,0 +1,39 @@
+"""
+Tests: the vectorised aspect matcher reproduces the per-sample loop exactly.
+"""
+import random
+from datetime import datetime, timedelta
+
+from app.core.aspect_advanced_engine import (
+    IST, PLANETS, _check_aspects, _get_nakshatra, _match_aspects,
+)
+
+
+def _snapshot(lons: dict) -> dict:
+    return {
+        name: {"lon": lon, "lat": 0.1, "sign": int(lon // 30) + 1,
+               "retrograde": False, "nakshatra": _get_nakshatra(lon)}
+        for name, lon in lons.items()
+    }
+
+
+def _reference(timestamps, snapshots, orb):
+    state, results = {}, []
+    for t, snap in zip(timestamps, snapshots):
+        _check_aspects(snap, t, state, results, orb)
+    return results + list(state.values())
+
+
+def test_matcher_matches_loop():
+    rng = random.Random(3)
+    start = datetime(2026, 2, 25, tzinfo=IST)
+    timestamps = [start + timedelta(minutes=10 * i) for i in range(144)]
+    lons = {name: rng.uniform(0, 360) for name in PLANETS}
+    speeds = {name: rng.uniform(-3, 15) for name in PLANETS}   # fast enough to hit many edges
+    snapshots = []
+    for _ in timestamps:
+        snapshots.append(_snapshot(lons))
+        lons = {name: (lon + speeds[name] / 144) % 360 for name, lon in lons.items()}
+
+    for orb in (0.5, 1.0, 4.0):
+        assert _match_aspects(timestamps, snapshots, orb) == _reference(timestamps, snapshots, orb)
@@ -0,0 +1,67 @@
+"""
+Tests: the aspect event index stitches blocks into whole events.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from app.core.aspect_advanced_engine import IST
+from app.core.aspect_calendar_engine import aspect_calendar, aspects_for_day
+from app.core.aspect_event_engine import find_aspect_windows
+from app.core.result_store import ResultStore
+
+
+def test_day_by_day_index_matches_one_pass(executor):
+    one_pass, daily = ResultStore(":memory:"), ResultStore(":memory:")
+    whole = aspect_calendar(date(2026, 3, 1), date(2026, 3, 4), store=one_pass, executor=executor)
+    for day in (4, 2, 1, 3):
+        aspect_calendar(date(2026, 3, day), date(2026, 3, day), store=daily, executor=executor)
+    stitched = aspect_calendar(date(2026, 3, 1), date(2026, 3, 4), store=daily, executor=executor)
+
+    assert stitched["computed_days"] == 0
+    assert stitched["events"] == whole["events"]
+
+    direct = executor.run_sync(find_aspect_windows, datetime(2026, 3, 1, tzinfo=IST),
+                               datetime(2026, 3, 5, tzinfo=IST))["aspects"]
+    assert [(a["Planet 1"], a["Planet 2"], a["Target Angle"], a["Start Time"].strftime("%Y-%m-%d %H:%M:%S"))
+            for a in direct] == \
+        [(e["planet_1"], e["planet_2"], e["target"], e["start"]) for e in whole["events"]]
+    # Something in orb across midnight is reported once, not per day
+    assert any(e["start"][:10] != e["end"][:10] and not e["start_open"] for e in whole["events"])
+
+
+def test_filters_and_day_view(executor):
+    store = ResultStore(":memory:")
+    moon = aspect_calendar(date(2026, 3, 1), date(2026, 3, 2), planet="Moon", signal="Buy",
+                           store=store, executor=executor)
+    assert moon["events"] and all("Moon" in (e["planet_1"], e["planet_2"]) and e["signal"] == "Buy"
+                                  for e in moon["events"])
+
+    day = aspects_for_day(datetime(2026, 3, 2), store=store, executor=executor)
+    assert day and {"start_str", "end_str", "Nature", "Signal", "ongoing"} <= set(day[0])
+
+
+class _BarrierExecutor:
+    """Holds each submit until every caller has planned its blocks, as concurrent requests would."""
+
+    def __init__(self, inner, parties):
+        self.inner = inner
+        self.barrier = threading.Barrier(parties)
+
+    def submit(self, func, *args, **kwargs):
+        self.barrier.wait(timeout=30)
+        return self.inner.submit(func, *args, **kwargs)
+
+
+def test_concurrent_requests_index_a_day_once(executor, tmp_path):
+    single = aspect_calendar(date(2026, 3, 1), date(2026, 3, 1), store=ResultStore(":memory:"),
+                             executor=executor)
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    racing = _BarrierExecutor(executor, 2)
+    with ThreadPoolExecutor(2) as pool:
+        results = list(pool.map(lambda _: aspect_calendar(date(2026, 3, 1), date(2026, 3, 1),
+                                                          store=store, executor=racing), range(2)))
+    store.close()
+
+    assert sorted(r["computed_days"] for r in results) == [0, 1]
+    assert all(r["events"] == single["events"] for r in results)
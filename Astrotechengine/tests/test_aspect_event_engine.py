@@ -0,0 +1,41 @@
+"""
+Tests: exact aspect windows against a fine-grained run of the sampled scan.
+"""
+from datetime import datetime
+
+from app.core.aspect_advanced_engine import IST, _get_positions, _separation, calculate_daily_aspects
+from app.core.aspect_event_engine import calculate_daily_aspects_exact, target_levels
+
+
+def _key(r):
+    return r["Planet 1"], r["Planet 2"], r["Target Angle"]
+
+
+def test_target_levels():
+    assert target_levels(0, 1.0) == ([1.0, 359.0], [0])
+    assert target_levels(180, 1.0) == ([179.0, 181.0], [180])
+    assert target_levels(240, 1.0) == ([], [])
+
+
+def test_exact_windows_match_fine_scan():
+    day = datetime(2026, 2, 25)
+    exact = calculate_daily_aspects_exact(day)
+    fine = calculate_daily_aspects(day, interval_minutes=2)
+
+    assert sorted(map(_key, exact)) == sorted(map(_key, fine))
+    by_key = {_key(r): r for r in fine}
+    for r in exact:
+        f = by_key[_key(r)]
+        assert (r["Nature"], r["Signal"], r["Victory"]) == (f["Nature"], f["Signal"], f["Victory"])
+        # The 2-minute scan sees an entry or exit up to one step late
+        assert 0 <= (f["Start Time"] - r["Start Time"]).total_seconds() <= 120
+        if not f["ongoing"]:
+            assert 0 <= (f["End Time"] - r["End Time"]).total_seconds() <= 120
+
+
+def test_perfection_is_exact():
+    for r in calculate_daily_aspects_exact(datetime(2026, 2, 25)):
+        if r["Perfection Time"] is not None:
+            pos = _get_positions(r["Perfection Time"].astimezone(IST))
+            sep = _separation(pos[r["Planet 1"]]["lon"], pos[r["Planet 2"]]["lon"])
+            assert abs(sep - r["Target Angle"]) < 0.001
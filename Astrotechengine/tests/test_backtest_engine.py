@@ -0,0 +1,89 @@
+"""
+Tests: the backtest replays final_score and reports consistent metrics.
+"""
+import csv
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.core import backtest_engine
+from app.core.backtest_engine import load_ohlc, run_backtest
+from app.core.scoring_engine import final_score, scoring_planets
+from app.core.swiss_engine import get_planetary_positions
+from app.core.vector_scoring_engine import FIELDS, columns_from_planets, planet_columns
+
+
+def _write_bars(path, start, days):
+    rng = np.random.default_rng(7)
+    price = 40000.0
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["Date", "Open", "High", "Low", "Close"])
+        for i in range(days):
+            day = start + timedelta(days=i)
+            if day.weekday() >= 5:
+                continue
+            close = price * (1 + rng.normal(0, 0.01))
+            writer.writerow([day.isoformat(), round(price, 2), round(max(price, close) + 50, 2),
+                             round(min(price, close) - 50, 2), round(close, 2)])
+            price = close
+
+
+def _reference(times):
+    expected = columns_from_planets([scoring_planets(get_planetary_positions(at)) for at in times], times)
+    return expected, planet_columns(times)
+
+
+def test_fast_positions_match_swiss_engine(executor):
+    expected, fast = executor.run_sync(_reference, [datetime(2012, 6, 4, 9, 15), datetime(2024, 12, 31, 15, 30)])
+    assert fast.names == expected.names
+    for field in FIELDS:
+        assert np.array_equal(getattr(fast, field), getattr(expected, field))
+
+
+def test_midnight_date_column_gets_session_time(monkeypatch):
+    # A Parquet datetime64 date column arrives as midnight datetimes, in CSV as "... 00:00:00"
+    ohlc = {"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": 1.5}
+    monkeypatch.setattr(backtest_engine, "_rows", lambda path: [
+        {"Date": datetime(2020, 1, 2), **ohlc},
+        {"Date": "2020-01-03 00:00:00", **ohlc},
+        {"Date": "2020-01-06 10:30:00", **ohlc},
+        {"Datetime": datetime(2020, 1, 7), **ohlc},
+    ])
+    assert [b["time"] for b in load_ohlc("bars.parquet", "09:15")] == [
+        datetime(2020, 1, 2, 9, 15), datetime(2020, 1, 3, 9, 15),
+        datetime(2020, 1, 6, 10, 30), datetime(2020, 1, 7, 0, 0),
+    ]
+
+
+def test_parquet_daily_bars_match_csv(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "bars.csv"
+    _write_bars(path, date(2024, 1, 1), 10)
+    frame = pd.read_csv(path, parse_dates=["Date"])
+    frame.to_parquet(tmp_path / "bars.parquet")
+    assert load_ohlc(str(tmp_path / "bars.parquet")) == load_ohlc(str(path))
+
+
+def test_backtest_replays_final_score(tmp_path, executor):
+    path = tmp_path / "banknifty.csv"
+    _write_bars(path, date(2024, 1, 1), 120)
+    bars = load_ohlc(str(path), "09:15")
+    assert bars[0]["time"] == datetime(2024, 1, 1, 9, 15)
+
+    report = run_backtest(str(path), executor=executor)
+    assert report["bars"] == len(bars)
+
+    scores = [executor.run_sync(lambda at: final_score(scoring_planets(get_planetary_positions(at)), at=at)["score"], b["time"])
+              for b in bars]
+    returns = np.array([b["close"] / b["open"] - 1 for b in bars])
+    signal = [(s, r) for s, r in zip(scores, returns) if s != 0 and r != 0]
+    assert report["signals"] == len(signal)
+    assert report["hit_rate"] == round(np.mean([np.sign(s) == np.sign(r) for s, r in signal]), 4)
+    assert sum(b["bars"] for b in report["buckets"].values()) == len(bars)
+    assert "10_Day_Nakshatra" in report["rule_correlation"]
+
+    # close_close drops the first bar, which has no previous close
+    assert run_backtest(bars, returns="close_close", executor=executor)["bars"] == len(bars) - 1
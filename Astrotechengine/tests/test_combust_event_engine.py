@@ -0,0 +1,51 @@
+"""
+Tests: exact combustion windows agree with is_combust.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+import swisseph as swe
+
+from app.core.combust_engine import is_combust
+from app.core.combust_event_engine import (
+    COMBUST_PLANETS, _combust_events, combustion_status, combustion_windows,
+)
+from app.core.event_index import EventIndex
+from app.core.result_store import ResultStore
+from app.core.root_finder import SECOND
+
+
+@pytest.fixture
+def index(executor):
+    return EventIndex("combustion-test", _combust_events, store=ResultStore(":memory:"), executor=executor)
+
+
+def _combust_at(name, jd):
+    flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+    return is_combust(name, swe.calc_ut(jd, COMBUST_PLANETS[name], flags)[0][0],
+                      swe.calc_ut(jd, swe.SUN, flags)[0][0])
+
+
+def test_window_edges_match_is_combust(executor, index):
+    windows = combustion_windows(date(2025, 10, 1), date(2025, 12, 31), ["mercury", "moon", "venus"], index=index)
+    assert [(w["start"][:10], w["end"][:10]) for w in windows if w["planet"] == "mercury"] == [
+        ("2025-08-30", "2025-10-01"), ("2025-11-14", "2025-11-26"), ("2025-12-30", "2026-02-08"),
+    ]
+    for w in windows:
+        for jd, inside in ((w["start_jd"] - 60 * SECOND, False), (w["start_jd"] + 60 * SECOND, True),
+                           (w["end_jd"] - 60 * SECOND, True), (w["end_jd"] + 60 * SECOND, False)):
+            assert executor.run_sync(_combust_at, w["planet"], jd) is inside
+
+
+def test_status_hours(index):
+    windows = combustion_windows(date(2025, 11, 1), date(2025, 11, 30), ["mercury"], index=index)
+    window = windows[0]
+    calls = index.finder_calls
+
+    start = datetime.strptime(window["start"], "%Y-%m-%d %H:%M:%S")
+    before = combustion_status("mercury", start - timedelta(hours=10), index=index)
+    assert not before["combust"] and abs(before["hours_until"] - 10) < 0.01
+    during = combustion_status("mercury", start + timedelta(hours=30), index=index)
+    assert during["combust"] and abs(during["hours_into"] - 30) < 0.01
+    assert during["until"] == window["end"]
+    assert index.finder_calls == calls
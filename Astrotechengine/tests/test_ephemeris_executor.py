@@ -0,0 +1,70 @@
+"""
+Tests: ephemeris executor keeps sidereal settings per config under concurrency.
+"""
+import asyncio
+
+import swisseph as swe
+
+from app.core.ephemeris_executor import EphemerisConfig, EphemerisExecutor, ephemeris
+
+JD = 2461096.5
+LAHIRI = EphemerisConfig(sid_mode=swe.SIDM_LAHIRI)
+RAMAN = EphemerisConfig(sid_mode=swe.SIDM_RAMAN)
+
+
+def _expected(config):
+    swe.set_sid_mode(config.sid_mode)
+    value = swe.get_ayanamsa_ut(JD)
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    return value
+
+
+async def _interleaved(executor):
+    jobs = [executor.run(swe.get_ayanamsa_ut, JD, config=LAHIRI if i % 2 else RAMAN)
+            for i in range(40)]
+    return await asyncio.gather(*jobs)
+
+
+def _check(executor):
+    lahiri, raman = _expected(LAHIRI), _expected(RAMAN)
+    try:
+        results = asyncio.run(_interleaved(executor))
+    finally:
+        executor.shutdown()
+    assert lahiri != raman
+    assert results == [lahiri if i % 2 else raman for i in range(40)]
+
+
+def test_serial_mode_applies_config_per_job():
+    _check(EphemerisExecutor(workers=0))
+
+
+def test_process_pool_per_config():
+    executor = EphemerisExecutor(workers=2)
+    _check(executor)
+    assert executor.stats()["jobs"] == 40
+
+
+def _nested(jd):
+    """Job that runs an inline job under another config, then reads its own."""
+    inner = ephemeris.run_sync(swe.get_ayanamsa_ut, jd, config=RAMAN)
+    return inner, swe.get_ayanamsa_ut(jd)
+
+
+def _check_nested(executor):
+    lahiri, raman = _expected(LAHIRI), _expected(RAMAN)
+    try:
+        nested = executor.run_sync(_nested, JD, config=LAHIRI)
+        after = executor.run_sync(swe.get_ayanamsa_ut, JD, config=LAHIRI)
+    finally:
+        executor.shutdown()
+    assert nested == (raman, lahiri)
+    assert after == lahiri
+
+
+def test_nested_job_restores_outer_config_serial():
+    _check_nested(EphemerisExecutor(workers=0))
+
+
+def test_nested_job_restores_outer_config_in_worker():
+    _check_nested(EphemerisExecutor(workers=1))
@@ -0,0 +1,40 @@
+"""
+Tests: event index lookups are not blocked by a build in progress.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.event_index import EventIndex
+from app.core.result_store import ResultStore
+
+started, release = threading.Event(), threading.Event()
+
+
+def _daily_events(body, start_jd, end_jd):
+    if start_jd >= 10:
+        started.set()
+        release.wait(timeout=30)
+    return [(float(jd), "tick") for jd in range(int(start_jd), int(end_jd))]
+
+
+def test_lookup_during_long_build():
+    started.clear()
+    release.clear()
+    with ThreadPoolExecutor(2) as pool:
+        index = EventIndex("tick-test", _daily_events, store=ResultStore(":memory:"), executor=pool)
+        index.ensure("x", 0, 10)
+        building = pool.submit(index.between, "x", 0, 20)
+        assert started.wait(timeout=30)
+
+        # Answered from the covered span while the [10, 20) finder is still waiting
+        found = []
+        lookup = threading.Thread(target=lambda: found.extend(index.between("x", 2, 5)))
+        lookup.start()
+        lookup.join(timeout=5)
+        assert [e.jd for e in found] == [2.0, 3.0, 4.0]
+        assert not building.done()
+
+        release.set()
+        assert [e.jd for e in building.result(timeout=30)] == [float(jd) for jd in range(20)]
+    assert index.coverage("x") == (0, 20)
+    assert index.finder_calls == 2
@@ -0,0 +1,66 @@
+"""
+Tests: incremental rescoring equals final_score and reports changed rules.
+"""
+from datetime import datetime, timedelta
+
+from app.core.aspect_engine import calculate_aspect
+from app.core.incremental_scoring_engine import IncrementalScorer, _ASPECT_EDGES, _aspect_zone
+from app.core.scoring_engine import RULES, final_score, scoring_planets
+from app.core.swiss_engine import get_planetary_positions
+
+
+def _ticks(start, minutes, step):
+    times = [start + timedelta(minutes=m) for m in range(0, minutes, step)]
+    return times, [scoring_planets(get_planetary_positions(t)) for t in times]
+
+
+def test_ticks_equal_final_score(executor):
+    # Two days around a new moon, a weekday change and the Moon's rashi change
+    times, skies = executor.run_sync(_ticks, datetime(2024, 3, 9, 12, 0), 60 * 48, 2)
+    scorer = IncrementalScorer()
+    for at, planets in zip(times, skies):
+        result = scorer.score(planets, at=at, client="dashboard")
+        recomputed, changed = result.pop("recomputed_rules"), result.pop("changed_rules")
+        assert result == final_score(planets, at=at)
+        assert set(changed) <= set(recomputed)
+    stats = scorer.stats()
+    assert stats["ticks"] == len(times) and stats["reuse_rate"] > 0.8
+
+
+def test_first_tick_recomputes_everything_then_little(executor):
+    times, skies = executor.run_sync(_ticks, datetime(2025, 6, 2, 10, 0), 3, 1)
+    scorer = IncrementalScorer()
+    first = scorer.score(skies[0], at=times[0], client="a")
+    assert first["recomputed_rules"] == first["changed_rules"] == [name for name, _ in RULES]
+    again = scorer.score(skies[0], at=times[0], client="a")
+    assert again["recomputed_rules"] == [] and again["changed_rules"] == []
+    # A new weekday reruns the day rule and nothing that only reads positions
+    later = scorer.score(skies[0], at=times[0] + timedelta(days=1), client="a")
+    assert later["recomputed_rules"] == ["10_Day_Nakshatra"]
+
+
+def test_changed_rules_are_per_client(executor):
+    (before, after), skies = executor.run_sync(_ticks, datetime(2025, 6, 2, 10, 0), 24 * 60 + 1, 24 * 60)
+    scorer = IncrementalScorer(max_clients=2)
+    scorer.score(skies[0], at=before, client="a")
+    scorer.score(skies[0], at=before, client="b")
+    # a polls first after the sky moves; b, polling next, must still see the changes
+    seen_by_a = scorer.score(skies[1], at=after, client="a")["changed_rules"]
+    seen_by_b = scorer.score(skies[1], at=after, client="b")
+    assert seen_by_a and seen_by_b["recomputed_rules"] == []
+    assert seen_by_b["changed_rules"] == seen_by_a
+    assert scorer.score(skies[1], at=after, client="a")["changed_rules"] == []
+    # No token, or a token pushed out of the LRU: every rule is listed
+    everything = [name for name, _ in RULES]
+    assert scorer.score(skies[1], at=after)["changed_rules"] == everything
+    scorer.score(skies[1], at=after, client="c")
+    assert scorer.score(skies[1], at=after, client="b")["changed_rules"] == everything
+    assert scorer.stats()["clients"] == 2
+
+
+def test_aspect_zone_implies_same_aspect():
+    points = sorted({e + d for e in _ASPECT_EDGES for d in (-0.3, -1e-12, 0.0, 1e-12, 0.3)} | {0.0, 180.0})
+    points = [p for p in points if 0 <= p <= 180]
+    for a, b in zip(points, points[1:]):
+        if _aspect_zone(a) == _aspect_zone(b):
+            assert calculate_aspect(a, 0)["score"] == calculate_aspect(b, 0)["score"]
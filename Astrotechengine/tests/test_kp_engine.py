@@ -0,0 +1,72 @@
+"""
+Tests: KP division table against the original per-call dasha walk.
+"""
+import random
+from datetime import datetime
+
+import swisseph as swe
+from fastapi.testclient import TestClient
+
+from app.core.kp_engine import (
+    DASHA_ORDER, DASHA_YEARS, IST, KP_SLOT_FIELDS, KP_TABLE, NAK_ARCMIN, NAK_DEG,
+    NAKSHATRA_LORDS, SUB_SUB_STARTS, KPSlotContext, _sub_lord, calculate_kp_intraday,
+    calculate_kp_scan, kp_lords, kp_lords_batch, sub_lords,
+)
+from app.main import app
+
+
+def _walk_sub_lord(deg: float) -> str:
+    # The pre-table implementation of _sub_lord
+    nak = int(deg // NAK_DEG)
+    offset = (deg - nak * NAK_DEG) * 60
+    idx = DASHA_ORDER.index(NAKSHATRA_LORDS[nak])
+    total = 0.0
+    for i in range(9):
+        lord = DASHA_ORDER[(idx + i) % 9]
+        total += NAK_ARCMIN * DASHA_YEARS[lord] / 120.0
+        if offset <= total:
+            return lord
+    return lord
+
+
+def test_table_covers_the_zodiac():
+    assert len(KP_TABLE) == 249 and len(SUB_SUB_STARTS) == 2187
+    assert KP_TABLE[0].start == 0.0 and KP_TABLE[-1].end == 360.0
+    assert all(a.end == b.start for a, b in zip(KP_TABLE, KP_TABLE[1:]))
+
+
+def test_lookup_matches_dasha_walk():
+    rng = random.Random(7)
+    degs = [rng.uniform(0, 360) for _ in range(20000)]
+    assert [_sub_lord(d) for d in degs] == [_walk_sub_lord(d) for d in degs]
+    assert list(sub_lords(degs)) == [_sub_lord(d) for d in degs]
+    assert kp_lords_batch(degs[:50]) == [kp_lords(d) for d in degs[:50]]
+
+
+def test_sublord_endpoints():
+    client = TestClient(app)
+    one = client.get("/kp/sublord", params={"lon": 0.5}).json()
+    assert one["sub_lord"] == "Ketu" and one["sub_sub_lord"] == "Jupiter"
+    batch = client.post("/kp/sublord/batch", json={"longitudes": [0.5, 725.0]}).json()
+    assert batch[0] == one and batch[1]["longitude"] == 5.0
+
+
+def test_slot_context_computes_each_body_once(monkeypatch):
+    calls = []
+    calc_ut = swe.calc_ut
+    monkeypatch.setattr(swe, "calc_ut", lambda *a: calls.append(a[1]) or calc_ut(*a))
+    for minute in range(0, 60, 5):
+        calls.clear()
+        KPSlotContext(datetime(2026, 2, 25, 10, minute, tzinfo=IST)).slot()
+        assert len(calls) == len(set(calls)) <= 6
+
+
+def test_scan_window_and_structured_output():
+    date = datetime(2026, 2, 25, tzinfo=IST)
+    window = calculate_kp_intraday(date, 15, start="10:00", end="11:00")
+    assert [s["time"] for s in window] == ["10:00", "10:15", "10:30", "10:45", "11:00"]
+
+    scan = calculate_kp_scan(date, days=2, step_minutes=15, start="10:00", end="11:00")
+    assert scan.shape == (10,) and scan["date"][-1] == "2026-02-26"
+    assert [scan[f][:5].tolist() for f in KP_SLOT_FIELDS] == \
+        [[s[f] for s in window] for f in KP_SLOT_FIELDS]
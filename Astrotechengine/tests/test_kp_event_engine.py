@@ -0,0 +1,42 @@
+"""
+Tests: exact KP timeline agrees with the per-slot KP calculation.
+"""
+from datetime import datetime, timedelta
+
+from app.core.kp_engine import IST, KP_BOUNDARIES, KP_SLOT_FIELDS, calculate_kp_slot
+from app.core.kp_event_engine import calculate_kp_timeline
+from app.core.root_finder import find_root
+
+
+def _seconds(hms: str) -> int:
+    h, m, s = map(int, hms.split(":"))
+    return h * 3600 + m * 60 + s
+
+
+def test_boundary_table_has_249_divisions():
+    assert len(KP_BOUNDARIES) == 249
+    assert KP_BOUNDARIES[0] == 0.0 and KP_BOUNDARIES[-1] < 360
+
+
+def test_find_root_stays_in_bracket():
+    root = find_root(lambda x: x ** 3 - 2, 0.0, 2.0, tol=1e-12)
+    assert abs(root - 2 ** (1 / 3)) < 1e-9
+
+
+def test_timeline_matches_slot_scan():
+    date = datetime(2026, 2, 25, tzinfo=IST)
+    timeline = calculate_kp_timeline(date)
+    intervals = timeline["intervals"]
+
+    assert intervals[0]["start"] == "09:00:00" and intervals[-1]["end"] == "15:30:00"
+    assert timeline["ephemeris_calls"] < 100
+
+    t = datetime(2026, 2, 25, 9, 0, 20, tzinfo=IST)
+    while t < datetime(2026, 2, 25, 15, 30, tzinfo=IST):
+        now = t.hour * 3600 + t.minute * 60 + t.second
+        span = next(iv for iv in intervals if _seconds(iv["start"]) <= now < _seconds(iv["end"]))
+        # Skip samples within rounding distance of an exact boundary
+        if now - _seconds(span["start"]) > 2 and _seconds(span["end"]) - now > 2:
+            slot = calculate_kp_slot(t)
+            assert {k: slot[k] for k in KP_SLOT_FIELDS} == {k: span[k] for k in KP_SLOT_FIELDS}, t
+        t += timedelta(seconds=97)
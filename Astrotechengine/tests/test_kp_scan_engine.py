@@ -0,0 +1,59 @@
+"""
+Tests: multi-day, multi-location KP scans and their result store.
+"""
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.core.kp_engine import calculate_kp_intraday
+from app.core.kp_scan_engine import resolve_location, scan_kp
+from app.core.result_store import ResultStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_scan_matches_intraday_and_is_served_from_store(store, executor):
+    first = scan_kp(date(2026, 3, 6), date(2026, 3, 9), ["NSE", "NYSE"], 60,
+                    store=store, executor=executor)
+    assert first["computed"] == 4 and first["cached"] == 0
+    assert [d["date"] for d in first["days"][:2]] == ["2026-03-06", "2026-03-09"]
+
+    nse = first["days"][0]["slots"]
+    # Reference runs on the executor too: swisseph settings are process-wide
+    assert nse == executor.run_sync(calculate_kp_intraday, datetime(2026, 3, 6), 60)
+    nyse = first["days"][2]["slots"]
+    assert nyse[0]["time"] == "09:30"
+    assert nyse == executor.run_sync(calculate_kp_intraday, datetime(2026, 3, 6), 60,
+                                     40.7069, -74.0113, "09:30", "16:00",
+                                     ZoneInfo("America/New_York"))
+
+    again = scan_kp(date(2026, 3, 6), date(2026, 3, 10), ["NSE", "NYSE"], 60,
+                    store=store, executor=executor)
+    assert again["cached"] == 4 and again["computed"] == 2
+    assert again["days"][0] == first["days"][0]
+
+
+def test_weekend_rows_and_location_limit(store, executor):
+    scan_kp(date(2026, 3, 6), date(2026, 3, 8), ["NSE"], 60, skip_weekends=False,
+            store=store, executor=executor)
+    weekdays = scan_kp(date(2026, 3, 6), date(2026, 3, 8), ["NSE", "nse"], 60,
+                       store=store, executor=executor)
+    assert [d["date"] for d in weekdays["days"]] == ["2026-03-06"]
+    assert weekdays["cached"] == 1 and weekdays["computed"] == 0
+
+    with pytest.raises(ValueError):
+        scan_kp(date(2026, 3, 6), date(2026, 3, 6), [f"{lat},77" for lat in range(9)], 60,
+                store=store, executor=executor)
+
+
+def test_resolve_location():
+    assert resolve_location("nse")["key"] == "NSE"
+    assert resolve_location("28.61, 77.21")["key"] == "28.6100,77.2100"
+    with pytest.raises(ValueError):
+        resolve_location("Atlantis")
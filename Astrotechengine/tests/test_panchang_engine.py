@@ -0,0 +1,64 @@
+"""
+Tests: panchang boundaries match a minute-by-minute scan and days are cached.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.nakshatra_engine import calculate_nakshatra
+from app.core.panchang_engine import (
+    IST, _sun_moon, clear_panchang_cache, panchang_at, panchang_timeline,
+)
+from app.core.root_finder import jd_from_datetime
+from app.core.tithi_engine import calculate_tithi
+
+
+@pytest.fixture(autouse=True)
+def fresh_panchang_cache():
+    clear_panchang_cache()
+    yield
+    clear_panchang_cache()
+
+
+def _minute_scan(start, minutes):
+    """(minute, tithi, nakshatra) wherever either changes, using the point-in-time engines."""
+    out, last = [], None
+    for m in range(minutes + 1):
+        sun, moon = _sun_moon(jd_from_datetime(start + timedelta(minutes=m)))
+        now = (calculate_tithi(sun, moon), calculate_nakshatra(moon % 360))
+        if last is not None and now != last:
+            out.append((m, *now))
+        last = now
+    return out
+
+
+def test_boundaries_match_minute_scan(executor):
+    start = datetime(2026, 3, 2, 9, 15, tzinfo=IST)
+    timeline = panchang_timeline(start, start + timedelta(days=2), executor=executor)
+    expected = executor.run_sync(_minute_scan, start, 2 * 1440)
+
+    found = [e for e in timeline["events"] if e["element"] in ("tithi", "nakshatra")]
+    assert len(found) == len(expected) > 0
+    for event, (minute, tithi, nak) in zip(found, expected):
+        at = datetime.strptime(event["time"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=IST)
+        # The scan notices a change in the minute after the exact boundary
+        assert timedelta(0) <= start + timedelta(minutes=minute) - at < timedelta(minutes=1)
+        assert event["to"] == (tithi if event["element"] == "tithi" else nak)
+
+    # Segments tile the range, including across midnight
+    for element in ("tithi", "nakshatra", "pada"):
+        segments = timeline[element]
+        assert segments[0]["start"] == timeline["start"] and segments[-1]["end"] == timeline["end"]
+        assert all(a["end"] == b["start"] for a, b in zip(segments, segments[1:]))
+
+
+def test_days_are_cached_and_valid_until_is_next_boundary(executor):
+    start = datetime(2026, 3, 2, 9, 15, tzinfo=IST)
+    timeline = panchang_timeline(start, start + timedelta(hours=6), executor=executor)
+    jobs = executor.jobs
+
+    now = panchang_at(start, executor=executor)
+    assert executor.jobs == jobs
+    assert now["valid_until"] == timeline["events"][0]["time"]
+    assert now["tithi"]["tithi"] == timeline["tithi"][0]["tithi"]
+    assert now["pada"]["pada"] == timeline["pada"][0]["pada"]
@@ -0,0 +1,69 @@
+"""
+Tests: predictions are deterministic per instant, memoized and match final_score.
+"""
+from datetime import datetime
+
+import pytest
+import pytz
+
+from app.core.prediction_engine import PredictionMemo, predict_at, predict_range
+from app.core.scoring_engine import final_score, scoring_planets
+from app.core.swiss_engine import get_planetary_positions
+
+
+def test_predict_at_is_final_score_and_memoized(executor):
+    memo = PredictionMemo()
+    at = datetime(2025, 3, 14, 9, 15, 42)
+    first = predict_at(at, executor=executor, memo=memo)
+    expected = executor.run_sync(lambda t: final_score(scoring_planets(get_planetary_positions(t)), at=t),
+                                 datetime(2025, 3, 14, 9, 15))
+    assert first["score"] == expected["score"] and first["trend"] == expected["trend"]
+    assert first["at"] == "2025-03-14T09:15:00+05:30"
+
+    first["breakdown"].clear()
+    again = predict_at(datetime(2025, 3, 14, 9, 15, 5), executor=executor, memo=memo)
+    assert again["breakdown"] and again["score"] == first["score"]
+    stats = memo.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_exchange_reads_local_time_and_weekday(executor):
+    memo = PredictionMemo()
+    # Monday 09:30 in New York (EDT) is Monday 19:00 IST
+    ny = predict_at(datetime(2025, 3, 17, 9, 30), exchange="NYSE", executor=executor, memo=memo)
+    ist = predict_at(pytz.timezone("Asia/Kolkata").localize(datetime(2025, 3, 17, 19, 0)),
+                     executor=executor, memo=memo)
+    assert ny["planets"] == ist["planets"]
+    assert memo.stats()["misses"] == 2
+    with pytest.raises(ValueError):
+        predict_at(datetime(2025, 3, 17), exchange="XXX", executor=executor, memo=memo)
+
+
+def test_range_matches_daily_points(executor):
+    memo = PredictionMemo()
+    result = predict_range(datetime(2025, 1, 1, 9, 15), datetime(2025, 1, 10, 9, 15),
+                           executor=executor, memo=memo)
+    assert len(result["points"]) == 10
+    for point in result["points"][::3]:
+        daily = predict_at(datetime.fromisoformat(point["at"]), executor=executor, memo=memo)
+        assert (point["score"], point["trend"]) == (daily["score"], daily["trend"])
+        assert point["rules"] == {k: v["score"] for k, v in daily["breakdown"].items()}
+
+    predict_range(datetime(2025, 1, 1, 9, 15), datetime(2025, 1, 10, 9, 15), executor=executor, memo=memo)
+    assert memo.stats()["hits"] == 1
+    with pytest.raises(ValueError):
+        predict_range(datetime(2025, 1, 2), datetime(2025, 1, 1), executor=executor, memo=memo)
+    with pytest.raises(ValueError, match="limit"):
+        predict_range(datetime(2025, 1, 1), datetime(2025, 1, 3), step_minutes=1, executor=executor, memo=memo)
+
+
+def test_memo_lru_and_ttl():
+    now = [0.0]
+    memo = PredictionMemo(maxsize=2, ttl_seconds=10, clock=lambda: now[0])
+    for key in ("a", "b", "a", "c"):
+        memo.get_or_compute(key, lambda: key)
+    assert memo.get_or_compute("b", lambda: "new") == "new"      # b was least recently used
+    now[0] = 11
+    assert memo.get_or_compute("b", lambda: "fresh") == "fresh"
+    stats = memo.stats()
+    assert (stats["evictions"], stats["expirations"], stats["hits"]) == (2, 1, 1)
@@ -0,0 +1,74 @@
+"""
+Tests: exact ingresses from the event index, including retrograde re-entries.
+"""
+from datetime import date, datetime
+
+import pytest
+import swisseph as swe
+
+from app.core.aspect_advanced_engine import IST
+from app.core.event_index import EventIndex
+from app.core.rashi_parivartan_engine import (
+    PLANETS, _ingress_events, calculate_rashi_parivartan, ingress_calendar,
+)
+from app.core.result_store import ResultStore
+from app.core.root_finder import jd_from_datetime
+
+
+@pytest.fixture
+def index(executor):
+    return EventIndex("ingress-test", _ingress_events, store=ResultStore(":memory:"), executor=executor)
+
+
+def _sign(jd, pid):
+    return int((swe.calc_ut(jd, pid, swe.FLG_SIDEREAL)[0][0] % 360) // 30) + 1
+
+
+def _hourly_sign_changes(name, start_jd, end_jd):
+    pid = PLANETS[name]
+    out = []
+    t, sign = start_jd, _sign(start_jd, pid)
+    while t + 1 / 24 < end_jd:
+        t += 1 / 24
+        new = _sign(t, pid)
+        if new != sign:
+            out.append((t, new))
+            sign = new
+    return out
+
+
+def test_ingresses_match_hourly_scan(executor, index):
+    # Mercury turns retrograde in Scorpio late in 2025 and slips back into Libra
+    events = ingress_calendar(date(2025, 10, 1), date(2025, 12, 31), ["mercury", "moon"], index=index)
+    mercury = [e for e in events if e["planet"] == "mercury"]
+    assert [(e["direction"], e["to_rashi_name"]) for e in mercury] == [
+        ("forward", "Libra"), ("forward", "Scorpio"), ("backward", "Libra"), ("forward", "Scorpio"), ("forward", "Sagittarius"),
+    ]
+    start = jd_from_datetime(datetime(2025, 10, 1, tzinfo=IST))
+    end = jd_from_datetime(datetime(2026, 1, 1, tzinfo=IST))
+    for name in ("mercury", "moon"):
+        found = [e for e in events if e["planet"] == name]
+        expected = executor.run_sync(_hourly_sign_changes, name, start, end)
+        assert [e["to_rashi"] for e in found] == [sign for _, sign in expected]
+        # The exact time lies within the hour before the scan noticed the change
+        assert all(0 <= t - e["jd"] < 1 / 24 for e, (t, _) in zip(found, expected))
+
+
+def test_next_change_uses_index_and_is_reused(index):
+    result = calculate_rashi_parivartan(datetime(2026, 2, 25, 10, 15), index=index)
+    # Jupiter is retrograde in Gemini, turns direct and enters Cancer; speed extrapolation said Taurus
+    assert result["jupiter"]["retrograde"]
+    assert result["jupiter"]["next_rashi_name"] == "Cancer"
+    assert result["jupiter"]["direction"] == "forward"
+
+    calls = index.finder_calls
+    assert calculate_rashi_parivartan(datetime(2026, 2, 25, 10, 15), index=index) == result
+    assert index.finder_calls == calls
+
+
+def test_countdown_agrees_with_calendar(index):
+    result = calculate_rashi_parivartan(datetime(2026, 2, 25, 10, 15), index=index)
+    moon = [e for e in ingress_calendar(date(2026, 2, 25), date(2026, 2, 27), ["moon"], index=index)
+            if e["time"] > "2026-02-25 10:15"][0]
+    assert result["moon"]["next_rashi_name"] == moon["to_rashi_name"] == "Gemini"
+    assert result["moon"]["estimated_change_date"] == moon["time"][:16]
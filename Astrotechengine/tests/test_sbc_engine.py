@@ -0,0 +1,87 @@
+"""
+Tests: compiled vedh masks reproduce the vedh tables; the timeline agrees with calculate_sbc.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.nakshatra_engine import calculate_nakshatra
+from app.core.sbc_engine import (
+    BAM_VEDH, DAKSHIN_VEDH, SAMUKH_VEDH, THREE_DIR_PLANETS, calculate_sbc, get_vedh_targets,
+    vedh_codes, vedh_on, vedh_scores, vedh_timeline,
+)
+from app.core.swiss_engine import get_planetary_positions
+from app.main import app
+
+PLANETS = ("sun", "moon", "mercury", "venus", "mars", "jupiter", "saturn", "rahu", "ketu")
+
+
+def _table_targets(nak, planet, retro):
+    if planet in THREE_DIR_PLANETS:
+        pairs = [(SAMUKH_VEDH, "Samukh"), (BAM_VEDH, "Bam"), (DAKSHIN_VEDH, "Dakshin")]
+    elif retro:
+        pairs = [(DAKSHIN_VEDH, "Dakshin (Retro)")]
+    else:
+        pairs = [(SAMUKH_VEDH, "Samukh")]
+    return [{"target": table[nak], "direction": name} for table, name in pairs if nak in table]
+
+
+def test_masks_reproduce_vedh_tables():
+    for nak in range(1, 28):
+        for planet in ("moon", "mars", "venus"):
+            for retro in (False, True):
+                assert get_vedh_targets(nak, planet, retro) == _table_targets(nak, planet, retro)
+
+
+def test_vectorized_vedh_matches_calculate_sbc():
+    rng = np.random.default_rng(4)
+    naks = rng.integers(1, 28, size=(2000, len(PLANETS)))
+    retro = rng.random((2000, len(PLANETS))) < 0.3
+    moon = PLANETS.index("moon")
+    codes = vedh_codes(PLANETS, naks, retro, naks[:, moon])
+    codes[:, moon] = 0
+    scores = vedh_scores(PLANETS, codes)
+    for row in range(0, 2000, 7):
+        planets = {p: {"degree": 0.0, "nakshatra": int(naks[row, j]), "retrograde": bool(retro[row, j])}
+                   for j, p in enumerate(PLANETS)}
+        expected = calculate_sbc(planets)
+        assert scores[row] == expected["sbc_score"]
+        hits = [v["source_planet"] for v in expected["moon_vedh"]]
+        assert [p for p, c in zip(PLANETS, codes[row]) if c] == hits
+        assert [p for p in vedh_on(planets["moon"]["nakshatra"], planets) if p != "moon"] == hits
+
+
+def _route_planets(at):
+    raw = get_planetary_positions(at)
+    planets = {n: {"degree": d["D1"]["longitude"], "nakshatra": d["D1"]["nakshatra"],
+                   "retrograde": d["D1"]["retrograde"]} for n, d in raw.items()}
+    ketu = (raw["rahu"]["D1"]["longitude"] + 180) % 360
+    planets["ketu"] = {"degree": ketu, "nakshatra": calculate_nakshatra(ketu), "retrograde": True}
+    return calculate_sbc(planets)
+
+
+def test_timeline_segments_match_calculate_sbc(executor):
+    timeline = vedh_timeline(datetime(2024, 5, 1), datetime(2024, 5, 15), executor=executor)
+    segments = timeline["segments"]
+    assert segments[0]["start"] == "2024-05-01 00:00" and segments[-1]["end"] == "2024-05-15 00:00"
+    assert all(a["end"] == b["start"] for a, b in zip(segments, segments[1:]))
+    assert timeline["events"] and {e["time"] for e in timeline["events"]} <= {s["start"] for s in segments[1:]}
+    for seg in segments:
+        first = datetime.strptime(seg["start"], "%Y-%m-%d %H:%M")
+        last = datetime.strptime(seg["end"], "%Y-%m-%d %H:%M") - timedelta(minutes=1)
+        for at in (first, last):
+            expected = executor.run_sync(_route_planets, at)
+            assert expected["sbc_score"] == seg["sbc_score"]
+            assert expected["moon_nakshatra"] == seg["moon_nakshatra"]
+            assert [v["source_planet"] for v in expected["moon_vedh"]] == [v["planet"] for v in seg["moon_vedh"]]
+
+    with pytest.raises(ValueError):
+        vedh_timeline(datetime(2024, 5, 2), datetime(2024, 5, 1), executor=executor)
+    # A year at one-minute steps is ~527,000 samples; it is refused before any work is queued
+    with pytest.raises(ValueError, match="step_minutes >= 27"):
+        vedh_timeline(datetime(2024, 1, 1), datetime(2024, 12, 31), step_minutes=1, executor=executor)
+    response = TestClient(app).get("/sbc/timeline", params={"start": "2024-01-01T00:00", "end": "2024-12-31T00:00",
+                                                          "step_minutes": 1})
+    assert response.status_code == 400
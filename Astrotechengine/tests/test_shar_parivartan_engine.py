@@ -0,0 +1,96 @@
+"""
+Tests: indexed declination crossings match a direct search and are reused.
+"""
+from datetime import date, datetime
+
+import swisseph as swe
+
+from app.core.event_index import EventIndex
+from app.core.result_store import ResultStore
+from app.core.shar_parivartan_engine import (
+    PLANETS, _declination_events, _get_declination, calculate_shar_parivartan, declination_calendar,
+)
+
+
+def _brute_force_crossings(name, start_jd, end_jd, step=1 / 24):
+    """Hourly scan plus bisection, the way the old next-crossing search worked."""
+    pid = PLANETS[name]
+    out = []
+    t, d = start_jd, _get_declination(start_jd, pid)[0]
+    while t < end_jd:
+        t2 = min(t + step, end_jd)
+        d2 = _get_declination(t2, pid)[0]
+        if (d > 0) != (d2 > 0):
+            lo, hi = t, t2
+            while hi - lo > 1e-7:
+                mid = (lo + hi) / 2
+                if (_get_declination(mid, pid)[0] > 0) == (d > 0):
+                    lo = mid
+                else:
+                    hi = mid
+            out.append(lo)
+        t, d = t2, d2
+    return out
+
+
+def test_crossings_match_direct_search(executor):
+    index = EventIndex("declination-test", _declination_events, store=ResultStore(":memory:"),
+                       executor=executor)
+    events = declination_calendar(date(2026, 1, 1), date(2026, 4, 30), ["moon", "sun", "mercury"],
+                                  index=index)
+    start, end = swe.julday(2026, 1, 1, 0.0), swe.julday(2026, 5, 1, 0.0)
+    for name in ("moon", "sun", "mercury"):
+        found = [e["jd"] for e in events if e["planet"] == name]
+        expected = executor.run_sync(_brute_force_crossings, name, start, end)
+        assert len(found) == len(expected)
+        assert all(abs(a - b) * 86400 < 2 for a, b in zip(found, expected))
+
+
+def test_index_is_reused_and_extended(executor):
+    store = ResultStore(":memory:")
+    index = EventIndex("declination-test", _declination_events, store=store, executor=executor)
+    first = declination_calendar(date(2026, 3, 1), date(2026, 3, 31), ["moon"], index=index)
+    assert index.finder_calls == 1
+
+    # Inside the covered span: served without calling the finder
+    declination_calendar(date(2026, 3, 10), date(2026, 3, 20), ["moon"], index=index)
+    assert index.finder_calls == 1
+
+    # A fresh index over the same store loads the stored events
+    reloaded = EventIndex("declination-test", _declination_events, store=store, executor=executor)
+    again = declination_calendar(date(2026, 3, 1), date(2026, 3, 31), ["moon"], index=reloaded)
+    assert reloaded.finder_calls == 0
+    assert again == first
+
+    # Asking past the end computes only the new margin
+    nxt = reloaded.next_event("moon", first[-1]["jd"], kinds=("crossing",))
+    assert nxt is not None and nxt.jd > swe.julday(2026, 4, 1, 0.0)
+    assert reloaded.finder_calls == 1
+    assert reloaded.coverage("moon")[0] == swe.julday(2026, 3, 1, 0.0)
+
+
+def test_extremes_are_local_maxima_and_minima(executor):
+    index = EventIndex("declination-test", _declination_events, store=ResultStore(":memory:"),
+                       executor=executor)
+    events = declination_calendar(date(2026, 1, 1), date(2026, 12, 31), ["mercury"],
+                                  include_extremes=True, index=index)
+    extremes = [e for e in events if e["event"] != "crossing"]
+    assert {e["event"] for e in extremes} == {"local_max", "local_min"}
+    pid = PLANETS["mercury"]
+    for e in extremes:
+        around = [executor.run_sync(_get_declination, e["jd"] + dt, pid)[0] for dt in (-0.5, 0.5)]
+        if e["event"] == "local_max":
+            assert all(d < e["declination"] for d in around)
+        else:
+            assert all(d > e["declination"] for d in around)
+
+
+def test_next_crossing_just_before_it(executor):
+    # The Moon crosses the equator at 2026-03-04 17:40 IST (12:10 UT)
+    index = EventIndex("declination-test", _declination_events, store=ResultStore(":memory:"),
+                       executor=executor)
+    moon = calculate_shar_parivartan(datetime(2026, 3, 4, 15, 40), index=index)["moon"]
+    crossing = moon["next_crossing"]
+    assert moon["side"] == "North" and crossing["direction"] == "North → South"
+    assert crossing["cross_date"] == "2026-03-04 12:10"
+    assert abs(crossing["days_away"] - 2 / 24) < 0.01
@@ -0,0 +1,62 @@
+"""
+Tests: shared sky snapshot — bucketing, single-flight and immutability.
+"""
+import threading
+import time
+
+from app.core.snapshot_engine import SnapshotProvider
+from app.core.swiss_engine import get_planetary_positions
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _slow_compute(at):
+    time.sleep(0.05)
+    return get_planetary_positions(at)
+
+
+def test_one_computation_per_bucket():
+    clock = FakeClock(1_700_000_015.0)   # 5 s into a 30 s bucket
+    provider = SnapshotProvider(bucket_seconds=30, clock=clock)
+
+    first = provider.current()
+    clock.now += 20
+    assert provider.current() is first
+    clock.now += 5
+    second = provider.current()
+
+    assert second is not first
+    assert second.bucket - first.bucket == 30
+    assert provider.computations == 2
+
+
+def test_single_flight_at_bucket_boundary():
+    provider = SnapshotProvider(bucket_seconds=30, compute=_slow_compute,
+                                clock=FakeClock(1_700_000_000.0))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider.current()))
+               for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert provider.computations == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_snapshot_is_not_shared_mutable_state():
+    provider = SnapshotProvider(clock=FakeClock(1_700_000_000.0))
+    raw = provider.current().raw()
+    raw["moon"]["D1"]["longitude"] = -1
+    planets = provider.current().planets()
+
+    assert provider.current().raw()["moon"]["D1"]["longitude"] != -1
+    assert planets["moon"]["degree"] != -1
+    assert set(planets["sun"]) >= {"degree", "nakshatra", "declination", "d9_rashi"}
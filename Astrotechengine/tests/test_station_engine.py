@@ -0,0 +1,61 @@
+"""
+Tests: exact stations from the event index and the Budh lead-time rule.
+"""
+from datetime import date, datetime
+
+import pytest
+import swisseph as swe
+
+from app.core.budh_engine import evaluate_budh
+from app.core.event_index import EventIndex
+from app.core.result_store import ResultStore
+from app.core.root_finder import SECOND
+from app.core.station_engine import (
+    STATION_PLANETS, _station_events, build_station_table, station_calendar, station_status,
+)
+
+
+@pytest.fixture
+def index(executor):
+    return EventIndex("station-test", _station_events, store=ResultStore(":memory:"), executor=executor)
+
+
+def _speeds_around(pid, jd):
+    flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
+    return swe.calc_ut(jd - 60 * SECOND, pid, flags)[0][3], swe.calc_ut(jd + 60 * SECOND, pid, flags)[0][3]
+
+
+def test_stations_are_speed_sign_changes(executor, index):
+    events = station_calendar(date(2025, 1, 1), date(2025, 12, 31), index=index)
+    mercury = [(e["type"], e["time"][:10]) for e in events if e["planet"] == "mercury"]
+    assert mercury == [("retrograde", "2025-03-15"), ("direct", "2025-04-07"),
+                       ("retrograde", "2025-07-18"), ("direct", "2025-08-11"),
+                       ("retrograde", "2025-11-10"), ("direct", "2025-11-29")]
+    for e in events:
+        before, after = executor.run_sync(_speeds_around, STATION_PLANETS[e["planet"]], e["jd"])
+        assert (before > 0 > after) if e["type"] == "retrograde" else (before < 0 < after)
+
+
+def test_prebuilt_table_covers_the_calendar(index):
+    build_station_table(date(2025, 3, 1), date(2025, 3, 31), index=index)
+    calls = index.finder_calls
+    station_calendar(date(2025, 3, 1), date(2025, 3, 31), index=index)
+    assert index.finder_calls == calls
+
+
+def test_status_and_budh_lead(index):
+    status = station_status("mercury", datetime(2025, 11, 8, 12, 0), index=index)
+    assert not status["retrograde"]
+    assert status["previous_station"]["type"] == "direct"
+    assert status["next_station"]["type"] == "retrograde"
+    assert 1 < status["days_to_next_station"] < 2
+
+    calls = index.finder_calls
+    station_status("mercury", datetime(2025, 12, 1, 12, 0), index=index)
+    assert index.finder_calls == calls
+
+    planets = {"mercury": {"degree": 222.0, "retrograde": False}, "sun": {"degree": 200.0}}
+    assert evaluate_budh(planets)["score"] == -2
+    early = evaluate_budh(planets, status)
+    assert early["score"] == 0
+    assert early["station"] is status
@@ -0,0 +1,75 @@
+"""
+Tests: the vectorized scorer equals final_score rule by rule.
+"""
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.core.scoring_engine import RULE_WEIGHTS, final_score, scoring_planets
+from app.core.swiss_engine import get_planetary_positions
+from app.core.vector_scoring_engine import columns_from_planets, score_columns, score_times
+
+
+def _scalar(times):
+    out = []
+    for at in times:
+        result = final_score(scoring_planets(get_planetary_positions(at)), at=at)
+        out.append(([result["breakdown"][r]["raw_score"] for r in RULE_WEIGHTS], result["score"], result["trend"]))
+    return out
+
+
+def _assert_matches(batch, expected):
+    for i, (raw, score, trend) in enumerate(expected):
+        assert batch["raw"][i].tolist() == raw
+        assert batch["score"][i] == score
+        assert batch["trend"][i] == trend
+
+
+def test_matches_final_score_on_random_times(executor):
+    rng = np.random.default_rng(5)
+    times = [datetime(1995, 1, 1) + timedelta(minutes=int(m)) for m in rng.integers(0, 60 * 24 * 365 * 35, 3000)]
+    batch = score_times(times, executor=executor, chunk=700)
+    assert batch["rules"] == list(RULE_WEIGHTS)
+    assert batch["raw"].shape == (3000, len(RULE_WEIGHTS))
+    _assert_matches(batch, executor.run_sync(_scalar, times))
+
+
+def _planet(degree, retrograde=False):
+    longitude = degree % 360
+    return {"degree": degree, "rashi": int(longitude // 30) + 1, "retrograde": retrograde, "speed": -0.1 if retrograde else 1.0,
+            "nakshatra": int(longitude / (13 + 20 / 60)) + 1,
+            "d9_rashi": (((int(longitude // 30)) * 9 + int((longitude % 30) / (30 / 9))) % 12) + 1}
+
+
+def test_matches_final_score_on_edge_positions():
+    # Sun/Moon at 0°, Purnima, combust retrograde Mercury, Paap Khatri with Budh,
+    # debilitated combust planets and a degree rounded up to 360.0
+    skies = [
+        {"sun": 0.5, "moon": 180.4, "mercury": (2.0, True), "venus": 5.0, "mars": 185.0,
+         "jupiter": 95.0, "saturn": 175.0, "rahu": 359.99},
+        {"sun": 100.0, "moon": 90.2, "mercury": (95.0, True), "venus": 160.0, "mars": 92.0,
+         "jupiter": 280.0, "saturn": 85.0, "rahu": 88.0},
+        {"sun": 350.0, "moon": 360.0, "mercury": 345.0, "venus": 340.0, "mars": (110.0, True),
+         "jupiter": 300.0, "saturn": (0.5, True), "rahu": 180.0},
+    ]
+    planets = [{n: _planet(*(v if isinstance(v, tuple) else (v,))) for n, v in sky.items()} for sky in skies]
+    times = [datetime(2024, 1, 1) + timedelta(days=d) for d in range(3)]
+    batch = score_columns(columns_from_planets(planets, times))
+    for p, at, raw, score in zip(planets, times, batch["raw"], batch["score"]):
+        result = final_score(p, at=at)
+        assert raw.tolist() == [result["breakdown"][r]["raw_score"] for r in RULE_WEIGHTS]
+        assert score == result["score"]
+
+
+def test_year_of_hourly_columns_scores_fast():
+    rng = np.random.default_rng(2)
+    hours = 24 * 365
+    planets = [{n: _planet(float(d), bool(r)) for n, d, r in
+                zip(("sun", "moon", "mercury", "venus", "mars", "jupiter", "saturn", "rahu"),
+                    rng.uniform(0, 360, 8).round(4), rng.random(8) < 0.2)} for _ in range(50)]
+    cols = columns_from_planets(planets * (hours // 50 + 1), [datetime(2024, 1, 1)] * (hours // 50 + 1) * 50)
+    started = time.perf_counter()
+    batch = score_columns(cols)
+    assert time.perf_counter() - started < 1.0
+    assert len(batch["score"]) >= hours
@@ -0,0 +1,101 @@
+"""
+Tests: the score matrix reproduces final_score and the optimizer ranks and exports weights.
+"""
+import csv
+import shutil
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.core import config
+from app.core.backtest_engine import ScoreMatrix, build_score_matrix
+from app.core.scoring_engine import RULE_WEIGHTS, final_score, scoring_planets
+from app.core.swiss_engine import get_planetary_positions
+from app.core.weight_optimizer import current_weights, evaluate, export_config, optimize
+
+
+def _write_bars(path, start, days):
+    rng = np.random.default_rng(11)
+    price = 45000.0
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["Date", "Open", "High", "Low", "Close"])
+        for i in range(days):
+            day = start + timedelta(days=i)
+            if day.weekday() >= 5:
+                continue
+            close = price * (1 + rng.normal(0, 0.01))
+            writer.writerow([day.isoformat(), round(price, 2), round(max(price, close) + 50, 2),
+                             round(min(price, close) - 50, 2), round(close, 2)])
+            price = close
+
+
+def test_raw_score_times_weight_is_score(executor):
+    at = datetime(2023, 3, 7, 9, 15)
+    result = executor.run_sync(lambda t: final_score(scoring_planets(get_planetary_positions(t)), at=t), at)
+    for name, rule in result["breakdown"].items():
+        assert rule["score"] == pytest.approx(rule["raw_score"] * getattr(config, RULE_WEIGHTS[name]))
+
+
+def test_score_matrix_reproduces_final_score_and_caches(tmp_path, executor):
+    path = tmp_path / "nifty.csv"
+    _write_bars(path, date(2023, 1, 2), 40)
+    matrix = build_score_matrix(str(path), executor=executor, cache_dir=str(tmp_path))
+    assert matrix.rules == list(RULE_WEIGHTS)
+
+    totals = matrix.raw @ current_weights(matrix.rules)
+    for i in (0, len(totals) // 2, len(totals) - 1):
+        at = matrix.times[i].astype(datetime)
+        expected = executor.run_sync(lambda t: final_score(scoring_planets(get_planetary_positions(t)), at=t)["score"], at)
+        assert totals[i] == pytest.approx(expected, abs=1e-6)
+
+    cached = build_score_matrix(str(path), executor=None, cache_dir=str(tmp_path))
+    assert np.array_equal(cached.raw, matrix.raw)
+    assert np.array_equal(cached.times, matrix.times)
+
+
+def _synthetic_matrix(bars=400):
+    rng = np.random.default_rng(3)
+    rules = list(RULE_WEIGHTS)
+    raw = rng.integers(-2, 3, size=(bars, len(rules))).astype(float)
+    # Returns follow the first rule only, so it should end up weighted
+    drift = 0.004 * raw[:, 0] + rng.normal(0, 0.002, bars)
+    opens = np.full(bars, 100.0)
+    return ScoreMatrix(times=np.arange(bars).astype("datetime64[D]").astype("datetime64[m]"),
+                       rules=rules, raw=raw, opens=opens, closes=opens * (1 + drift))
+
+
+def test_evaluate_batch_matches_single_rows():
+    matrix = _synthetic_matrix()
+    returns = matrix.returns("open_close")
+    weights = np.random.default_rng(1).choice([0.0, 1.0, 2.0], size=(5, len(matrix.rules)))
+    batch = evaluate(matrix.raw, returns, weights, 2.0, -2.0)
+    for i in range(5):
+        single = evaluate(matrix.raw, returns, weights[i:i + 1], 2.0, -2.0)
+        assert single["sharpe"][0] == pytest.approx(batch["sharpe"][i])
+        assert single["hit_rate"][0] == pytest.approx(batch["hit_rate"][i])
+
+
+@pytest.mark.parametrize("method", ["random", "coordinate"])
+def test_optimize_ranks_and_finds_the_signal(method):
+    ranked = optimize(_synthetic_matrix(), method=method, samples=3000, top=5)
+    assert 0 < len(ranked) <= 5
+    best = ranked[0]
+    assert best.weights[RULE_WEIGHTS[list(RULE_WEIGHTS)[0]]] > 0
+    assert best.test["hit_rate"] > 0.6
+    assert best.train["sharpe"] >= ranked[-1].train["sharpe"]
+
+
+def test_export_config_rewrites_values_and_keeps_comments(tmp_path):
+    target = tmp_path / "config.py"
+    shutil.copy(config.__file__, target)
+    best = optimize(_synthetic_matrix(), method="coordinate", top=1)[0]
+    text = export_config(best, str(target))
+    assert "# Rule 1: SBC Vedh" in text
+    namespace = {}
+    exec(compile(text, str(target), "exec"), namespace)
+    for name, value in best.weights.items():
+        assert namespace[name] == value
+    assert namespace["TREND_TEJI"] == best.teji
+    assert namespace["TREND_VERY_STRONG_TEJI"] == pytest.approx(best.teji * 3)
@@ -0,0 +1,248 @@
+"""
+Admission control for expensive endpoints.
+
+A request for a report must pass three checks before any CPU is spent on
+it: a free in-flight slot, the caller's token bucket and the global token
+bucket. Both buckets are checked together and a token is taken from
+each only when both have one. Rejections are immediate 429s with Retry-After, so a burst of
+report requests cannot starve the rest of the API.
+
+Buckets live in memory by default. With ADMISSION_BACKEND=redis they are
+shared across workers and checked in a single Lua script; anything exposing an
+async eval(script, numkeys, *keys_and_args) can stand in for the client.
+A configured Redis backend that cannot be built fails at import and one
+that cannot be reached fails check() at startup, rather than silently
+falling back to per-process buckets. If Redis goes away later, requests
+get a 503 instead of a 500.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+
+load_dotenv()
+
+REPORT_USER_RATE_PER_MIN = float(os.getenv("REPORT_USER_RATE_PER_MIN", "2"))
+REPORT_USER_BURST = int(os.getenv("REPORT_USER_BURST", "3"))
+REPORT_GLOBAL_RATE_PER_MIN = float(os.getenv("REPORT_GLOBAL_RATE_PER_MIN", "30"))
+REPORT_GLOBAL_BURST = int(os.getenv("REPORT_GLOBAL_BURST", "10"))
+REPORT_MAX_IN_FLIGHT = int(os.getenv("REPORT_MAX_IN_FLIGHT", "2"))
+REPORT_BUSY_RETRY_AFTER = int(os.getenv("REPORT_BUSY_RETRY_AFTER", "5"))
+REPORT_DRAIN_TIMEOUT = float(os.getenv("REPORT_DRAIN_TIMEOUT", "90"))
+ADMISSION_BACKEND = os.getenv("ADMISSION_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+logger = logging.getLogger(__name__)
+
+
+class BackendUnavailable(Exception):
+    """The shared bucket store could not be reached."""
+
+
+def take_tokens(states: Sequence[Tuple[Optional[float], Optional[float]]],
+                limits: Sequence[Tuple[float, int]], now: float) -> Tuple[int, List[float], float]:
+    """
+    One all-or-nothing step over several token buckets; states are
+    (tokens, updated) pairs, limits (rate per second, burst) pairs.
+    Returns (rejected, tokens_left, retry_after_seconds), where rejected is
+    the 1-based index of the first bucket without a token, or 0 when every
+    bucket gave one. A rejection takes no token from any bucket.
+    Mirrors TOKEN_BUCKET_LUA line for line.
+    """
+    tokens = []
+    for (left, updated), (rate, burst) in zip(states, limits):
+        left = burst if left is None else left
+        updated = now if updated is None else updated
+        tokens.append(min(burst, left + max(0.0, now - updated) * rate))
+    for i, (left, (rate, _)) in enumerate(zip(tokens, limits), 1):
+        if left < 1:
+            return i, tokens, (1 - left) / rate
+    return 0, [left - 1 for left in tokens], 0.0
+
+
+TOKEN_BUCKET_LUA = """
+local now = tonumber(ARGV[1])
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i])
+    local burst = tonumber(ARGV[2 * i + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'updated')
+    local left = tonumber(state[1]) or burst
+    local updated = tonumber(state[2]) or now
+    tokens[i] = math.min(burst, left + math.max(0, now - updated) * rate)
+end
+local rejected = 0
+local retry_after = 0
+for i = 1, #KEYS do
+    if tokens[i] < 1 then
+        rejected = i
+        retry_after = (1 - tokens[i]) / tonumber(ARGV[2 * i])
+        break
+    end
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i])
+    local burst = tonumber(ARGV[2 * i + 1])
+    if rejected == 0 then
+        tokens[i] = tokens[i] - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens[i]), 'updated', tostring(now))
+    redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+return {rejected, tostring(retry_after)}
+"""
+
+
+class InMemoryBackend:
+    """Per-process buckets. Limits apply per worker."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def check(self):
+        pass
+
+    async def take(self, keys: Sequence[str], limits: Sequence[Tuple[float, int]],
+                   now: float) -> Tuple[int, float]:
+        """(rejected, retry_after) as for take_tokens; all buckets or none give a token."""
+        states = [self._buckets.get(key, (None, None)) for key in keys]
+        rejected, tokens, retry_after = take_tokens(states, limits, now)
+        for key, left in zip(keys, tokens):
+            self._buckets[key] = (left, now)
+        return rejected, retry_after
+
+
+class RedisBackend:
+    """Buckets shared by every worker; the check-and-take over all buckets is one Lua script."""
+
+    def __init__(self, client, prefix: str = "admission:",
+                 errors: Tuple[type, ...] = (OSError, asyncio.TimeoutError)):
+        self.client = client
+        self.prefix = prefix
+        # Client exceptions that mean "Redis is unreachable", not a bug
+        self.errors = errors
+
+    async def check(self):
+        """Raise BackendUnavailable unless Redis answers; called at startup."""
+        try:
+            await self.client.ping()
+        except self.errors as exc:
+            raise BackendUnavailable(f"Redis did not answer: {exc}") from exc
+
+    async def take(self, keys: Sequence[str], limits: Sequence[Tuple[float, int]],
+                   now: float) -> Tuple[int, float]:
+        args = [now] + [value for limit in limits for value in limit]
+        try:
+            rejected, retry_after = await self.client.eval(
+                TOKEN_BUCKET_LUA, len(keys), *[self.prefix + key for key in keys], *args)
+        except self.errors as exc:
+            raise BackendUnavailable(str(exc)) from exc
+        return int(rejected), float(retry_after)
+
+
+def get_backend():
+    """The configured bucket backend; raises if ADMISSION_BACKEND=redis cannot be honoured."""
+    if ADMISSION_BACKEND == "memory":
+        return InMemoryBackend()
+    if ADMISSION_BACKEND != "redis":
+        raise RuntimeError(f"Unknown ADMISSION_BACKEND={ADMISSION_BACKEND!r}; use 'memory' or 'redis'")
+    try:
+        import redis.asyncio as aioredis
+        from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+        client = aioredis.from_url(REDIS_URL)
+    except Exception as exc:
+        raise RuntimeError(f"ADMISSION_BACKEND=redis but the Redis client cannot be built: {exc}") from exc
+    return RedisBackend(client, errors=(RedisConnectionError, RedisTimeoutError, OSError))
+
+
+class AdmissionController:
+    def __init__(self, name: str, backend=None,
+                 user_rate_per_min: float = REPORT_USER_RATE_PER_MIN,
+                 user_burst: int = REPORT_USER_BURST,
+                 global_rate_per_min: float = REPORT_GLOBAL_RATE_PER_MIN,
+                 global_burst: int = REPORT_GLOBAL_BURST,
+                 max_in_flight: int = REPORT_MAX_IN_FLIGHT,
+                 busy_retry_after: int = REPORT_BUSY_RETRY_AFTER):
+        self.name = name
+        self.backend = backend if backend is not None else get_backend()
+        self.user_rate = user_rate_per_min / 60.0
+        self.user_burst = user_burst
+        self.global_rate = global_rate_per_min / 60.0
+        self.global_burst = global_burst
+        self.max_in_flight = max_in_flight
+        self.busy_retry_after = busy_retry_after
+        self.in_flight = 0
+        self.counters = {"admitted": 0, "busy": 0, "user_limited": 0, "global_limited": 0,
+                         "unavailable": 0}
+
+    @staticmethod
+    def _reject(detail: str, retry_after: float):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def acquire(self, user_id: str):
+        # Take the slot before any await so concurrent callers cannot overshoot it
+        if self.in_flight >= self.max_in_flight:
+            self.counters["busy"] += 1
+            self._reject("Too many reports are being generated, please retry shortly",
+                         self.busy_retry_after)
+        self.in_flight += 1
+        try:
+            # Both buckets in one step: a global rejection must not cost the user a token
+            try:
+                rejected, retry_after = await self.backend.take(
+                    (f"{self.name}:user:{user_id}", f"{self.name}:global"),
+                    ((self.user_rate, self.user_burst), (self.global_rate, self.global_burst)),
+                    time.time())
+            except BackendUnavailable as exc:
+                self.counters["unavailable"] += 1
+                logger.warning("Admission backend for %s unavailable: %s", self.name, exc)
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Report service is temporarily unavailable, please retry shortly",
+                    headers={"Retry-After": str(self.busy_retry_after)},
+                ) from exc
+            if rejected == 1:
+                self.counters["user_limited"] += 1
+                self._reject("Report quota exceeded, please retry later", retry_after)
+            if rejected == 2:
+                self.counters["global_limited"] += 1
+                self._reject("Report service is at capacity, please retry later", retry_after)
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        self.counters["admitted"] += 1
+
+    def release(self):
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, user_id: str):
+        await self.acquire(user_id)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def drain(self, timeout: float):
+        """Wait for admitted requests to finish, up to timeout seconds."""
+        deadline = time.monotonic() + timeout
+        while self.in_flight > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        return self.in_flight == 0
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "in_flight": self.in_flight, "max_in_flight": self.max_in_flight}
+
+
+report_admission = AdmissionController("report")
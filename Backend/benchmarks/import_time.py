@@ -0,0 +1,60 @@
+"""
+Cold-start cost of importing the app, measured in fresh interpreters.
+
+"lazy" is `import main` as shipped: the report stack is loaded on first
+use. "eager" also imports core.report.report_service, which is what
+`import main` used to do before /health could answer.
+
+    cd Backend && python benchmarks/import_time.py
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+RUNS = int(os.getenv("BENCH_RUNS", "15"))
+
+SNIPPET = """
+import time
+start = time.perf_counter()
+import main
+{extra}
+print(time.perf_counter() - start)
+"""
+
+CASES = {
+    "lazy  (import main)": "",
+    "eager (main + report stack)": "import core.report.report_service",
+}
+
+
+def _measure(extra: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(extra=extra)],
+        cwd=BACKEND, capture_output=True, text=True, check=True,
+    ).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def main():
+    samples = {name: [] for name in CASES}
+    for extra in CASES.values():
+        _measure(extra)  # populate the bytecode and OS file caches
+    # Interleave the cases so background load hits both alike
+    for _ in range(RUNS):
+        for name, extra in CASES.items():
+            samples[name].append(_measure(extra))
+    results = {name: min(values) for name, values in samples.items()}
+    print(f"best of {RUNS} fresh interpreters "
+          f"(medians: {', '.join(f'{statistics.median(v) * 1000:.0f}' for v in samples.values())} ms)")
+    for name, seconds in results.items():
+        print(f"  {name:30s}: {seconds * 1000:7.1f} ms")
+    lazy, eager = results.values()
+    print(f"  saved at startup              : {(eager - lazy) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Order-creation throughput: blocking razorpay.Client vs async RazorpayGateway.
+
+Starts fake_razorpay on a local port with simulated network latency and
+fires CONCURRENCY order requests from one event loop, the way uvicorn
+would run concurrent /create-order handlers.
+
+    cd Backend && python benchmarks/payment_throughput.py
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import razorpay
+import uvicorn
+
+from fake_razorpay import FAKE_KEY_ID, FAKE_KEY_SECRET, create_app, sign_payment
+from payment import RazorpayGateway
+
+ORDERS = int(os.getenv("BENCH_ORDERS", "200"))
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "50"))
+LATENCY = float(os.getenv("BENCH_LATENCY", "0.05"))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_fake_server(port: int) -> uvicorn.Server:
+    config = uvicorn.Config(create_app(latency=LATENCY), host="127.0.0.1",
+                            port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def _run(handler) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            await handler()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(ORDERS)))
+    return ORDERS / (time.perf_counter() - start)
+
+
+async def main():
+    port = _free_port()
+    server = _start_fake_server(port)
+
+    # Old path: sync SDK call made directly inside the async handler
+    client = razorpay.Client(auth=(FAKE_KEY_ID, FAKE_KEY_SECRET),
+                             base_url=f"http://127.0.0.1:{port}")
+
+    async def blocking_handler():
+        client.order.create(data={"amount": 10000, "currency": "INR", "payment_capture": 1})
+
+    gateway = RazorpayGateway(FAKE_KEY_ID, FAKE_KEY_SECRET,
+                              base_url=f"http://127.0.0.1:{port}/v1",
+                              pool_size=CONCURRENCY)
+
+    async def async_handler():
+        await gateway.create_order(100)
+
+    blocking = await _run(blocking_handler)
+    pooled = await _run(async_handler)
+    await gateway.aclose()
+
+    start = time.perf_counter()
+    signature = sign_payment("order_bench", "pay_bench")
+    for _ in range(10000):
+        gateway.verify_payment_signature("order_bench", "pay_bench", signature)
+    verify_rate = 10000 / (time.perf_counter() - start)
+
+    server.should_exit = True
+    print(f"orders={ORDERS} concurrency={CONCURRENCY} latency={LATENCY * 1000:.0f}ms")
+    print(f"  blocking razorpay.Client : {blocking:8.1f} orders/s")
+    print(f"  async RazorpayGateway    : {pooled:8.1f} orders/s  ({pooled / blocking:.1f}x)")
+    print(f"  signature verification   : {verify_rate:8.0f} checks/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
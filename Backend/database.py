@@ -31,9 +31,19 @@ class MemoryCollection:
         self._docs[doc["_id"]] = doc
         return self.InsertResult(doc["_id"])
 
+    @staticmethod
+    def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+        for key, value in query.items():
+            if isinstance(value, dict) and "$in" in value:
+                if doc.get(key) not in value["$in"]:
+                    return False
+            elif doc.get(key) != value:
+                return False
+        return True
+
     async def find_one(self, query: Dict[str, Any]):
         for doc in self._docs.values():
-            if all(doc.get(k) == v for k, v in query.items()):
+            if self._matches(doc, query):
                 return doc
         return None
 
@@ -80,7 +90,25 @@ class DatabaseProxy:
             self.transaction_collection = MemoryCollection("transactions")
             self.consultation_collection = MemoryCollection("consultations")
 
+    def reset(self):
+        """Reconnect in a forked worker; a MongoClient must not cross fork()."""
+        if self._memory:
+            return
+        self._client = None
+        self._database = None
+        self.user_collection = None
+        self.transaction_collection = None
+        self.consultation_collection = None
+        self._connect()
+
 
 database_proxy = DatabaseProxy()
 database_proxy._connect()
 database = database_proxy
+
+
+def __getattr__(name: str):
+    # Lets callers use database.user_collection etc. straight off the module
+    if name.endswith("_collection"):
+        return getattr(database_proxy, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
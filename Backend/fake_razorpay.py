@@ -0,0 +1,141 @@
+"""
+Local stand-in for the Razorpay Orders API.
+
+Lets order creation and signature verification run offline, in tests
+and under load. Point the backend at it with
+RAZORPAY_BASE_URL=http://127.0.0.1:9100/v1 and run:
+
+    python fake_razorpay.py
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import random
+import time
+import uuid
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+FAKE_KEY_ID = "rzp_test_fake"
+FAKE_KEY_SECRET = "fake_secret"
+
+
+def sign(message: str, secret: str) -> str:
+    return hmac.new(secret.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+def sign_payment(order_id: str, payment_id: str, secret: str = FAKE_KEY_SECRET) -> str:
+    """Signature Razorpay Checkout hands back to the browser after payment."""
+    return sign(f"{order_id}|{payment_id}", secret)
+
+
+def sign_webhook(body: bytes, secret: str) -> str:
+    """X-Razorpay-Signature header for a webhook delivery."""
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def webhook_event(event: str, order_id: str, payment_id: Optional[str] = None) -> dict:
+    """Minimal webhook payload in Razorpay's shape."""
+    payment_id = payment_id or f"pay_{uuid.uuid4().hex[:14]}"
+    return {
+        "entity": "event",
+        "event": event,
+        "contains": ["payment"],
+        "payload": {"payment": {"entity": {"id": payment_id, "order_id": order_id,
+                                           "entity": "payment"}}},
+        "created_at": int(time.time()),
+    }
+
+
+def _error(status_code: int, description: str, code: str = "BAD_REQUEST_ERROR"):
+    return JSONResponse(status_code=status_code,
+                        content={"error": {"code": code, "description": description}})
+
+
+def create_app(key_id: str = FAKE_KEY_ID, key_secret: str = FAKE_KEY_SECRET,
+               latency: float = 0.0, failure_rate: float = 0.0,
+               fail_first: int = 0, seed: Optional[int] = None) -> FastAPI:
+    """
+    latency: seconds added to every order call (simulates the network hop).
+    failure_rate: fraction of order calls answered with a 503.
+    fail_first: answer the first N order calls with a 503 (deterministic retries).
+    """
+    app = FastAPI(title="Fake Razorpay")
+    rng = random.Random(seed)
+    expected_auth = "Basic " + base64.b64encode(f"{key_id}:{key_secret}".encode()).decode()
+    app.state.orders = {}
+    app.state.calls = 0
+
+    @app.post("/v1/orders")
+    async def create_order(request: Request):
+        app.state.calls += 1
+        if request.headers.get("authorization") != expected_auth:
+            return _error(401, "Authentication failed", "BAD_REQUEST_ERROR")
+        if latency:
+            await asyncio.sleep(latency)
+        if app.state.calls <= fail_first or (failure_rate and rng.random() < failure_rate):
+            return _error(503, "Service temporarily unavailable", "SERVER_ERROR")
+
+        data = await request.json()
+        amount = data.get("amount")
+        if not isinstance(amount, int) or amount < 100:
+            return _error(400, "Order amount less than minimum amount allowed")
+
+        order = {
+            "id": f"order_{uuid.uuid4().hex[:14]}",
+            "entity": "order",
+            "amount": amount,
+            "amount_paid": 0,
+            "amount_due": amount,
+            "currency": data.get("currency", "INR"),
+            "receipt": data.get("receipt"),
+            "status": "created",
+            "attempts": 0,
+            "notes": data.get("notes", []),
+            "created_at": int(time.time()),
+        }
+        app.state.orders[order["id"]] = order
+        return order
+
+    @app.get("/v1/orders")
+    async def list_orders(receipt: Optional[str] = None):
+        items = [o for o in app.state.orders.values() if receipt is None or o["receipt"] == receipt]
+        return {"entity": "collection", "count": len(items), "items": items[::-1]}
+
+    @app.get("/v1/orders/{order_id}")
+    async def fetch_order(order_id: str):
+        order = app.state.orders.get(order_id)
+        if order is None:
+            return _error(400, "The id provided does not exist")
+        return order
+
+    @app.post("/v1/test/checkout/{order_id}")
+    async def checkout(order_id: str):
+        """Simulates a successful Checkout and returns what the browser would post back."""
+        if order_id not in app.state.orders:
+            return _error(400, "The id provided does not exist")
+        payment_id = f"pay_{uuid.uuid4().hex[:14]}"
+        return {
+            "razorpay_order_id": order_id,
+            "razorpay_payment_id": payment_id,
+            "razorpay_signature": sign_payment(order_id, payment_id, key_secret),
+        }
+
+    return app
+
+
+app = create_app(
+    key_id=os.getenv("RAZORPAY_KEY_ID", FAKE_KEY_ID),
+    key_secret=os.getenv("RAZORPAY_KEY_SECRET", FAKE_KEY_SECRET),
+    latency=float(os.getenv("FAKE_RAZORPAY_LATENCY", "0")),
+    failure_rate=float(os.getenv("FAKE_RAZORPAY_FAILURE_RATE", "0")),
+)
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("FAKE_RAZORPAY_PORT", 9100)))
@@ -0,0 +1,72 @@
+"""
+Multi-worker serving: a gunicorn master preforks UvicornWorkers.
+
+    cd Backend && gunicorn main:app -c gunicorn.conf.py
+
+The app is imported once in the master (preload_app) and the report stack
+is warmed there before forking, so swisseph ephemeris data, the rule and
+yoga tables and ReportLab's styles are shared copy-on-write instead of
+being loaded per worker. Workers recycle after GUNICORN_MAX_REQUESTS
+requests to bound ReportLab memory growth, and SIGTERM lets in-flight
+reports finish within GUNICORN_GRACEFUL_TIMEOUT.
+
+Report admission buckets and the in-flight limit are per process unless
+ADMISSION_BACKEND=redis, so more than one worker requires Redis; without
+it the default is a single worker. With more than one worker the master
+pings REDIS_URL before starting and refuses to start if it cannot. The webhook dedupe window stays per
+worker, which is safe because applying an event is idempotent.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+_shared_admission = os.getenv("ADMISSION_BACKEND", "memory") == "redis"
+# Not cpu_count(): inside a container that is the host's core count
+workers = int(os.getenv("WEB_CONCURRENCY", "2" if _shared_admission else "1"))
+if workers > 1 and not _shared_admission:
+    raise RuntimeError(
+        f"WEB_CONCURRENCY={workers} needs ADMISSION_BACKEND=redis; "
+        "in-memory report limits would apply per worker")
+
+
+def _require_redis():
+    """Shared limits are only shared if Redis is really there; check before forking."""
+    try:
+        import redis
+
+        redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                             socket_connect_timeout=5).ping()
+    except Exception as exc:
+        raise RuntimeError(
+            f"WEB_CONCURRENCY={workers} needs a reachable Redis for admission control: {exc}") from exc
+
+
+if workers > 1:
+    _require_redis()
+
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "500"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "50"))
+
+# A report can take tens of seconds; give it time to finish on shutdown
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "180"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "120"))
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    # Runs in the master after the preload and before any worker is forked
+    import warmup
+    warmup.warm()
+    server.log.info(f"Warm-up finished in master: {warmup.status()['steps']}")
+
+
+def post_fork(server, worker):
+    # Sockets and event-loop state must not be shared with the master
+    import database
+    database.database_proxy.reset()
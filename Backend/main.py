@@ -1,12 +1,16 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, FileResponse
 from datetime import timedelta
+from typing import Optional
 from fastapi.middleware.cors import CORSMiddleware
 import traceback
+import hashlib
+import json
 import os
 
-import schemas, auth, payment, database
+import schemas, auth, payment, database, webhooks, admission, warmup
 
 
 app = FastAPI()
@@ -75,11 +79,39 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"detail": str(exc)},
     )
 
+@app.on_event("startup")
+async def check_admission_backend():
+    # Fail the worker rather than serve with limits nobody enforces
+    await admission.report_admission.backend.check()
+
+@app.on_event("startup")
+async def start_webhook_ingestor():
+    webhooks.ingestor.start()
+
+@app.on_event("startup")
+async def start_warmup():
+    warmup.start()
+
+@app.on_event("shutdown")
+async def close_payment_gateway():
+    # Let in-flight reports finish before the worker goes away
+    if not await admission.report_admission.drain(admission.REPORT_DRAIN_TIMEOUT):
+        print(f"Shutting down with {admission.report_admission.in_flight} reports still running")
+    await webhooks.ingestor.stop()
+    await payment.close_gateway()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+# Readiness: 503 until the optional background warm-up has finished
+@app.get("/ready")
+async def readiness_check():
+    if not warmup.is_ready():
+        return JSONResponse(status_code=503, content={"status": "warming", **warmup.status()})
+    return {"status": "ready", **warmup.status()}
+
 # Auth Routes
 @app.post("/signup", response_model=schemas.User)
 async def signup(user: schemas.UserCreate):
@@ -148,9 +180,14 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
 
 # Payment Routes
 @app.post("/create-order")
-async def create_payment_order(order: schemas.OrderCreate, current_user: schemas.User = Depends(auth.get_current_user)):
+async def create_payment_order(order: schemas.OrderCreate,
+                               current_user: schemas.User = Depends(auth.get_current_user),
+                               idempotency_key: Optional[str] = Header(default=None)):
     try:
-        razorpay_order = payment.create_order(order.amount, order.currency)
+        # A client retrying the same checkout sends the same key and gets the same order back
+        if idempotency_key:
+            idempotency_key = f"{current_user.id}:{idempotency_key}"
+        razorpay_order = await payment.create_order(order.amount, order.currency, idempotency_key)
         
         # Save transaction to DB
         new_txn = {
@@ -191,6 +228,43 @@ async def verify_payment(data: schemas.PaymentVerify):
         print(f"Verify payment error: {e}")
         raise HTTPException(status_code=500, detail=f"Verification error: {str(e)}")
 
+@app.post("/payments/webhook")
+async def payment_webhook(request: Request,
+                          x_razorpay_signature: Optional[str] = Header(default=None),
+                          x_razorpay_event_id: Optional[str] = Header(default=None)):
+    # Only verify and enqueue here; the ingestor writes to MongoDB in batches
+    body = await request.body()
+    if not payment.verify_signature(body, x_razorpay_signature, webhooks.RAZORPAY_WEBHOOK_SECRET):
+        raise HTTPException(status_code=400, detail="Invalid webhook signature")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid webhook payload")
+
+    event_id = x_razorpay_event_id or hashlib.sha256(body).hexdigest()
+    try:
+        result = webhooks.ingestor.submit(event_id, payload)
+    except webhooks.QueueFull:
+        # Razorpay retries non-2xx deliveries, so shedding here loses nothing
+        raise HTTPException(status_code=503, detail="Webhook queue is full, retry later")
+    return {"status": result}
+
+@app.get("/payments/reconciliation")
+async def payment_reconciliation(order_id: str,
+                                 current_user: schemas.User = Depends(auth.get_current_user)):
+    # Scoped to the caller's own orders; ingestor stats are not exposed to users
+    txn = await database.transaction_collection.find_one(
+        {"order_id": order_id, "user_id": current_user.id})
+    if not txn:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return {
+        "order_id": order_id,
+        "status": txn.get("status"),
+        "payment_id": txn.get("payment_id"),
+        "webhook_event_id": txn.get("webhook_event_id"),
+        "updated_at": txn.get("updated_at"),
+    }
+
 @app.get("/users/me", response_model=schemas.User)
 async def read_users_me(current_user: schemas.User = Depends(auth.get_current_user)):
     return current_user
@@ -209,22 +283,25 @@ async def request_consultation(data: schemas.ConsultationCreate, current_user: s
         print(f"Consultation request error: {e}")
         raise HTTPException(status_code=500, detail="Failed to save consultation request")
 
-from fastapi.responses import FileResponse
-from core.report.report_service import run_report_pipeline
-
 @app.post("/generate-report")
 async def generate_report(data: schemas.ReportRequest, current_user: schemas.User = Depends(auth.get_current_user)):
     try:
-        # Generate the report
-        pdf_path = run_report_pipeline(
-            birth_date=data.birth_date,
-            birth_time=data.birth_time,
-            lat=data.lat,
-            lon=data.lon,
-            timezone=data.timezone,
-            target_year=data.target_year,
-            client_name=data.client_name
-        )
+        # Imported on first use so startup does not load swisseph and ReportLab
+        from core.report.report_service import run_report_pipeline
+
+        # Rejected with 429 + Retry-After before any work when over quota or busy
+        async with admission.report_admission.slot(str(current_user.id)):
+            # Off the event loop so other endpoints stay responsive while rendering
+            pdf_path = await run_in_threadpool(
+                run_report_pipeline,
+                birth_date=data.birth_date,
+                birth_time=data.birth_time,
+                lat=data.lat,
+                lon=data.lon,
+                timezone=data.timezone,
+                target_year=data.target_year,
+                client_name=data.client_name
+            )
         
         if not os.path.exists(pdf_path):
             raise HTTPException(status_code=500, detail="Failed to generate report file")
@@ -234,12 +311,18 @@ async def generate_report(data: schemas.ReportRequest, current_user: schemas.Use
             filename=os.path.basename(pdf_path),
             media_type='application/pdf'
         )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Report generation error: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Internal server error during report generation: {str(e)}")
 
+@app.get("/admission/stats")
+async def admission_stats(current_user: schemas.User = Depends(auth.get_current_user)):
+    return {"report": admission.report_admission.stats()}
+
 @app.get("/")
 async def root():
     return {"message": "AstroTech API is running"}
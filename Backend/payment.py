@@ -1,6 +1,13 @@
-import razorpay
-from fastapi import HTTPException, status
+import asyncio
+import hashlib
+import hmac
 import os
+import random
+import uuid
+from typing import Awaitable, Callable, Optional, Union
+
+import httpx
+from fastapi import HTTPException, status
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,27 +16,156 @@ load_dotenv()
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID")
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET")
 
-client = razorpay.Client(auth=(RAZORPAY_KEY_ID, RAZORPAY_KEY_SECRET))
+# Point this at fake_razorpay.py for offline runs and load tests
+RAZORPAY_BASE_URL = os.getenv("RAZORPAY_BASE_URL", "https://api.razorpay.com/v1")
+RAZORPAY_TIMEOUT = float(os.getenv("RAZORPAY_TIMEOUT", "10"))
+RAZORPAY_MAX_RETRIES = int(os.getenv("RAZORPAY_MAX_RETRIES", "3"))
+RAZORPAY_POOL_SIZE = int(os.getenv("RAZORPAY_POOL_SIZE", "20"))
 
-def create_order(amount: float, currency: str = "INR"):
-    data = {
-        "amount": int(amount * 100),  # Razorpay expects amount in paise
-        "currency": currency,
-        "payment_capture": 1
-    }
-    try:
-        order = client.order.create(data=data)
-        return order
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Failures raised before the request left this process; always safe to retry
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
 
-def verify_payment_signature(order_id: str, payment_id: str, signature: str):
+
+class RazorpayGateway:
+    """
+    Async Razorpay client sharing one pooled HTTP connection set.
+
+    Retries connection failures and 429/5xx responses with full-jitter
+    exponential backoff. The Orders API has no idempotency key, so each
+    order's receipt is a hash of the caller's key: after a POST that may
+    have reached Razorpay (read timeout, dropped connection, 5xx) the
+    order is looked up by receipt before another one is created.
+    """
+
+    def __init__(self, key_id: str, key_secret: str,
+                 base_url: str = RAZORPAY_BASE_URL,
+                 timeout: float = RAZORPAY_TIMEOUT,
+                 max_retries: int = RAZORPAY_MAX_RETRIES,
+                 pool_size: int = RAZORPAY_POOL_SIZE,
+                 backoff_base: float = 0.2,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.key_id = key_id
+        self.key_secret = key_secret
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            auth=(key_id or "", key_secret or ""),
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            limits=httpx.Limits(max_connections=pool_size,
+                                max_keepalive_connections=pool_size),
+            transport=transport,
+        )
+
+    async def _request(self, method: str, url: str,
+                       recover: Optional[Callable[[], Awaitable[Optional[dict]]]] = None,
+                       **kwargs) -> dict:
+        """
+        recover: for non-idempotent calls, finds what an ambiguous earlier
+        attempt created; without it such a call is never retried.
+        """
+        last_error, unsent = None, True
+        for attempt in range(self.max_retries + 1):
+            if attempt and recover is not None and not unsent:
+                found = await recover()
+                if found is not None:
+                    return found
+            unsent = False
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except UNSENT_ERRORS as exc:
+                last_error = f"Razorpay unreachable: {exc}"
+                unsent = True
+            except httpx.TransportError as exc:
+                last_error = f"Razorpay unreachable: {exc}"
+                if method != "GET" and recover is None:
+                    break
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                last_error = _error_description(response)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    break
+            if attempt < self.max_retries:
+                await asyncio.sleep(random.uniform(0, self.backoff_base * (2 ** attempt)))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=last_error)
+
+    async def find_order(self, receipt: str) -> Optional[dict]:
+        """Most recent order with this receipt, or None."""
+        found = await self._request("GET", "/orders", params={"receipt": receipt})
+        items = found.get("items") or []
+        return max(items, key=lambda o: o.get("created_at", 0)) if items else None
+
+    async def create_order(self, amount: float, currency: str = "INR",
+                           idempotency_key: Optional[str] = None) -> dict:
+        """
+        With an idempotency_key, an order already created for the same key
+        is returned instead of a new one.
+        """
+        receipt = order_receipt(idempotency_key or uuid.uuid4().hex)
+        if idempotency_key:
+            existing = await self.find_order(receipt)
+            if existing is not None:
+                return existing
+        data = {
+            "amount": int(round(amount * 100)),  # Razorpay expects amount in paise
+            "currency": currency,
+            "receipt": receipt,
+            "payment_capture": 1,
+        }
+        return await self._request("POST", "/orders", recover=lambda: self.find_order(receipt), json=data)
+
+    def verify_payment_signature(self, order_id: str, payment_id: str, signature: str) -> bool:
+        return verify_signature(f"{order_id}|{payment_id}", signature, self.key_secret)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def order_receipt(idempotency_key: str) -> str:
+    """Razorpay receipts are at most 40 characters; a SHA-1 hex digest is exactly that."""
+    return hashlib.sha1(idempotency_key.encode()).hexdigest()
+
+
+def _error_description(response: httpx.Response) -> str:
     try:
-        client.utility.verify_payment_signature({
-            'razorpay_order_id': order_id,
-            'razorpay_payment_id': payment_id,
-            'razorpay_signature': signature
-        })
-        return True
-    except razorpay.errors.SignatureVerificationError:
+        return response.json()["error"]["description"]
+    except Exception:
+        return f"Razorpay returned HTTP {response.status_code}"
+
+
+def verify_signature(message: Union[str, bytes], signature: Optional[str], secret: Optional[str]) -> bool:
+    """HMAC-SHA256 check used by Razorpay for payment and webhook signatures."""
+    if not secret or not signature:
         return False
+    if isinstance(message, str):
+        message = message.encode()
+    expected = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+_gateway: Optional[RazorpayGateway] = None
+
+
+def get_gateway() -> RazorpayGateway:
+    global _gateway
+    if _gateway is None:
+        _gateway = RazorpayGateway(RAZORPAY_KEY_ID, RAZORPAY_KEY_SECRET)
+    return _gateway
+
+
+async def close_gateway():
+    global _gateway
+    if _gateway is not None:
+        await _gateway.aclose()
+        _gateway = None
+
+
+async def create_order(amount: float, currency: str = "INR",
+                       idempotency_key: Optional[str] = None):
+    return await get_gateway().create_order(amount, currency, idempotency_key)
+
+
+def verify_payment_signature(order_id: str, payment_id: str, signature: str):
+    return verify_signature(f"{order_id}|{payment_id}", signature, RAZORPAY_KEY_SECRET)
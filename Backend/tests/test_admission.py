@@ -0,0 +1,157 @@
+import asyncio
+import sys
+import unittest
+import unittest.mock
+from pathlib import Path
+
+from fastapi import HTTPException
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+
+class StubRedis:
+    """Satisfies the eval() call RedisBackend makes, using the Python twin of the script."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        from admission import take_tokens
+
+        keys, (now, *args) = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        limits = list(zip(args[::2], args[1::2]))
+        states = [self.hashes.get(key, (None, None)) for key in keys]
+        rejected, tokens, retry_after = take_tokens(states, limits, now)
+        for key, left in zip(keys, tokens):
+            self.hashes[key] = (left, now)
+        return [rejected, str(retry_after)]
+
+
+class DownRedis:
+    async def eval(self, *args):
+        raise ConnectionRefusedError("Connection refused")
+
+    async def ping(self):
+        raise ConnectionRefusedError("Connection refused")
+
+
+class AdmissionControllerTests(unittest.IsolatedAsyncioTestCase):
+    def _controller(self, backend=None, **limits):
+        from admission import AdmissionController, InMemoryBackend
+
+        options = dict(user_rate_per_min=60, user_burst=2, global_rate_per_min=60,
+                       global_burst=10, max_in_flight=5)
+        options.update(limits)
+        return AdmissionController("test", backend or InMemoryBackend(), **options)
+
+    async def test_user_burst_then_429_with_retry_after(self):
+        controller = self._controller()
+        for _ in range(2):
+            async with controller.slot("u1"):
+                pass
+        with self.assertRaises(HTTPException) as ctx:
+            await controller.acquire("u1")
+
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(ctx.exception.headers["Retry-After"], "1")
+        # Other users still have their own bucket
+        async with controller.slot("u2"):
+            pass
+        self.assertEqual(controller.in_flight, 0)
+
+    async def test_global_bucket_caps_all_users(self):
+        controller = self._controller(global_burst=3)
+        for user in ("a", "b", "c"):
+            await controller.acquire(user)
+        with self.assertRaises(HTTPException):
+            await controller.acquire("d")
+
+        self.assertEqual(controller.counters["global_limited"], 1)
+        self.assertEqual(controller.in_flight, 3)
+
+    async def test_global_rejection_keeps_user_tokens(self):
+        controller = self._controller(global_burst=1, global_rate_per_min=0.001)
+        await controller.acquire("a")
+        for _ in range(3):
+            with self.assertRaises(HTTPException):
+                await controller.acquire("b")
+
+        # b's two tokens are untouched once the global bucket has room again
+        controller.global_burst = 10
+        del controller.backend._buckets["test:global"]
+        await controller.acquire("b")
+        await controller.acquire("b")
+        self.assertEqual(controller.counters["global_limited"], 3)
+        self.assertEqual(controller.counters["user_limited"], 0)
+
+    async def test_in_flight_limit(self):
+        controller = self._controller(max_in_flight=1, user_burst=10)
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def long_report():
+            async with controller.slot("u1"):
+                started.set()
+                await finish.wait()
+
+        task = asyncio.create_task(long_report())
+        await started.wait()
+        with self.assertRaises(HTTPException) as ctx:
+            await controller.acquire("u2")
+        finish.set()
+        await task
+
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(controller.counters["busy"], 1)
+        self.assertEqual(controller.in_flight, 0)
+
+    async def test_drain_waits_for_in_flight(self):
+        controller = self._controller()
+        await controller.acquire("u1")
+        self.assertFalse(await controller.drain(0.05))
+
+        asyncio.get_running_loop().call_later(0.05, controller.release)
+        self.assertTrue(await controller.drain(2))
+
+    async def test_redis_backend_matches_memory(self):
+        from admission import RedisBackend
+
+        controller = self._controller(backend=RedisBackend(StubRedis()))
+        await controller.acquire("u1")
+        await controller.acquire("u1")
+        with self.assertRaises(HTTPException):
+            await controller.acquire("u1")
+
+        self.assertEqual(controller.counters, {"admitted": 2, "busy": 0, "user_limited": 1,
+                                               "global_limited": 0, "unavailable": 0})
+
+    async def test_redis_outage_is_503(self):
+        from admission import BackendUnavailable, RedisBackend
+
+        backend = RedisBackend(DownRedis())
+        with self.assertRaises(BackendUnavailable):
+            await backend.check()
+        controller = self._controller(backend=backend)
+        with self.assertRaises(HTTPException) as ctx:
+            await controller.acquire("u1")
+
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertIn("Retry-After", ctx.exception.headers)
+        self.assertEqual(controller.counters["unavailable"], 1)
+        self.assertEqual(controller.in_flight, 0)
+
+    def test_redis_backend_does_not_fall_back_to_memory(self):
+        import admission
+
+        original = admission.ADMISSION_BACKEND
+        admission.ADMISSION_BACKEND = "redis"
+        try:
+            with unittest.mock.patch.dict(sys.modules, {"redis": None, "redis.asyncio": None}):
+                with self.assertRaises(RuntimeError):
+                    admission.get_backend()
+        finally:
+            admission.ADMISSION_BACKEND = original
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+class ColdStartTests(unittest.TestCase):
+    def test_main_does_not_import_report_stack(self):
+        code = ("import sys, main; "
+                "print(sorted(m for m in ('core.report.report_service', 'reportlab', 'swisseph') "
+                "if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND,
+                             capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip().splitlines()[-1], "[]")
+
+    def test_ready_after_warmup(self):
+        code = ("import warmup; warmup.BACKEND_WARMUP = True; "
+                "assert not warmup.is_ready(); warmup.start(); warmup._thread.join(); "
+                "print(warmup.is_ready(), sorted(warmup.status()['steps']))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND,
+                             capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip().splitlines()[-1],
+                         "True ['import_report_stack', 'load_ephemeris', 'prime_reportlab']")
+
+
+if __name__ == "__main__":
+    unittest.main()
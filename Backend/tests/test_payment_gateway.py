@@ -0,0 +1,113 @@
+import sys
+import unittest
+from pathlib import Path
+
+import httpx
+from fastapi import HTTPException
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+
+class FlakyTransport(httpx.ASGITransport):
+    """Fails the first `times` POSTs: before sending (connect) or after the server handled them (read)."""
+
+    def __init__(self, app, error: str, times: int = 1):
+        super().__init__(app=app)
+        self.error = error
+        self.times = times
+
+    async def handle_async_request(self, request):
+        if request.method == "POST" and self.times > 0:
+            self.times -= 1
+            if self.error == "connect":
+                raise httpx.ConnectError("connection refused", request=request)
+            await super().handle_async_request(request)
+            raise httpx.ReadTimeout("timed out", request=request)
+        return await super().handle_async_request(request)
+
+
+class RazorpayGatewayTests(unittest.IsolatedAsyncioTestCase):
+    def _gateway(self, error: str = None, **app_options):
+        from fake_razorpay import FAKE_KEY_ID, FAKE_KEY_SECRET, create_app
+        from payment import RazorpayGateway
+
+        self.fake = create_app(**app_options)
+        transport = (FlakyTransport(self.fake, error) if error
+                     else httpx.ASGITransport(app=self.fake))
+        gateway = RazorpayGateway(
+            FAKE_KEY_ID, FAKE_KEY_SECRET,
+            base_url="http://fake-razorpay/v1",
+            backoff_base=0.0,
+            transport=transport,
+        )
+        self.addAsyncCleanup(gateway.aclose)
+        return gateway
+
+    async def test_create_order_in_paise(self):
+        gateway = self._gateway()
+        order = await gateway.create_order(499.99)
+
+        self.assertTrue(order["id"].startswith("order_"))
+        self.assertEqual(order["amount"], 49999)
+        self.assertEqual(order["status"], "created")
+
+    async def test_same_idempotency_key_returns_same_order(self):
+        gateway = self._gateway(fail_first=2)
+        order = await gateway.create_order(100, idempotency_key="checkout-1")
+        again = await gateway.create_order(100, idempotency_key="checkout-1")
+
+        self.assertEqual(self.fake.state.calls, 3)
+        self.assertEqual(len(self.fake.state.orders), 1)
+        self.assertEqual(order["id"], again["id"])
+
+    async def test_read_timeout_finds_order_instead_of_creating_another(self):
+        gateway = self._gateway(error="read")
+        order = await gateway.create_order(100)
+
+        self.assertEqual(self.fake.state.calls, 1)
+        self.assertEqual(list(self.fake.state.orders), [order["id"]])
+
+    async def test_connect_error_is_retried(self):
+        gateway = self._gateway(error="connect")
+        order = await gateway.create_order(100)
+
+        self.assertEqual(self.fake.state.calls, 1)
+        self.assertEqual(list(self.fake.state.orders), [order["id"]])
+
+    def test_receipt_keeps_long_keys_apart(self):
+        from payment import order_receipt
+
+        prefix = "user-0123456789abcdef0123456789abcdef:"
+        first, second = order_receipt(prefix + "checkout-1"), order_receipt(prefix + "checkout-2")
+        self.assertEqual(len(first), 40)
+        self.assertNotEqual(first, second)
+
+    async def test_client_errors_are_not_retried(self):
+        gateway = self._gateway()
+        with self.assertRaises(HTTPException) as ctx:
+            await gateway.create_order(0.5)
+
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertEqual(self.fake.state.calls, 1)
+
+    async def test_gives_up_after_max_retries(self):
+        gateway = self._gateway(failure_rate=1.0)
+        with self.assertRaises(HTTPException):
+            await gateway.create_order(100)
+
+        self.assertEqual(self.fake.state.calls, gateway.max_retries + 1)
+
+    async def test_checkout_signature_round_trip(self):
+        gateway = self._gateway()
+        order = await gateway.create_order(100)
+        response = await gateway._client.post(f"/test/checkout/{order['id']}")
+        paid = response.json()
+
+        self.assertTrue(gateway.verify_payment_signature(
+            paid["razorpay_order_id"], paid["razorpay_payment_id"], paid["razorpay_signature"]))
+        self.assertFalse(gateway.verify_payment_signature(
+            paid["razorpay_order_id"], "pay_forged", paid["razorpay_signature"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
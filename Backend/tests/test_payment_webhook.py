@@ -0,0 +1,132 @@
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+
+class WebhookIngestorTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        from database import MemoryCollection
+        from webhooks import WebhookIngestor
+
+        self.collection = MemoryCollection("transactions")
+        for order_id in ("order_a", "order_b"):
+            await self.collection.insert_one({"order_id": order_id, "status": "created"})
+        self.ingestor = WebhookIngestor(lambda: self.collection, batch_size=100,
+                                        flush_interval=0.01, queue_size=10)
+
+    async def _status(self, order_id):
+        return (await self.collection.find_one({"order_id": order_id}))["status"]
+
+    async def test_duplicates_and_unknown_events(self):
+        from fake_razorpay import webhook_event
+
+        event = webhook_event("payment.captured", "order_a", "pay_1")
+        self.assertEqual(self.ingestor.submit("evt_1", event), "queued")
+        self.assertEqual(self.ingestor.submit("evt_1", event), "duplicate")
+        self.assertEqual(self.ingestor.submit("evt_2", {"event": "invoice.paid"}), "ignored")
+        self.assertEqual(self.ingestor.queue.qsize(), 1)
+
+    async def test_batch_applies_most_advanced_status(self):
+        from fake_razorpay import webhook_event
+
+        # Captured arrives before authorized; the stale event must not win
+        self.ingestor.submit("evt_1", webhook_event("payment.captured", "order_a", "pay_1"))
+        self.ingestor.submit("evt_2", webhook_event("payment.authorized", "order_a", "pay_1"))
+        self.ingestor.submit("evt_3", webhook_event("payment.failed", "order_b", "pay_2"))
+
+        self.ingestor.start()
+        for _ in range(100):
+            if self.ingestor.counters["applied"] == 3:
+                break
+            await asyncio.sleep(0.01)
+        await self.ingestor.stop()
+
+        self.assertEqual(await self._status("order_a"), "paid")
+        self.assertEqual(await self._status("order_b"), "failed")
+        self.assertEqual(self.ingestor.counters["batches"], 1)
+
+        # A late authorized event in a later batch cannot roll back a paid order
+        self.ingestor.submit("evt_4", webhook_event("payment.authorized", "order_a", "pay_1"))
+        await self.ingestor.stop()
+        self.assertEqual(await self._status("order_a"), "paid")
+
+    async def test_stop_finishes_in_flight_batch_and_queue(self):
+        from fake_razorpay import webhook_event
+
+        apply = self.ingestor.apply
+
+        async def slow_apply(items):
+            await asyncio.sleep(0.05)
+            return await apply(items)
+
+        self.ingestor.apply = slow_apply
+        self.ingestor.batch_size = 1
+        self.ingestor.submit("evt_1", webhook_event("payment.captured", "order_a", "pay_1"))
+        self.ingestor.submit("evt_2", webhook_event("payment.failed", "order_b", "pay_2"))
+        self.ingestor.start()
+        await asyncio.sleep(0.01)  # evt_1 is mid-flush
+        await self.ingestor.stop()
+
+        self.assertEqual(self.ingestor.counters["applied"], 2)
+        self.assertEqual(await self._status("order_a"), "paid")
+        self.assertEqual(await self._status("order_b"), "failed")
+
+    async def test_unwritable_batches_are_dropped_and_stop_returns(self):
+        from fake_razorpay import webhook_event
+
+        async def down(items):
+            raise ConnectionError("mongo unreachable")
+
+        self.ingestor.apply = down
+        self.ingestor.retry_seconds = 0.05
+        self.ingestor.stop_timeout = 0.1
+        self.ingestor.submit("evt_1", webhook_event("payment.captured", "order_a", "pay_1"))
+        self.ingestor.start()
+        for _ in range(100):
+            if self.ingestor.counters["dropped"]:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.ingestor.counters["dropped"], 1)
+
+        # Shutdown gives up on the rest after stop_timeout instead of hanging
+        self.ingestor.submit("evt_2", webhook_event("payment.failed", "order_b", "pay_2"))
+        self.ingestor.retry_seconds = 60
+        await asyncio.wait_for(self.ingestor.stop(), 2)
+        self.assertEqual(self.ingestor.counters["dropped"], 2)
+        self.assertEqual(self.ingestor.counters["applied"], 0)
+        # Dropped events are forgotten, so a redelivery is queued again
+        self.assertEqual(self.ingestor.submit("evt_1", webhook_event("payment.captured", "order_a")), "queued")
+
+    async def test_full_queue_is_not_remembered(self):
+        from fake_razorpay import webhook_event
+        from webhooks import QueueFull
+
+        for i in range(self.ingestor.queue_size):
+            self.ingestor.submit(f"evt_{i}", webhook_event("payment.captured", "order_a"))
+        event = webhook_event("payment.captured", "order_b")
+        with self.assertRaises(QueueFull):
+            self.ingestor.submit("evt_late", event)
+
+        self.ingestor.queue.get_nowait()
+        self.assertEqual(self.ingestor.submit("evt_late", event), "queued")
+
+
+class WebhookSignatureTests(unittest.TestCase):
+    def test_raw_body_signature(self):
+        from fake_razorpay import sign_webhook, webhook_event
+        from payment import verify_signature
+
+        body = json.dumps(webhook_event("order.paid", "order_a")).encode()
+        signature = sign_webhook(body, "whsec")
+
+        self.assertTrue(verify_signature(body, signature, "whsec"))
+        self.assertFalse(verify_signature(body + b" ", signature, "whsec"))
+        self.assertFalse(verify_signature(body, signature, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
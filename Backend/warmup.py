@@ -0,0 +1,89 @@
+"""
+Readiness tracking and optional background warm-up.
+
+The report stack (swisseph, ReportLab, the rule and yoga tables) is only
+imported when a report is first requested, so /health answers as soon as
+uvicorn is up. With BACKEND_WARMUP=1 a background thread loads it right
+after startup; /ready reports 503 until that finishes so a load balancer
+can hold traffic off a replica that is still warming.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BACKEND_WARMUP = os.getenv("BACKEND_WARMUP", "0").lower() in ("1", "true", "yes")
+
+_state: Dict[str, Any] = {
+    "started": False,
+    "ready": False,
+    "warmup": BACKEND_WARMUP,
+    "steps": {},
+    "error": None,
+}
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+
+
+def _timed(name: str, func):
+    start = time.perf_counter()
+    func()
+    _state["steps"][name] = round(time.perf_counter() - start, 3)
+
+
+def _import_report_stack():
+    import core.report.report_service  # noqa: F401  swisseph, ReportLab, rules, yogas
+
+
+def _load_ephemeris():
+    # One natal + solar return chart touches every ephemeris file a report reads
+    from core.ephemeris import compute_chart
+    compute_chart("2000-01-01", "12:00", 28.61, 77.21, "+05:30", solar_return_year=2001)
+
+
+def _prime_reportlab():
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    getSampleStyleSheet()
+    stringWidth("warm-up", "Helvetica-Bold", 12)
+
+
+def warm():
+    """Load everything a report needs. Safe to call more than once."""
+    with _lock:
+        if _state["ready"]:
+            return
+        try:
+            _timed("import_report_stack", _import_report_stack)
+            _timed("load_ephemeris", _load_ephemeris)
+            _timed("prime_reportlab", _prime_reportlab)
+        except Exception as exc:
+            # A failed warm-up only costs speed; reports still load lazily
+            print(f"Warm-up failed: {exc}")
+            _state["error"] = str(exc)
+        _state["ready"] = True
+
+
+def start():
+    """Called from app startup. Without BACKEND_WARMUP the app is ready at once."""
+    global _thread
+    _state["started"] = True
+    if not BACKEND_WARMUP:
+        _state["ready"] = True
+        return
+    if _thread is None:
+        _thread = threading.Thread(target=warm, name="backend-warmup", daemon=True)
+        _thread.start()
+
+
+def is_ready() -> bool:
+    return _state["started"] and _state["ready"]
+
+
+def status() -> Dict[str, Any]:
+    return {**_state, "steps": dict(_state["steps"])}
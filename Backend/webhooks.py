@@ -0,0 +1,277 @@
+"""
+Razorpay webhook ingestion.
+
+/payments/webhook only verifies the signature, drops replays by event id
+and queues the update; a background task drains the queue and writes
+transaction status changes to MongoDB in bulk. Applying an update is
+idempotent: a transaction only ever moves forward in STATUS_RANK, so a
+late or repeated event cannot undo a newer one.
+
+A batch the database keeps refusing is retried for WEBHOOK_RETRY_SECONDS
+(and on shutdown only until WEBHOOK_STOP_TIMEOUT), then logged with its
+order ids and dropped, so those orders can be reconciled against Razorpay.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+try:
+    from pymongo import UpdateOne
+except Exception:  # pragma: no cover
+    UpdateOne = None
+
+from database import MemoryCollection
+
+load_dotenv()
+
+RAZORPAY_WEBHOOK_SECRET = os.getenv("RAZORPAY_WEBHOOK_SECRET")
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "500"))
+WEBHOOK_FLUSH_INTERVAL = float(os.getenv("WEBHOOK_FLUSH_INTERVAL", "0.5"))
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "50000"))
+WEBHOOK_DEDUPE_WINDOW = int(os.getenv("WEBHOOK_DEDUPE_WINDOW", "100000"))
+WEBHOOK_RETRY_SECONDS = float(os.getenv("WEBHOOK_RETRY_SECONDS", "300"))
+WEBHOOK_STOP_TIMEOUT = float(os.getenv("WEBHOOK_STOP_TIMEOUT", "20"))
+
+logger = logging.getLogger(__name__)
+
+EVENT_STATUS = {
+    "payment.authorized": "authorized",
+    "payment.captured": "paid",
+    "order.paid": "paid",
+    "payment.failed": "failed",
+    "refund.processed": "refunded",
+}
+STATUS_RANK = {"created": 0, "failed": 1, "authorized": 2, "paid": 3, "refunded": 4}
+
+
+class QueueFull(Exception):
+    pass
+
+
+def parse_event(payload: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Return (order_id, $set fields) for events that change a transaction, else None."""
+    new_status = EVENT_STATUS.get(payload.get("event"))
+    if new_status is None:
+        return None
+    body = payload.get("payload", {})
+    payment = body.get("payment", {}).get("entity", {})
+    order = body.get("order", {}).get("entity", {})
+    refund = body.get("refund", {}).get("entity", {})
+    order_id = payment.get("order_id") or order.get("id")
+    if not order_id:
+        return None
+    fields = {"status": new_status}
+    payment_id = payment.get("id") or refund.get("payment_id")
+    if payment_id:
+        fields["payment_id"] = payment_id
+    return order_id, fields
+
+
+class WebhookIngestor:
+    def __init__(self, collection: Callable[[], Any],
+                 batch_size: int = WEBHOOK_BATCH_SIZE,
+                 flush_interval: float = WEBHOOK_FLUSH_INTERVAL,
+                 queue_size: int = WEBHOOK_QUEUE_SIZE,
+                 dedupe_window: int = WEBHOOK_DEDUPE_WINDOW,
+                 retry_seconds: float = WEBHOOK_RETRY_SECONDS,
+                 stop_timeout: float = WEBHOOK_STOP_TIMEOUT):
+        self._collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.dedupe_window = dedupe_window
+        self.retry_seconds = retry_seconds
+        self.stop_timeout = stop_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stop_deadline: Optional[float] = None
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self.counters = {
+            "received": 0,
+            "duplicates": 0,
+            "ignored": 0,
+            "applied": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "dropped": 0,
+        }
+        self.last_flush_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        return self._queue
+
+    def _remember(self, event_id: str) -> bool:
+        if event_id in self._seen:
+            return False
+        self._seen[event_id] = None
+        if len(self._seen) > self.dedupe_window:
+            self._seen.popitem(last=False)
+        return True
+
+    def submit(self, event_id: str, payload: Dict[str, Any]) -> str:
+        """Queue one verified event. Returns 'queued', 'duplicate' or 'ignored'."""
+        self.counters["received"] += 1
+        if event_id in self._seen:
+            self.counters["duplicates"] += 1
+            return "duplicate"
+        parsed = parse_event(payload)
+        if parsed is None:
+            self._remember(event_id)
+            self.counters["ignored"] += 1
+            return "ignored"
+        try:
+            self.queue.put_nowait((event_id, *parsed))
+        except asyncio.QueueFull:
+            # Not remembered, so Razorpay's redelivery is accepted later
+            raise QueueFull("Webhook queue is full")
+        self._remember(event_id)
+        return "queued"
+
+    @staticmethod
+    def coalesce(items: List[Tuple[str, str, Dict[str, Any]]]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Keep the most advanced update per order within one batch."""
+        latest: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        for event_id, order_id, fields in items:
+            current = latest.get(order_id)
+            if current is None or STATUS_RANK[fields["status"]] >= STATUS_RANK[current[1]["status"]]:
+                latest[order_id] = (event_id, fields)
+        return latest
+
+    async def apply(self, items: List[Tuple[str, str, Dict[str, Any]]]) -> int:
+        updates = []
+        now = datetime.utcnow().isoformat()
+        for order_id, (event_id, fields) in self.coalesce(items).items():
+            rank = STATUS_RANK[fields["status"]]
+            query = {
+                "order_id": order_id,
+                "status": {"$in": [s for s, r in STATUS_RANK.items() if r < rank]},
+            }
+            update = {"$set": {**fields, "webhook_event_id": event_id, "updated_at": now}}
+            updates.append((query, update))
+
+        collection = self._collection()
+        if UpdateOne is not None and not isinstance(collection, MemoryCollection):
+            await collection.bulk_write([UpdateOne(q, u) for q, u in updates], ordered=False)
+        else:
+            for query, update in updates:
+                await collection.update_one(query, update)
+        return len(updates)
+
+    async def _next_batch(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Next batch to flush; empty once stop() was called and the queue is drained."""
+        while True:
+            if self._stopping and self.queue.empty():
+                return []
+            try:
+                batch = [await asyncio.wait_for(self.queue.get(), self.flush_interval)]
+                break
+            except asyncio.TimeoutError:
+                continue
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.apply(batch), timeout)
+        except Exception as exc:
+            self.counters["failed_batches"] += 1
+            self.last_error = str(exc) or type(exc).__name__
+            logger.warning("Webhook batch of %d failed, retrying: %r", len(batch), exc)
+            return False
+        self.counters["applied"] += len(batch)
+        self.counters["batches"] += 1
+        self.last_flush_at = datetime.utcnow().isoformat()
+        return True
+
+    async def _write(self, batch) -> bool:
+        """Flush a batch, retrying until retry_seconds (or stop()'s deadline) run out; then drop it."""
+        deadline = time.monotonic() + self.retry_seconds
+        while True:
+            if self._stop_deadline is not None:
+                deadline = min(deadline, self._stop_deadline)
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            if await self._flush(batch, left):
+                return True
+            await asyncio.sleep(max(0.0, min(self.flush_interval, deadline - time.monotonic())))
+        self._drop(batch)
+        return False
+
+    def _drop(self, batch):
+        self.counters["dropped"] += len(batch)
+        for event_id, _, _ in batch:
+            # A redelivery or manual replay of these events must be accepted
+            self._seen.pop(event_id, None)
+        logger.error("Dropped %d webhook events the database would not take; reconcile orders: %s",
+                     len(batch), ", ".join(sorted({order_id for _, order_id, _ in batch})))
+
+    async def run(self):
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                return
+            # Hold the batch until the database takes it or retries run out; new events keep queueing
+            await self._write(batch)
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._stop_deadline = None
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """
+        Let the running task finish its in-flight batch and drain the queue.
+        Queued events were already acknowledged and will not be redelivered,
+        so the task is never cancelled; batches not written within
+        stop_timeout are logged and dropped so shutdown still finishes.
+        """
+        self._stopping = True
+        self._stop_deadline = time.monotonic() + self.stop_timeout
+        if self._task is not None:
+            await self._task
+            self._task = None
+        # Without a running task (never started), flush what was queued
+        pending = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            await self._write(pending)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._task is not None and not self._task.done(),
+            "last_flush_at": self.last_flush_at,
+            "last_error": self.last_error,
+        }
+
+
+def _transactions():
+    import database
+    return database.transaction_collection
+
+
+ingestor = WebhookIngestor(_transactions)